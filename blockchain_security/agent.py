@@ -14,36 +14,93 @@
 
 """Blockchain Security Coordinator Agent assists in identifying and mitigating blockchain security threats."""
 
+from typing import Optional
+
 from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.tools import FunctionTool
 from google.adk.tools.agent_tool import AgentTool
 
+from . import config
 from . import prompt
 from google.adk.models.lite_llm import LiteLlm
 from .sub_agents.scam_detection import scam_detection_agent
+from .sub_agents.scam_detection.agent import check_address
 from .sub_agents.risk_classification import risk_classification_agent
+from .sub_agents.risk_classification.agent import classify_risk
 from .sub_agents.transaction_analysis import transaction_analysis_agent
+from .sub_agents.transaction_analysis.agent import analyze_transactions
+from .tools.analysis_context import begin_analysis_scope, end_analysis_scope
 from .config import API_BASE_URL, MODEL_NAME_AT_ENDPOINT, API_KEY
+from .fan_out import full_security_check, parallel_analysis_agent
+
+COORDINATOR_MODES = ("agents", "direct")
+
+def build_coordinator(
+    mode: Optional[str] = None, model: Optional[BaseLlm] = None, fan_out: Optional[bool] = None
+) -> LlmAgent:
+    """
+    Build the security coordinator agent.
+
+    Args:
+        mode: "agents" to call the sub-agents as agent tools, or "direct" to
+            call their tool functions as function tools, defaulting to
+            config.COORDINATOR_MODE
+        model: Model for the coordinator and, in "agents" mode, the
+            sub-agents, defaulting to each agent's configured model
+        fan_out: Add the full_security_check tool running all three
+            analyses concurrently, defaulting to config.COORDINATOR_FAN_OUT
+
+    Returns:
+        The coordinator LlmAgent
+    """
+    mode = mode or config.COORDINATOR_MODE
+    fan_out = config.COORDINATOR_FAN_OUT if fan_out is None else fan_out
+    if mode == "agents":
+        sub_agents = [scam_detection_agent, risk_classification_agent, transaction_analysis_agent]
+        if model is not None:
+            sub_agents = [sub_agent.model_copy(update={"model": model}) for sub_agent in sub_agents]
+        tools = [AgentTool(agent=sub_agent) for sub_agent in sub_agents]
+        if fan_out:
+            tools.append(AgentTool(agent=parallel_analysis_agent(model)))
+        instruction = prompt.SECURITY_COORDINATOR_PROMPT
+    elif mode == "direct":
+        # The tool functions are deterministic, so the coordinator reads
+        # their output itself instead of having a sub-agent restate it
+        tools = [
+            FunctionTool(func=check_address),
+            FunctionTool(func=classify_risk),
+            FunctionTool(func=analyze_transactions),
+        ]
+        if fan_out:
+            tools.append(FunctionTool(func=full_security_check))
+        instruction = prompt.SECURITY_COORDINATOR_DIRECT_PROMPT
+    else:
+        raise ValueError(f"Unknown coordinator mode {mode!r}; expected one of {', '.join(COORDINATOR_MODES)}")
+    if fan_out:
+        instruction += prompt.FULL_SECURITY_CHECK_PROMPT
+
+    return LlmAgent(
+        name="blockchain_security_coordinator",
+        model=model or LiteLlm(
+            model=MODEL_NAME_AT_ENDPOINT,
+            api_base=API_BASE_URL,
+            api_key=API_KEY
+        ),
+        description=(
+            "Protect your blockchain assets and interactions by detecting security threats "
+            "and vulnerabilities. Analyze addresses for known scam patterns, classify wallet "
+            "addresses based on risk profiles, and examine transaction patterns for suspicious "
+            "activities. Empower users to make safer blockchain interactions through AI-powered "
+            "security analysis and alerts."
+        ),
+        instruction=instruction,
+        tools=tools,
+        # Tools asked about the same address share one analysis context
+        before_agent_callback=begin_analysis_scope,
+        after_agent_callback=end_analysis_scope,
+    )
 
-blockchain_security_coordinator = LlmAgent(
-    name="blockchain_security_coordinator",
-    model=LiteLlm(
-        model=MODEL_NAME_AT_ENDPOINT,
-        api_base=API_BASE_URL,
-        api_key=API_KEY
-    ),
-    description=(
-        "Protect your blockchain assets and interactions by detecting security threats "
-        "and vulnerabilities. Analyze addresses for known scam patterns, classify wallet "
-        "addresses based on risk profiles, and examine transaction patterns for suspicious "
-        "activities. Empower users to make safer blockchain interactions through AI-powered "
-        "security analysis and alerts."
-    ),
-    instruction=prompt.SECURITY_COORDINATOR_PROMPT,
-    tools=[
-        AgentTool(agent=scam_detection_agent),
-        AgentTool(agent=risk_classification_agent),
-        AgentTool(agent=transaction_analysis_agent),
-    ],
-)
+blockchain_security_coordinator = build_coordinator()
 
 root_agent = blockchain_security_coordinator
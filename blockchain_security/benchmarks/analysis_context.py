@@ -0,0 +1,151 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of transaction scans per request with and without a shared analysis context.
+
+A request is one address sent through all three sub-agent tool functions,
+as the coordinator does for a full security check. The result cache is
+disabled so that every request does its work from scratch.
+
+Usage:
+    python -m blockchain_security.benchmarks.analysis_context [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from typing import Dict, Any, Callable, List, Optional
+
+from blockchain_security.sub_agents.risk_classification.agent import classify_risk
+from blockchain_security.sub_agents.scam_detection.agent import check_address
+from blockchain_security.sub_agents.transaction_analysis.agent import analyze_transactions
+from blockchain_security.tools.address_lookup import address_lookup_tool
+from blockchain_security.tools.analysis_context import analysis_scope
+from blockchain_security.tools.data_source import DataSource, get_data_source, set_data_source
+from blockchain_security.tools.result_cache import result_cache
+from blockchain_security.tools.risk_score_api import risk_score_api
+from blockchain_security.tools.transaction_data import transaction_data_tool
+
+# Store methods that walk an address's posting lists
+_SCAN_METHODS = ("rows_for_address", "positions_for_address", "records_for_address", "get_transactions_by_address")
+
+class CountingStore:
+    """Transaction store wrapper that counts per-address index scans."""
+
+    def __init__(self, store: Any) -> None:
+        self._store = store
+        self.scans = 0
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._store, name)
+        if name not in _SCAN_METHODS:
+            return attribute
+
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            self.scans += 1
+            return attribute(*args, **kwargs)
+        return counted
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __contains__(self, tx_hash: object) -> bool:
+        return tx_hash in self._store
+
+def legacy_request(address: str) -> None:
+    """Run the three tool functions as they were written before the analysis context."""
+    # check_address
+    address_lookup_tool.get_address_details(address)
+    transaction_data_tool.analyze_transaction_patterns(address)
+    # classify_risk
+    risk_score_api.get_risk_score(address)
+    risk_score_api.analyze_behavioral_patterns(address)
+    # analyze_transactions
+    transaction_data_tool.analyze_transaction_patterns(address)
+    transaction_data_tool.get_transactions_by_address(address)
+
+def context_request(address: str) -> None:
+    """Run the three tool functions sharing one analysis context."""
+    with analysis_scope():
+        check_address(address)
+        classify_risk(address)
+        analyze_transactions(address)
+
+def run(request: Callable[[str], None], addresses: List[str], store: CountingStore, repeat: int) -> Dict[str, float]:
+    """
+    Time a request function over every address and count its scans.
+
+    Args:
+        request: Function handling one address
+        addresses: Addresses to send through it
+        store: The counting store the active data source reads from
+        repeat: Number of passes over the addresses
+
+    Returns:
+        Dictionary with requests, scans per request and microseconds per request
+    """
+    store.scans = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for address in addresses:
+            request(address)
+    elapsed = time.perf_counter() - started
+    requests = repeat * len(addresses)
+    return {
+        "requests": requests,
+        "scans_per_request": store.scans / requests,
+        "us_per_request": elapsed / requests * 1e6,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for the benchmark.
+
+    Args:
+        argv: Command-line arguments, defaulting to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Compare transaction scans per request with and without an analysis context")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the sample addresses")
+    args = parser.parse_args(argv)
+
+    original = get_data_source()
+    store = CountingStore(original.transactions)
+    set_data_source(DataSource(store, original.wallets, original.scam_addresses, original.version))
+    max_entries = result_cache.max_entries
+    result_cache.max_entries = 0
+    try:
+        addresses = sorted({
+            address
+            for row in range(len(store.table))
+            for address in (store.table.addresses[store.table.from_ids[row]],
+                            store.table.addresses[store.table.to_ids[row]])
+        } | set(original.wallets))
+        results = {
+            "legacy": run(legacy_request, addresses, store, args.repeat),
+            "context": run(context_request, addresses, store, args.repeat),
+        }
+    finally:
+        result_cache.max_entries = max_entries
+        set_data_source(original)
+
+    print(f"{'mode':<10}{'requests':>10}{'scans/request':>16}{'us/request':>14}")
+    for mode, stats in results.items():
+        print(f"{mode:<10}{stats['requests']:>10}{stats['scans_per_request']:>16.2f}{stats['us_per_request']:>14.1f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Latency comparison of the coordinator's modes, with and without fan-out.
+
+Each request asks the coordinator for a full security check of one address.
+Without fan-out the coordinator runs scam detection, risk classification
+and transaction analysis in turn; with it, it calls full_security_check,
+which runs the three at once. Each mode, "agents" and "direct", is run
+both ways. By default every agent runs on SimulatedLlm, a
+stand-in model that follows that script and waits as a served model would:
+a fixed overhead per call, prefill time per prompt token and decode time per
+generated token. This makes the comparison repeatable without a model
+server, and counts the LLM calls and prompt tokens each mode needs. With
+--live the agents use the configured model endpoint instead, and only
+latency is reported.
+
+The result cache is disabled so that every request runs the tools afresh.
+
+Usage:
+    python -m blockchain_security.benchmarks.coordinator_modes [--requests N]
+        [--call-latency S] [--prefill-per-1k S] [--decode-per-token S]
+        [--answer-tokens N] [--live]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import sys
+import time
+from typing import Dict, Any, AsyncGenerator, List, Optional
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from blockchain_security.agent import COORDINATOR_MODES, build_coordinator
+from blockchain_security.tools import blockchain_data
+from blockchain_security.tools.result_cache import result_cache
+from blockchain_security.tools.tool_output import estimate_tokens
+
+_ADDRESS = re.compile(r"0x[0-9a-zA-Z]+")
+
+FULL_SECURITY_CHECK = "full_security_check"
+
+class SimulatedLlm(BaseLlm):
+    """
+    Stand-in model that calls each of its tools once, then answers.
+
+    Every tool is called with the address from the user's message, except
+    that a model offered full_security_check calls only that one. Once all
+    have responded, the answer restates the tool responses, cut to
+    answer_tokens estimated tokens, as a sub-agent summarizing its tool
+    output or the coordinator writing its report would.
+
+    Attributes:
+        call_seconds: Fixed latency of every call
+        prefill_seconds_per_1k: Latency per thousand prompt tokens
+        decode_seconds_per_token: Latency per generated token
+        answer_tokens: Length of every text answer
+        calls: Number of calls made
+        prompt_tokens: Estimated prompt tokens over all calls
+    """
+
+    call_seconds: float = 0.3
+    prefill_seconds_per_1k: float = 0.05
+    decode_seconds_per_token: float = 0.02
+    answer_tokens: int = 150
+    calls: int = 0
+    prompt_tokens: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        parts = [part for content in llm_request.contents for part in content.parts or []]
+        prompt_tokens = estimate_tokens(str(llm_request.config.system_instruction or "")) + sum(
+            estimate_tokens(part.model_dump(exclude_none=True, mode="json")) for part in parts
+        )
+        text = " ".join(part.text for part in parts if part.text)
+        match = _ADDRESS.search(text)
+        address = match.group(0) if match else ""
+
+        responded = {part.function_response.name for part in parts if part.function_response}
+        tools = list(llm_request.tools_dict)
+        if FULL_SECURITY_CHECK in tools:
+            tools = [FULL_SECURITY_CHECK]
+        pending = [name for name in tools if name not in responded]
+        if pending:
+            declaration = llm_request.tools_dict[pending[0]]._get_declaration()
+            schema = declaration.parameters_json_schema or declaration.parameters.model_dump()
+            argument = next(iter(schema["properties"]))
+            part = types.Part(function_call=types.FunctionCall(name=pending[0], args={argument: address}))
+        else:
+            responses = [part.function_response.response for part in parts if part.function_response]
+            answer = json.dumps(responses, separators=(",", ":"), default=str)
+            part = types.Part(text=answer[:self.answer_tokens * 4])
+        output_tokens = estimate_tokens(part.model_dump(exclude_none=True, mode="json"))
+
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        await asyncio.sleep(
+            self.call_seconds
+            + prompt_tokens / 1000 * self.prefill_seconds_per_1k
+            + output_tokens * self.decode_seconds_per_token
+        )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=output_tokens,
+                total_token_count=prompt_tokens + output_tokens,
+            ),
+        )
+
+async def run_mode(
+    mode: str, fan_out: bool, addresses: List[str], model: Optional[SimulatedLlm]
+) -> Dict[str, Any]:
+    """
+    Send one security check request per address through a coordinator.
+
+    Args:
+        mode: Coordinator mode, "agents" or "direct"
+        fan_out: Whether the coordinator has the full_security_check tool
+        addresses: Addresses to check, one request each
+        model: Simulated model for every agent, or None for the configured endpoint
+
+    Returns:
+        Dictionary with requests, mean and median seconds per request and,
+        when simulated, LLM calls and prompt tokens per request
+    """
+    runner = InMemoryRunner(agent=build_coordinator(mode, model, fan_out), app_name="coordinator_modes")
+    latencies = []
+    for address in addresses:
+        session = await runner.session_service.create_session(app_name="coordinator_modes", user_id="benchmark")
+        message = types.Content(role="user", parts=[types.Part(text=f"Run a full security check of {address}")])
+        started = time.perf_counter()
+        async for _ in runner.run_async(user_id="benchmark", session_id=session.id, new_message=message):
+            pass
+        latencies.append(time.perf_counter() - started)
+
+    requests = len(addresses)
+    return {
+        "requests": requests,
+        "seconds_per_request": statistics.mean(latencies),
+        "median_seconds": statistics.median(latencies),
+        "llm_calls_per_request": model.calls / requests if model is not None else None,
+        "prompt_tokens_per_request": model.prompt_tokens / requests if model is not None else None,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for the benchmark.
+
+    Args:
+        argv: Command-line arguments, defaulting to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare coordinator latency in agents and direct mode, with and without fan-out"
+    )
+    parser.add_argument("--requests", type=int, default=5, help="Security checks per mode")
+    parser.add_argument("--call-latency", type=float, default=0.3, help="Simulated seconds per LLM call")
+    parser.add_argument("--prefill-per-1k", type=float, default=0.05,
+                        help="Simulated seconds per thousand prompt tokens")
+    parser.add_argument("--decode-per-token", type=float, default=0.02, help="Simulated seconds per generated token")
+    parser.add_argument("--answer-tokens", type=int, default=150, help="Length of simulated text answers")
+    parser.add_argument("--live", action="store_true", help="Use the configured model endpoint instead")
+    args = parser.parse_args(argv)
+
+    candidates = sorted(set(blockchain_data.SAMPLE_WALLETS) | set(blockchain_data.KNOWN_SCAM_ADDRESSES))
+    addresses = [candidates[index % len(candidates)] for index in range(args.requests)]
+
+    max_entries = result_cache.max_entries
+    result_cache.max_entries = 0
+    try:
+        results = {}
+        for mode, fan_out in ((mode, fan_out) for fan_out in (False, True) for mode in COORDINATOR_MODES):
+            model = None if args.live else SimulatedLlm(
+                model="simulated",
+                call_seconds=args.call_latency,
+                prefill_seconds_per_1k=args.prefill_per_1k,
+                decode_seconds_per_token=args.decode_per_token,
+                answer_tokens=args.answer_tokens,
+            )
+            results[(mode, fan_out)] = asyncio.run(run_mode(mode, fan_out, addresses, model))
+    finally:
+        result_cache.max_entries = max_entries
+
+    print(f"{'mode':<8}{'fan-out':<9}{'requests':>10}{'LLM calls':>11}{'prompt tokens':>15}"
+          f"{'s/request':>11}{'median s':>10}")
+    for (mode, fan_out), stats in results.items():
+        calls = stats["llm_calls_per_request"]
+        tokens = stats["prompt_tokens_per_request"]
+        print(f"{mode:<8}{'yes' if fan_out else 'no':<9}{stats['requests']:>10}{calls if calls is not None else '-':>11}"
+              f"{f'{tokens:.0f}' if tokens is not None else '-':>15}"
+              f"{stats['seconds_per_request']:>11.2f}{stats['median_seconds']:>10.2f}")
+    baseline = results[("agents", False)]["seconds_per_request"]
+    for (mode, fan_out), stats in results.items():
+        if (mode, fan_out) != ("agents", False):
+            print(f"{mode} mode{' with fan-out' if fan_out else ''} is "
+                  f"{baseline / stats['seconds_per_request']:.1f}x faster per request than sequential agents mode")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
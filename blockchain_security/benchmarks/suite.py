@@ -0,0 +1,275 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark suite timing the tool layer on synthetic data at several scales.
+
+For each scale, a SyntheticChain of that many transactions is loaded, in
+memory below MAPPED_THRESHOLD transactions and otherwise written to a
+temporary dataset file and memory-mapped. A first pass over the sampled
+addresses builds the lazily built indexes, then every benchmarked tool is
+timed over the same addresses with the result cache disabled.
+
+Timings are compared against the baselines stored in baselines.json next to
+this module. A tool slower than its baseline by more than the tolerance is
+reported as a regression and the command exits with status 1. Baselines
+depend on the machine, so record them with --update-baselines on the
+machine that runs the comparison.
+
+Usage:
+    python -m blockchain_security.benchmarks.suite [--scales 1e3,1e4,1e5]
+        [--addresses N] [--repeat N] [--tolerance F] [--baselines PATH]
+        [--update-baselines] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from blockchain_security import config
+from blockchain_security.sub_agents.risk_classification.agent import classify_risk
+from blockchain_security.tools.address_lookup import address_lookup_tool
+from blockchain_security.tools.data_source import DataSource, mapped_source, using_data_source
+from blockchain_security.tools.result_cache import result_cache
+from blockchain_security.tools.risk_score_api import risk_score_api
+from blockchain_security.tools.transaction_data import transaction_data_tool
+from .synthetic import SyntheticChain
+
+# Tool functions timed at every scale
+BENCHMARKS: Dict[str, Callable[[str], Any]] = {
+    "check_scam_status": address_lookup_tool.check_scam_status,
+    "get_address_details": address_lookup_tool.get_address_details,
+    "analyze_transaction_patterns": transaction_data_tool.analyze_transaction_patterns,
+    "get_risk_score": risk_score_api.get_risk_score,
+    "classify_risk": classify_risk,
+}
+
+DEFAULT_SCALES = (10**3, 10**4, 10**5)
+
+# Scales at or above this many transactions are benchmarked from a dataset file
+MAPPED_THRESHOLD = 10**6
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+def load_chain(chain: SyntheticChain, directory: str) -> DataSource:
+    """
+    Load a synthetic chain the way data of its size would be loaded.
+
+    Args:
+        chain: The synthetic chain
+        directory: Directory for the dataset file of large chains
+
+    Returns:
+        DataSource over the chain's data
+    """
+    if chain.transaction_count < MAPPED_THRESHOLD:
+        return chain.build_source()
+    path = os.path.join(directory, f"synthetic-{chain.transaction_count}.dataset")
+    chain.write_dataset(path)
+    return mapped_source(path)
+
+def time_tool(tool: Callable[[str], Any], addresses: List[str], repeat: int) -> Dict[str, float]:
+    """
+    Time a tool function over a list of addresses.
+
+    Args:
+        tool: Function taking one address
+        addresses: Addresses to call it with
+        repeat: Number of passes over the addresses
+
+    Returns:
+        Dictionary with the median and fastest pass, in microseconds per call
+    """
+    passes = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for address in addresses:
+            tool(address)
+        passes.append((time.perf_counter() - started) / len(addresses) * 1e6)
+    return {"us_per_call": statistics.median(passes), "us_per_call_min": min(passes)}
+
+def run_scale(scale: int, address_count: int, repeat: int, directory: str, seed: int = 0) -> Dict[str, Any]:
+    """
+    Benchmark every tool at one scale.
+
+    Args:
+        scale: Number of transactions to generate
+        address_count: Number of addresses to query
+        repeat: Timed passes over the addresses per tool
+        directory: Directory for the dataset file of large scales
+        seed: Seed of the synthetic data
+
+    Returns:
+        Dictionary with the load and warm-up times in seconds and the
+        timings of each tool
+    """
+    chain = SyntheticChain(scale, seed=seed)
+    started = time.perf_counter()
+    source = load_chain(chain, directory)
+    load_seconds = time.perf_counter() - started
+    addresses = chain.sample_addresses(address_count)
+
+    with using_data_source(source):
+        started = time.perf_counter()
+        for tool in BENCHMARKS.values():
+            for address in addresses:
+                tool(address)
+        warmup_seconds = time.perf_counter() - started
+        tools = {name: time_tool(tool, addresses, repeat) for name, tool in BENCHMARKS.items()}
+
+    return {
+        "transactions": scale,
+        "addresses": len(addresses),
+        "load_seconds": load_seconds,
+        "warmup_seconds": warmup_seconds,
+        "tools": tools,
+    }
+
+def run(scales: List[int], address_count: int, repeat: int, seed: int = 0) -> Dict[str, Dict[str, Any]]:
+    """
+    Benchmark every tool at every scale with caching disabled.
+
+    Args:
+        scales: Numbers of transactions to benchmark at
+        address_count: Number of addresses to query per scale
+        repeat: Timed passes over the addresses per tool
+        seed: Seed of the synthetic data
+
+    Returns:
+        Mapping of scale, as a string, to its run_scale result
+    """
+    max_entries = result_cache.max_entries
+    persistent_path = config.PERSISTENT_CACHE_PATH
+    result_cache.max_entries = 0
+    config.PERSISTENT_CACHE_PATH = None
+    try:
+        with tempfile.TemporaryDirectory(prefix="benchmark-") as directory:
+            return {
+                str(scale): run_scale(scale, address_count, repeat, directory, seed)
+                for scale in scales
+            }
+    finally:
+        result_cache.max_entries = max_entries
+        config.PERSISTENT_CACHE_PATH = persistent_path
+
+def compare(
+    results: Dict[str, Dict[str, Any]], baselines: Dict[str, Dict[str, float]], tolerance: float
+) -> List[Tuple[str, str, float, float]]:
+    """
+    Find tools slower than their baseline.
+
+    Args:
+        results: Output of run
+        baselines: Mapping of scale to tool name to baseline microseconds per call
+        tolerance: Allowed slowdown, as a fraction of the baseline
+
+    Returns:
+        (scale, tool, microseconds per call, baseline) of every regression
+    """
+    regressions = []
+    for scale, result in results.items():
+        for name, timing in result["tools"].items():
+            baseline = baselines.get(scale, {}).get(name)
+            if baseline is not None and timing["us_per_call"] > baseline * (1 + tolerance):
+                regressions.append((scale, name, timing["us_per_call"], baseline))
+    return regressions
+
+def load_baselines(path: str) -> Dict[str, Dict[str, float]]:
+    """
+    Read stored baselines.
+
+    Args:
+        path: Path of the baselines JSON file
+
+    Returns:
+        Mapping of scale to tool name to microseconds per call, empty if the
+        file does not exist
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+def save_baselines(path: str, results: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Store the timings of a run as baselines, keeping those of other scales.
+
+    Args:
+        path: Path of the baselines JSON file
+        results: Output of run
+    """
+    baselines = load_baselines(path)
+    for scale, result in results.items():
+        baselines[scale] = {name: round(timing["us_per_call"], 1) for name, timing in result["tools"].items()}
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(dict(sorted(baselines.items(), key=lambda item: int(item[0]))), handle, indent=2)
+        handle.write("\n")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for the benchmark suite.
+
+    Args:
+        argv: Command-line arguments, defaulting to sys.argv
+
+    Returns:
+        Process exit code: 1 if any tool regressed, otherwise 0
+    """
+    parser = argparse.ArgumentParser(description="Time the tool layer on synthetic data and check for regressions")
+    parser.add_argument("--scales", default=",".join(str(scale) for scale in DEFAULT_SCALES),
+                        help="Comma-separated transaction counts, e.g. 1e3,1e5,1e7")
+    parser.add_argument("--addresses", type=int, default=50, help="Addresses queried per scale")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes over the addresses per tool")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic data")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed slowdown over the baseline before failing (0.5 = 50%%)")
+    parser.add_argument("--baselines", default=BASELINES_PATH, help="Baselines JSON file")
+    parser.add_argument("--update-baselines", action="store_true", help="Store this run's timings as the baselines")
+    parser.add_argument("--output", help="JSON file to write the full results to")
+    args = parser.parse_args(argv)
+
+    scales = [int(float(scale)) for scale in args.scales.split(",")]
+    results = run(scales, args.addresses, args.repeat, args.seed)
+    baselines = load_baselines(args.baselines)
+
+    print(f"{'transactions':>12}  {'tool':<30}{'us/call':>12}{'baseline':>12}{'ratio':>8}")
+    for scale, result in results.items():
+        for name, timing in result["tools"].items():
+            baseline = baselines.get(scale, {}).get(name)
+            ratio = f"{timing['us_per_call'] / baseline:.2f}" if baseline else "-"
+            print(f"{scale:>12}  {name:<30}{timing['us_per_call']:>12.1f}"
+                  f"{baseline if baseline is not None else '-':>12}{ratio:>8}")
+        print(f"{scale:>12}  loaded in {result['load_seconds']:.2f}s, warmed up in {result['warmup_seconds']:.2f}s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    if args.update_baselines:
+        save_baselines(args.baselines, results)
+        print(f"Baselines written to {args.baselines}", file=sys.stderr)
+        return 0
+
+    regressions = compare(results, baselines, args.tolerance)
+    for scale, name, us_per_call, baseline in regressions:
+        print(f"REGRESSION: {name} at {scale} transactions took {us_per_call:.1f}us per call "
+              f"against a baseline of {baseline}us", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Synthetic blockchain data at configurable scale.
+
+Generates wallets, a transaction graph whose address activity follows a
+power law, scam labels and bursts of rapid transfers, in the same record
+formats as the sample data in tools/blockchain_data.py. Generation is
+deterministic for a given seed and streams transactions in chunks, so
+datasets of 10^7 transactions can be written without holding them all in
+memory.
+
+Usage:
+    python -m blockchain_security.benchmarks.synthetic OUTPUT --transactions N
+        [--addresses N] [--seed N]
+
+OUTPUT is a dataset file that mapped_source() and the tools can read.
+"""
+
+import argparse
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from blockchain_security.tools.data_source import DataSource
+from blockchain_security.tools.dataset import DatasetWriter
+from blockchain_security.tools.label_store import LabelStore
+from blockchain_security.tools.transaction_store import TransactionStore
+from blockchain_security.tools.transaction_table import format_timestamp, parse_timestamp
+
+# Odd multipliers spreading sequential IDs over the address and hash spaces
+_ADDRESS_MULTIPLIER = 0x9E3779B97F4A7C15F39CC0605CEDC8341082276B
+_HASH_MULTIPLIER = 0xD6E8FEB86659FD93A5B2C8F3E1D4C6B9F0E7A3C5B8D2E9F1A4C7B3D6E0F8A2C5
+
+# Token symbols, their share of transfers and the scale of a typical amount
+_TOKENS = ("ETH", "USDT", "USDC", "DAI")
+_TOKEN_SHARES = np.array([0.5, 0.3, 0.15, 0.05])
+_TOKEN_SCALES = np.array([1.0, 2000.0, 2000.0, 2000.0])
+_GAS_USED = (21000, 65000, 65000, 65000)
+
+_SCAM_TYPES = ("phishing", "rug_pull", "mixer", "ponzi", "fake_token")
+_REPORTERS = ("Chainalysis", "Etherscan", "ScamSniffer", "De.Fi", "SlowMist")
+
+DEFAULT_CHUNK_SIZE = 65536
+
+class SyntheticChain:
+    """
+    Deterministic generator of synthetic blockchain data.
+
+    Address i is picked as sender or recipient of a regular transfer with
+    probability proportional to (i + 1) ** -exponent, so a few hub addresses
+    take part in a large share of transfers while most addresses are seen a
+    handful of times. On top of the regular transfers, each burst address
+    sends a burst of transfers seconds apart, which the rapid_transfers
+    pattern should flag. Scam labels go to addresses picked by the same
+    activity weights, and a share of addresses get wallet records.
+
+    Attributes:
+        transaction_count: Total transactions generated, bursts included
+        address_count: Number of distinct addresses drawn from
+        seed: Seed every random choice derives from
+        burst_addresses: Addresses that send a burst of rapid transfers
+    """
+
+    def __init__(
+        self,
+        transaction_count: int,
+        address_count: Optional[int] = None,
+        seed: int = 0,
+        exponent: float = 0.9,
+        scam_fraction: float = 0.001,
+        wallet_fraction: float = 0.05,
+        burst_count: Optional[int] = None,
+        burst_size: Tuple[int, int] = (5, 15),
+        start: str = "2024-01-01T00:00:00Z",
+        span_days: int = 365,
+    ) -> None:
+        """
+        Args:
+            transaction_count: Total transactions to generate
+            address_count: Distinct addresses, defaulting to a tenth of the
+                transactions and at least 100
+            seed: Random seed
+            exponent: Power-law exponent of address activity
+            scam_fraction: Share of addresses with a scam label
+            wallet_fraction: Share of addresses with a wallet record
+            burst_count: Number of burst addresses, defaulting to one per 200 transactions
+            burst_size: Smallest and largest number of transfers in a burst
+            start: Timestamp of the first transfer
+            span_days: Days the regular transfers are spread over
+        """
+        self.transaction_count = transaction_count
+        self.address_count = address_count or max(100, transaction_count // 10)
+        self.seed = seed
+        self.scam_fraction = scam_fraction
+        self.wallet_fraction = wallet_fraction
+        self.start = parse_timestamp(start)
+        self.span_seconds = span_days * 24 * 3600
+
+        weights = np.arange(1, self.address_count + 1, dtype=np.float64) ** -exponent
+        self._weights = weights / weights.sum()
+        self._cdf = np.cumsum(self._weights)
+        self._cdf[-1] = 1.0
+
+        rng = self._rng("bursts")
+        burst_count = max(1, transaction_count // 200) if burst_count is None else burst_count
+        sizes = rng.integers(burst_size[0], burst_size[1] + 1, size=burst_count)
+        # Bursts never take up more than a tenth of the transactions
+        sizes = sizes[np.cumsum(sizes) <= transaction_count // 10]
+        self._burst_ids = rng.choice(self.address_count, size=len(sizes), replace=False)
+        self._burst_sizes = sizes
+        self._burst_starts = self.start + rng.integers(0, self.span_seconds, size=len(sizes))
+        self.regular_count = transaction_count - int(sizes.sum())
+        self.burst_addresses = [self.address(int(address_id)) for address_id in self._burst_ids]
+
+    def _rng(self, *stream: Any) -> np.random.Generator:
+        # An independent stream per purpose, so changing one part of the
+        # data never shifts the others
+        return np.random.default_rng([
+            self.seed, *(zlib.crc32(part.encode()) if isinstance(part, str) else part for part in stream)
+        ])
+
+    def address(self, address_id: int) -> str:
+        """
+        Get the address string of an address ID.
+
+        Args:
+            address_id: Index of the address, 0 being the most active
+
+        Returns:
+            The 0x-prefixed 40-digit hex address
+        """
+        return f"0x{(address_id + 1) * _ADDRESS_MULTIPLIER % 2**160:040x}"
+
+    def _tx_hash(self, row: int) -> str:
+        return f"0x{(row + 1) * _HASH_MULTIPLIER % 2**256:064x}"
+
+    def _draw_addresses(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        return np.searchsorted(self._cdf, rng.random(count), side="right")
+
+    def _records(
+        self,
+        first_row: int,
+        senders: np.ndarray,
+        recipients: np.ndarray,
+        timestamps: np.ndarray,
+        rng: np.random.Generator,
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        count = len(senders)
+        tokens = rng.choice(len(_TOKENS), size=count, p=_TOKEN_SHARES)
+        amounts = np.round(rng.lognormal(0.0, 2.0, size=count) * _TOKEN_SCALES[tokens], 4)
+        failed = rng.random(count) < 0.01
+        for index in range(count):
+            token = int(tokens[index])
+            yield self._tx_hash(first_row + index), {
+                "from": self.address(int(senders[index])),
+                "to": self.address(int(recipients[index])),
+                "value": f"{amounts[index]:.4f} {_TOKENS[token]}",
+                "timestamp": format_timestamp(int(timestamps[index])),
+                "gas_used": _GAS_USED[token],
+                "status": "failed" if failed[index] else "success"
+            }
+
+    def transactions(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Generate every transaction, regular transfers first and bursts last.
+
+        Args:
+            chunk_size: Transactions generated per vectorized step
+
+        Returns:
+            Iterator of (tx_hash, tx_data) pairs
+        """
+        for first_row in range(0, self.regular_count, chunk_size):
+            count = min(chunk_size, self.regular_count - first_row)
+            rng = self._rng("transactions", first_row)
+            senders = self._draw_addresses(rng, count)
+            recipients = self._draw_addresses(rng, count)
+            recipients[recipients == senders] += 1
+            recipients %= self.address_count
+            # Regular transfers are spread evenly over the span, in row order
+            offsets = (np.arange(first_row, first_row + count) + rng.random(count)) / self.regular_count
+            timestamps = self.start + (offsets * self.span_seconds).astype(np.int64)
+            yield from self._records(first_row, senders, recipients, timestamps, rng)
+
+        row = self.regular_count
+        rng = self._rng("burst_transactions")
+        for sender, size, started in zip(self._burst_ids, self._burst_sizes, self._burst_starts):
+            size = int(size)
+            recipients = self._draw_addresses(rng, size)
+            recipients[recipients == sender] += 1
+            recipients %= self.address_count
+            timestamps = started + np.cumsum(rng.integers(1, 11, size=size))
+            yield from self._records(row, np.full(size, sender), recipients, timestamps, rng)
+            row += size
+
+    def scam_addresses(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate the scam label records.
+
+        Returns:
+            Mapping of address to scam label record
+        """
+        rng = self._rng("scams")
+        count = max(1, int(self.address_count * self.scam_fraction))
+        address_ids = rng.choice(self.address_count, size=count, replace=False, p=self._weights)
+        epoch = datetime.fromtimestamp(self.start, tz=timezone.utc)
+        labels = {}
+        for address_id in address_ids.tolist():
+            scam_type = _SCAM_TYPES[int(rng.integers(len(_SCAM_TYPES)))]
+            reporters = rng.choice(len(_REPORTERS), size=int(rng.integers(1, 3)), replace=False)
+            reported = epoch + timedelta(days=int(rng.integers(0, 365)))
+            labels[self.address(address_id)] = {
+                "scam_type": scam_type,
+                "risk_score": round(float(rng.uniform(0.7, 1.0)), 2),
+                "reported_by": [_REPORTERS[reporter] for reporter in reporters.tolist()],
+                "first_reported": reported.strftime("%Y-%m-%d"),
+                "description": f"Synthetic {scam_type.replace('_', ' ')} address"
+            }
+        return labels
+
+    def wallets(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate the wallet records.
+
+        total_transactions is the address's expected number of regular
+        transfers rather than a count over the generated transactions.
+
+        Returns:
+            Mapping of address to wallet record
+        """
+        rng = self._rng("wallets")
+        count = max(1, int(self.address_count * self.wallet_fraction))
+        address_ids = rng.choice(self.address_count, size=count, replace=False)
+        epoch = datetime.fromtimestamp(self.start, tz=timezone.utc)
+        wallets = {}
+        for address_id in address_ids.tolist():
+            connected = self._draw_addresses(rng, int(rng.integers(1, 4)))
+            balances = np.round(rng.lognormal(0.0, 2.0, size=3) * _TOKEN_SCALES[:3], 4)
+            created = epoch - timedelta(days=int(rng.integers(1, 1000)))
+            wallets[self.address(address_id)] = {
+                "creation_date": created.strftime("%Y-%m-%d"),
+                "total_transactions": int(round(2 * self.regular_count * self._weights[address_id])),
+                "current_balance": {
+                    token: f"{balance:.4f}" for token, balance in zip(_TOKENS, balances.tolist())
+                },
+                "risk_score": round(float(rng.random()), 2),
+                "connected_addresses": [
+                    self.address(int(other)) for other in connected.tolist() if other != address_id
+                ]
+            }
+        return wallets
+
+    def sample_addresses(self, count: int, seed: int = 0) -> List[str]:
+        """
+        Pick addresses to query, weighted by activity as a real query mix would be.
+
+        Args:
+            count: Number of addresses
+            seed: Seed of the sample, independent of the data seed
+
+        Returns:
+            Distinct addresses, most of them active in the generated data
+        """
+        rng = np.random.default_rng([self.seed, seed])
+        count = min(count, self.address_count)
+        address_ids = rng.choice(self.address_count, size=count, replace=False, p=self._weights)
+        return [self.address(int(address_id)) for address_id in address_ids]
+
+    def build_source(self) -> DataSource:
+        """
+        Generate the data into in-memory stores.
+
+        Returns:
+            DataSource over the generated data
+        """
+        store = TransactionStore()
+        store.add_transactions(self.transactions())
+        return DataSource(store, self.wallets(), LabelStore(self.scam_addresses()), version=self.version)
+
+    def write_dataset(self, path: str) -> None:
+        """
+        Stream the generated data into a dataset file.
+
+        Args:
+            path: Destination file path
+        """
+        with DatasetWriter(path, self.version) as writer:
+            writer.add_transactions(self.transactions())
+            writer.add_wallets(self.wallets().items())
+            writer.add_scam_addresses(self.scam_addresses().items())
+
+    @property
+    def version(self) -> str:
+        """Dataset version identifying the generator settings."""
+        return f"synthetic:{self.transaction_count}:{self.address_count}:{self.seed}"
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for writing a synthetic dataset.
+
+    Args:
+        argv: Command-line arguments, defaulting to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Write a synthetic blockchain dataset file")
+    parser.add_argument("output", help="Dataset file to write")
+    parser.add_argument("--transactions", type=float, default=1e5, help="Transactions to generate (e.g. 1e6)")
+    parser.add_argument("--addresses", type=int, help="Distinct addresses (default: a tenth of the transactions)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args(argv)
+
+    chain = SyntheticChain(int(args.transactions), args.addresses, args.seed)
+    started = time.perf_counter()
+    chain.write_dataset(args.output)
+    print(f"Wrote {chain.transaction_count} transactions over {chain.address_count} addresses "
+          f"to {args.output} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
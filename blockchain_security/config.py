@@ -37,11 +37,131 @@ MODEL_NAME_AT_ENDPOINT = OLLAMA_MODEL_NAME
 # API Key (placeholder - would be set through environment variables in production)
 API_KEY = "YOUR_API_KEY"
 
+# How the coordinator reaches the analyses: "agents" wraps each sub-agent as
+# an agent tool, so every step costs the sub-agent's own LLM round trips;
+# "direct" gives the coordinator check_address, classify_risk and
+# analyze_transactions as function tools and skips those round trips.
+COORDINATOR_MODE = "agents"
+
+# Also give the coordinator a full_security_check tool that runs the three
+# analyses of an address concurrently and returns one merged report, so a
+# full check takes as long as the slowest analysis rather than all three.
+COORDINATOR_FAN_OUT = True
+
 # Blockchain API settings (simulated)
 # -----------------
 BLOCKCHAIN_API_BASE_URL = "https://blockchain-api.example.com/v1"
 BLOCKCHAIN_API_KEY = "BLOCKCHAIN_API_KEY"
 
+# Where the tools read data from: "static" for the sample data or the dataset
+# at BLOCKCHAIN_DATASET_PATH, "remote" for the REST API at
+# BLOCKCHAIN_API_BASE_URL (see tools/remote_source.py).
+BLOCKCHAIN_DATA_SOURCE = "static"
+
+# Remote API client: pooled keep-alive connections, requests in flight at
+# once, most addresses per batched request and how long a lookup waits for
+# others to batch with.
+BLOCKCHAIN_API_MAX_CONNECTIONS = 10
+BLOCKCHAIN_API_MAX_CONCURRENCY = 8
+BLOCKCHAIN_API_BATCH_SIZE = 100
+BLOCKCHAIN_API_BATCH_WINDOW_SECONDS = 0.005
+BLOCKCHAIN_API_TIMEOUT_SECONDS = 10.0
+
+# Path to a memory-mapped dataset written by tools.dataset.write_dataset.
+# Leave as None to use the in-memory sample data in tools/blockchain_data.py.
+BLOCKCHAIN_DATASET_PATH = None
+
+# Optional mapping of chain ID to the path of that chain's dataset, to serve
+# per-chain shards (see tools/multi_chain.py). The tools read the DEFAULT_CHAIN
+# shard unless a call names another chain. Takes precedence over
+# BLOCKCHAIN_DATASET_PATH; leave as None for a single dataset.
+BLOCKCHAIN_CHAIN_DATASETS = None
+
+# Largest hop distance to known scam addresses kept in the precomputed
+# scam-distance index; deeper proximity queries fall back to graph search.
+SCAM_DISTANCE_MAX_HOPS = 3
+
+# In-process LRU cache for risk scores and pattern analyses. Entries are keyed
+# on the data version, so adding data invalidates them; set the size to 0 to
+# disable caching.
+RESULT_CACHE_MAX_ENTRIES = 10000
+RESULT_CACHE_TTL_SECONDS = 300.0
+
+# Optional SQLite file persisting results of the namespaces listed below
+# across restarts, shared by every worker process that uses the same file;
+# leave as None to disable. Results are keyed on the dataset version,
+# SCORING_VERSION and the TOOL_OUTPUT_* bounds below, so bump SCORING_VERSION
+# whenever the scoring logic or its thresholds change. Writes are committed
+# in batches of WRITE_BATCH results or every FLUSH_SECONDS, and results older
+# than TTL_SECONDS are swept every SWEEP_SECONDS.
+PERSISTENT_CACHE_PATH = None
+PERSISTENT_CACHE_NAMESPACES = ("get_risk_score", "classify_risk")
+PERSISTENT_CACHE_TTL_SECONDS = 7 * 24 * 3600
+PERSISTENT_CACHE_WRITE_BATCH = 256
+PERSISTENT_CACHE_FLUSH_SECONDS = 1.0
+PERSISTENT_CACHE_SWEEP_SECONDS = 600.0
+SCORING_VERSION = "1"
+
+# Sliding windows behind the rapid_transfers pattern. A window fires when it
+# holds at least min_count transactions or min_value in summed value; set
+# either threshold to None to ignore it. Values are summed in the common
+# denomination when token prices are set (see TOKEN_PRICES), otherwise per
+# token in whole tokens.
+RAPID_TRANSFER_WINDOWS = [
+    {"window_seconds": 60, "min_count": 2, "min_value": None},
+]
+
+# Stream monitor state: per-address state is dropped once an address has been
+# idle for IDLE_SECONDS of stream time, or to keep at most MAX_ADDRESSES of the
+# most recently active addresses. IDLE_SECONDS should exceed the widest
+# RAPID_TRANSFER_WINDOWS window.
+STREAM_MONITOR_MAX_ADDRESSES = 1_000_000
+STREAM_MONITOR_IDLE_SECONDS = 24 * 3600
+
+# Circular-flow search behind the wash_trading pattern: time-ordered cycles of
+# at most MAX_CYCLE_LENGTH transfers that return to the starting address within
+# WINDOW_SECONDS. Each search stops after MAX_CYCLES cycles or when its time
+# budget runs out, and reports whether it was cut short.
+WASH_TRADING_MAX_CYCLE_LENGTH = 4
+WASH_TRADING_WINDOW_SECONDS = 7 * 24 * 3600
+WASH_TRADING_MAX_CYCLES = 10
+WASH_TRADING_TIME_BUDGET_SECONDS = 0.05
+
+# The circular-flow graph is rebuilt once transactions added since it was
+# built exceed this share of the transactions it holds. Until then searches
+# from addresses on the new transactions rebuild it, and other searches use
+# the existing graph, which may miss cycles through the newest transactions.
+FLOW_GRAPH_REBUILD_GROWTH = 0.05
+
+# Optional price of one token in a common denomination (e.g. USD), keyed by
+# token symbol, for comparing and summing amounts across tokens. Tokens
+# without a price get NaN common values. Leave as None to disable.
+TOKEN_PRICES = None
+
+# Chain ID of transactions and wallet records without a "chain" field, for
+# partitioning data into per-chain shards.
+DEFAULT_CHAIN = "ethereum"
+
+# Cross-chain bridge linking: a withdrawal from a known bridge on one chain is
+# linked to a deposit into it on another chain when it pays out the same token
+# within BRIDGE_LINK_MAX_DELAY_SECONDS of the deposit and for at most the
+# deposited amount, less no more than BRIDGE_LINK_FEE_TOLERANCE of it in fees.
+BRIDGE_LINK_MAX_DELAY_SECONDS = 3600
+BRIDGE_LINK_FEE_TOLERANCE = 0.01
+
+# Bounds on sub-agent tool responses, which go verbatim into the model's
+# context (the served model runs with --max-model-len 4960). Transaction lists
+# are replaced by a summary with the TOP_COUNTERPARTIES most frequent
+# counterparties plus one page of the most relevant transactions: at most
+# MAX_ROWS of them and TOKEN_BUDGET estimated tokens for the whole response,
+# with a cursor for the next page. Each detected pattern keeps MAX_DETAILS
+# evidence items. Tokens are estimated at CHARS_PER_TOKEN characters of JSON.
+TOOL_OUTPUT_TOKEN_BUDGET = 1200
+TOOL_OUTPUT_MAX_ROWS = 10
+TOOL_OUTPUT_MAX_DETAILS = 5
+TOOL_OUTPUT_TOP_COUNTERPARTIES = 5
+TOOL_OUTPUT_CHARS_PER_TOKEN = 4
+
 # Risk threshold settings
 # -----------------
 RISK_SCORE_THRESHOLD_HIGH = 0.8
@@ -0,0 +1,163 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parallel fan-out of the three security analyses of an address."""
+
+import asyncio
+from typing import Dict, Any, Optional
+
+from google.adk.agents import ParallelAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.base_llm import BaseLlm
+from google.genai import types
+
+from .sub_agents.scam_detection import scam_detection_agent
+from .sub_agents.scam_detection.agent import check_address
+from .sub_agents.risk_classification import risk_classification_agent
+from .sub_agents.risk_classification.agent import classify_risk
+from .sub_agents.transaction_analysis import transaction_analysis_agent
+from .sub_agents.transaction_analysis.agent import analyze_transactions
+from .tools.analysis_context import analysis_scope
+from .tools.transaction_data import is_transaction_hash
+
+# Report section of each sub-agent's answer, in report order
+_SECTIONS = {
+    "scam_detection": ("Scam detection", scam_detection_agent),
+    "risk_classification": ("Risk classification", risk_classification_agent),
+    "transaction_analysis": ("Transaction analysis", transaction_analysis_agent),
+}
+
+def merge_reports(
+    address: str,
+    scam_detection: Dict[str, Any],
+    risk_classification: Dict[str, Any],
+    transaction_analysis: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Merge the three tool results for an address into one report.
+
+    The transaction patterns and transactions that check_address and
+    classify_risk repeat from analyze_transactions appear once. Sections a
+    tool did not return, e.g. because it answered with an error, are None,
+    and the tools' errors are listed under "errors".
+
+    Args:
+        address: The blockchain address
+        scam_detection: Result of check_address
+        risk_classification: Result of classify_risk
+        transaction_analysis: Result of analyze_transactions
+
+    Returns:
+        Dictionary with the scam status, risk assessment, behavioural and
+        transaction patterns, the transaction summary and one page of
+        transactions with its next_cursor
+    """
+    risk_assessment = risk_classification.get("risk_assessment")
+    if risk_assessment is not None and "transaction_analysis" in risk_assessment.get("details", {}):
+        risk_assessment = {
+            **risk_assessment,
+            "details": {
+                name: value for name, value in risk_assessment["details"].items() if name != "transaction_analysis"
+            }
+        }
+    report = {
+        "address": address,
+        "scam_status": scam_detection.get("scam_status"),
+        "risk_assessment": risk_assessment,
+        "behavior_analysis": risk_classification.get("behavior_analysis"),
+        "transaction_patterns": transaction_analysis.get("transaction_patterns"),
+        "transaction_summary": transaction_analysis.get("transaction_summary"),
+        "transactions": transaction_analysis.get("transactions", []),
+        "next_cursor": transaction_analysis.get("next_cursor"),
+        "page": transaction_analysis.get("page")
+    }
+    errors = {
+        name: result["error"]
+        for name, result in (
+            ("scam_detection", scam_detection),
+            ("risk_classification", risk_classification),
+            ("transaction_analysis", transaction_analysis),
+        )
+        if "error" in result
+    }
+    if errors:
+        report["errors"] = errors
+    return report
+
+async def full_security_check(address: str) -> Dict[str, Any]:
+    """
+    Run scam detection, risk classification and transaction analysis of an address at once.
+
+    The three analyses run concurrently and share one analysis context, and
+    their results are merged into one report. Page through more
+    transactions with analyze_transactions and the report's next_cursor.
+
+    Args:
+        address: Blockchain address to check
+
+    Returns:
+        Dictionary with the merged security report, or with an error if the
+        input is a transaction hash rather than an address
+    """
+    if is_transaction_hash(address):
+        return {
+            "address": address,
+            "error": "Expected a blockchain address, not a transaction hash; use analyze_transactions for a transaction"
+        }
+    with analysis_scope():
+        # Worker threads inherit the scope through the copied context
+        scam_detection, risk_classification, transaction_analysis = await asyncio.gather(
+            asyncio.to_thread(check_address, address),
+            asyncio.to_thread(classify_risk, address),
+            asyncio.to_thread(analyze_transactions, address),
+        )
+    return merge_reports(address, scam_detection, risk_classification, transaction_analysis)
+
+def _merge_answers(callback_context: CallbackContext) -> types.Content:
+    sections = [
+        f"## {title}\n{callback_context.state.get(output_key, 'No result')}"
+        for output_key, (title, _) in _SECTIONS.items()
+    ]
+    return types.Content(role="model", parts=[types.Part(text="\n\n".join(sections))])
+
+def parallel_analysis_agent(model: Optional[BaseLlm] = None) -> ParallelAgent:
+    """
+    Build an agent running the three security sub-agents concurrently.
+
+    Each sub-agent answers in its own branch, and the answers are merged
+    into one report, one section per sub-agent, once all have finished.
+    Wrapped in an AgentTool, the coordinator gets all three analyses in the
+    time of the slowest one.
+
+    Args:
+        model: Model for the sub-agents, defaulting to each one's configured model
+
+    Returns:
+        The ParallelAgent, named full_security_check
+    """
+    sub_agents = []
+    for output_key, (_, sub_agent) in _SECTIONS.items():
+        update: Dict[str, Any] = {"output_key": output_key, "parent_agent": None}
+        if model is not None:
+            update["model"] = model
+        sub_agents.append(sub_agent.model_copy(update=update))
+    return ParallelAgent(
+        name="full_security_check",
+        description=(
+            "Runs scam detection, risk classification and transaction analysis of a blockchain "
+            "address at once and returns one merged report"
+        ),
+        sub_agents=sub_agents,
+        after_agent_callback=_merge_answers,
+    )
@@ -20,9 +20,12 @@ from google.adk.models.lite_llm import LiteLlm
 from typing import Dict, Any
 
 from blockchain_security.config import API_BASE_URL, MODEL_NAME_AT_ENDPOINT, API_KEY
-from blockchain_security.tools.risk_score_api import risk_score_api
+from blockchain_security.tools.analysis_context import get_analysis_context
+from blockchain_security.tools.result_cache import cached_tool
+from blockchain_security.tools.tool_output import bound_patterns
 from . import prompt
 
+@cached_tool("classify_risk")
 def classify_risk(address: str) -> Dict[str, Any]:
     """
     Classify the risk level of a blockchain address.
@@ -33,16 +36,21 @@ def classify_risk(address: str) -> Dict[str, Any]:
     Returns:
         Dictionary with risk classification results
     """
-    # Get risk score from our simulated API
-    risk_assessment = risk_score_api.get_risk_score(address)
+    # Share address facts with the other tools working on this request
+    context = get_analysis_context(address)
     
-    # Get behavioral patterns analysis
-    behavior_analysis = risk_score_api.analyze_behavioral_patterns(address)
+    risk_assessment = context.risk_score
+    transaction_analysis = risk_assessment["details"].get("transaction_analysis")
+    if transaction_analysis is not None:
+        risk_assessment = {
+            **risk_assessment,
+            "details": {**risk_assessment["details"], "transaction_analysis": bound_patterns(transaction_analysis)}
+        }
     
     return {
         "address": address,
         "risk_assessment": risk_assessment,
-        "behavior_analysis": behavior_analysis
+        "behavior_analysis": bound_patterns(context.behavioral_patterns)
     }
 
 risk_classification_agent = Agent(
@@ -17,35 +17,43 @@
 from google.adk import Agent
 from google.adk.tools import FunctionTool
 from google.adk.models.lite_llm import LiteLlm
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from blockchain_security.config import API_BASE_URL, MODEL_NAME_AT_ENDPOINT, API_KEY
-from blockchain_security.tools.address_lookup import address_lookup_tool
-from blockchain_security.tools.transaction_data import transaction_data_tool
+from blockchain_security.tools.analysis_context import get_analysis_context
+from blockchain_security.tools.single_flight import single_flight_tool
+from blockchain_security.tools.tool_output import bound_patterns, transaction_page
 from . import prompt
 
-def check_address(address: str) -> Dict[str, Any]:
+@single_flight_tool("check_address")
+def check_address(address: str, cursor: Optional[str] = None) -> Dict[str, Any]:
     """
     Check if an address is associated with scams.
     
+    The response summarizes the address's transactions and lists the most
+    relevant ones. If next_cursor is set and more transactions are needed,
+    call again with it as cursor to get only the next page of transactions.
+    
     Args:
         address: Blockchain address to check
+        cursor: next_cursor from a previous response, to page through more transactions
         
     Returns:
         Dictionary with scam detection results
     """
-    # Get address details from our simulated blockchain data
-    address_details = address_lookup_tool.get_address_details(address)
-    
-    # Analyze transaction patterns
-    transaction_analysis = transaction_data_tool.analyze_transaction_patterns(address)
+    # Share address facts with the other tools working on this request
+    context = get_analysis_context(address)
     
-    return {
+    if cursor:
+        return transaction_page(
+            context.source, address, context.rows, {"address": address}, "related_transactions", cursor
+        )
+    return transaction_page(context.source, address, context.rows, {
         "address": address,
-        "scam_status": address_details.get("scam_status", {}),
-        "transaction_analysis": transaction_analysis,
-        "related_transactions": address_details.get("related_transactions", [])
-    }
+        "scam_status": context.scam_status,
+        "transaction_analysis": bound_patterns(context.transaction_patterns),
+        "transaction_summary": context.transaction_summary
+    }, "related_transactions")
 
 scam_detection_agent = Agent(
     model=LiteLlm(
@@ -17,24 +17,51 @@
 from google.adk import Agent
 from google.adk.tools import FunctionTool
 from google.adk.models.lite_llm import LiteLlm
-from typing import Dict, Any, Union
+from typing import Dict, Any, Optional, Union
 
+from blockchain_security import config
 from blockchain_security.config import API_BASE_URL, MODEL_NAME_AT_ENDPOINT, API_KEY
-from blockchain_security.tools.transaction_data import transaction_data_tool
+from blockchain_security.tools.analysis_context import get_analysis_context
+from blockchain_security.tools.data_source import using_data_source
+from blockchain_security.tools.multi_chain import get_multi_chain_source
+from blockchain_security.tools.single_flight import single_flight_tool
+from blockchain_security.tools.tool_output import bound_patterns, transaction_page
+from blockchain_security.tools.transaction_data import is_transaction_hash, transaction_data_tool
 from . import prompt
 
-def analyze_transactions(input_value: str) -> Dict[str, Any]:
+@single_flight_tool("analyze_transactions")
+def analyze_transactions(
+    input_value: str, cursor: Optional[str] = None, chain: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Analyze blockchain transactions for suspicious patterns.
     
+    For an address, the response summarizes its transactions and lists the
+    most relevant ones. If next_cursor is set and more transactions are
+    needed, call again with it as cursor to get only the next page of
+    transactions. When data for several chains is loaded, the first page
+    also lists the address's bridge transfers between chains.
+    
     Args:
         input_value: Either a blockchain address or a transaction hash
+        cursor: next_cursor from a previous response, to page through more transactions
+        chain: Chain to analyze when data for several chains is loaded,
+            defaulting to the main chain
         
     Returns:
         Dictionary with transaction analysis results
     """
-    # Check if input is a transaction hash (simplified check for demo)
-    if input_value.startswith("0x") and len(input_value) >= 64:
+    multi_chain = get_multi_chain_source()
+    if chain is None or (multi_chain is None and chain == config.DEFAULT_CHAIN):
+        return _analyze_transactions(input_value, cursor, multi_chain)
+    if multi_chain is None or chain not in multi_chain.shards:
+        loaded = ", ".join(multi_chain.chains) if multi_chain is not None else config.DEFAULT_CHAIN
+        return {"error": f"No data for chain {chain!r}; loaded chains are {loaded}"}
+    with using_data_source(multi_chain.shard(chain)):
+        return _analyze_transactions(input_value, cursor, multi_chain)
+
+def _analyze_transactions(input_value: str, cursor: Optional[str], multi_chain: Any) -> Dict[str, Any]:
+    if is_transaction_hash(input_value):
         # Analyze a specific transaction
         transaction = transaction_data_tool.get_transaction_by_hash(input_value)
         
@@ -48,15 +75,25 @@ def analyze_transactions(input_value: str) -> Dict[str, Any]:
         }
     else:
         # Assume it's an address and analyze its transaction patterns
-        transaction_patterns = transaction_data_tool.analyze_transaction_patterns(input_value)
-        transactions = transaction_data_tool.get_transactions_by_address(input_value)
+        context = get_analysis_context(input_value)
         
-        return {
+        if cursor:
+            return transaction_page(
+                context.source, input_value, context.rows,
+                {"address": input_value, "analysis_type": "address_transactions"}, "transactions", cursor
+            )
+        result = {
             "address": input_value,
-            "transaction_patterns": transaction_patterns,
-            "transactions": transactions,
+            "transaction_patterns": bound_patterns(context.transaction_patterns),
+            "transaction_summary": context.transaction_summary,
             "analysis_type": "address_transactions"
         }
+        if multi_chain is not None:
+            result["chain"] = context.source.chain
+            result["cross_chain_transfers"] = (
+                multi_chain.cross_chain_transfers(input_value)[:config.TOOL_OUTPUT_MAX_DETAILS]
+            )
+        return transaction_page(context.source, input_value, context.rows, result, "transactions")
 
 transaction_analysis_agent = Agent(
     model=LiteLlm(
@@ -36,4 +36,8 @@ Be thorough in your analysis but explain your findings in clear, non-technical l
 
 For transaction hashes, provide detailed analysis of that specific transaction.
 For addresses, analyze the overall transaction patterns associated with that address.
+
+Tool responses summarize an address's transactions and list only the most relevant ones. If a response has a next_cursor and you need more transactions as evidence, call the tool again with the same address and that cursor; otherwise work from the summary.
+
+If a response lists cross_chain_transfers, the address moved funds through a bridge to or from another chain. To follow the funds, call the tool with the counterparty address and that chain as chain.
 """
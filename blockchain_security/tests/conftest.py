@@ -0,0 +1,85 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared fixtures for the blockchain security tool tests."""
+
+import random
+from typing import Dict, Any, List, Sequence
+
+import pytest
+
+from blockchain_security.tools.result_cache import result_cache
+from blockchain_security.tools.transaction_table import format_timestamp
+
+# Earliest timestamp of generated transactions
+BASE_TIME = 1_700_000_000
+
+def make_addresses(count: int) -> List[str]:
+    """
+    Build distinct addresses in the sample data's format.
+
+    Args:
+        count: Number of addresses
+
+    Returns:
+        The addresses
+    """
+    return [f"0x{index:040x}" for index in range(1, count + 1)]
+
+def make_transactions(
+    seed: int,
+    addresses: Sequence[str],
+    count: int,
+    tokens: Sequence[str] = ("ETH", "USDT"),
+    spread_seconds: int = 3600,
+    unparseable_share: float = 0.1,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Build random transactions between some addresses.
+
+    Timestamps are drawn from few enough seconds that ties are common, and
+    some values cannot be parsed.
+
+    Args:
+        seed: Random seed
+        addresses: Addresses the transfers run between
+        count: Number of transactions
+        tokens: Token symbols to draw from
+        spread_seconds: Range of the timestamps
+        unparseable_share: Share of transactions with an unparseable value
+
+    Returns:
+        Mapping of tx_hash to transaction data
+    """
+    rng = random.Random(seed)
+    transactions = {}
+    for index in range(count):
+        sender, recipient = rng.sample(list(addresses), 2)
+        amount = "unknown" if rng.random() < unparseable_share else str(rng.choice([1, 2.5, 10, 0.125, 300]))
+        transactions[f"0x{seed:08x}{index:056x}"] = {
+            "from": sender,
+            "to": recipient,
+            "value": f"{amount} {rng.choice(tokens)}",
+            "timestamp": format_timestamp(BASE_TIME + rng.randrange(spread_seconds)),
+            "gas_used": rng.choice([21000, 65000]),
+            "status": "success",
+        }
+    return transactions
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    # Data versions embed id() of their source, which a later test's source may reuse
+    result_cache.clear()
+    yield
+    result_cache.clear()
@@ -0,0 +1,95 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for analysis contexts shared across parallel tool calls."""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+from blockchain_security.fan_out import full_security_check
+from blockchain_security.tools import blockchain_data
+from blockchain_security.tools.analysis_context import AnalysisContext, analysis_scope, get_analysis_context
+from blockchain_security.tools.data_source import DataSource
+from blockchain_security.tools.label_store import LabelStore
+from blockchain_security.tools.result_cache import result_cache
+from blockchain_security.tools.transaction_data import transaction_data_tool
+from blockchain_security.tools.transaction_store import TransactionStore
+
+ADDRESS = next(iter(blockchain_data.SAMPLE_WALLETS))
+
+def _count_scans(monkeypatch, delay: float = 0.0):
+    scanned = []
+    rows_for_address = TransactionStore.rows_for_address
+
+    def counting(self, address, direction="both"):
+        scanned.append((address, direction))
+        # Widen the window for concurrent callers to race
+        time.sleep(delay)
+        return rows_for_address(self, address, direction)
+
+    monkeypatch.setattr(TransactionStore, "rows_for_address", counting)
+    return scanned
+
+def test_full_security_check_scans_the_address_once(monkeypatch):
+    result_cache.clear()
+    scanned = _count_scans(monkeypatch, delay=0.05)
+
+    asyncio.run(full_security_check(ADDRESS))
+
+    assert scanned.count((ADDRESS, "both")) == 1
+
+def test_threads_in_a_scope_share_one_context_and_fact(monkeypatch):
+    scanned = _count_scans(monkeypatch, delay=0.05)
+    contexts = []
+
+    def worker():
+        context = get_analysis_context(ADDRESS)
+        context.rows
+        contexts.append(context)
+
+    with analysis_scope():
+        # Each thread runs in its own copy of the context, as asyncio.to_thread does
+        threads = [threading.Thread(target=contextvars.copy_context().run, args=(worker,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len({id(context) for context in contexts}) == 1
+    assert contexts[0].computed["rows"] == 1
+    assert scanned == [(ADDRESS, "both")]
+
+def _pattern_names(analysis):
+    return {pattern["pattern"] for pattern in analysis["detected_patterns"]}
+
+def test_context_reads_its_own_source():
+    # The same transactions and wallets, without any scam labels
+    unlabelled = DataSource(
+        TransactionStore.from_transactions(blockchain_data.SAMPLE_TRANSACTIONS),
+        blockchain_data.SAMPLE_WALLETS,
+        LabelStore({}),
+        version="unlabelled",
+    )
+    context = AnalysisContext(ADDRESS, unlabelled)
+
+    assert context.scam_status == {"is_scam": False, "is_connected_to_scam": False}
+    assert "scam_interaction" not in _pattern_names(context.transaction_patterns)
+    context.behavioral_patterns
+    context.risk_score
+
+    # Results computed from the context's source are not served for the active one
+    assert "scam_interaction" in _pattern_names(transaction_data_tool.analyze_transaction_patterns(ADDRESS))
+    assert "scam_interaction" in _pattern_names(AnalysisContext(ADDRESS).transaction_patterns)
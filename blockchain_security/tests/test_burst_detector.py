@@ -0,0 +1,142 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for sliding-window burst detection against brute-force windows."""
+
+import math
+
+import numpy as np
+import pytest
+
+from blockchain_security import config
+from blockchain_security.tools.burst_detector import BurstDetector
+from blockchain_security.tools.transaction_store import TransactionStore
+from blockchain_security.tools.transaction_table import (
+    MISSING_UNITS, UNIT_DECIMALS, UNITS_PER_TOKEN, parse_timestamp, parse_value, to_units
+)
+
+from .conftest import make_addresses, make_transactions
+
+PRICES = {"ETH": 2000.0, "DAI": 1.0}
+
+def _value(tx_data, priced):
+    amount, token = parse_value(tx_data["value"])
+    units = to_units(amount)
+    if units == MISSING_UNITS:
+        return token, 0.0
+    if priced:
+        price = PRICES.get(token, math.nan)
+        return token, 0.0 if math.isnan(price) else units / UNITS_PER_TOKEN * price
+    return token, units / UNITS_PER_TOKEN
+
+def _window_sum(transactions, end, window_seconds, priced, token=None):
+    total = 0.0
+    for tx_data in transactions:
+        if end - window_seconds < parse_timestamp(tx_data["timestamp"]) <= end:
+            tx_token, value = _value(tx_data, priced)
+            if priced or tx_token == token:
+                total += value
+    return total
+
+def brute_force_peaks(transactions, window_seconds, priced):
+    # Peak count and value over every window (t - window_seconds, t], the
+    # value summed per token unless priced
+    times = [parse_timestamp(tx_data["timestamp"]) for tx_data in transactions]
+    peak_count = max(sum(end - window_seconds < time <= end for time in times) for end in times)
+    tokens = {_value(tx_data, priced)[0] for tx_data in transactions}
+    peak_value = max(
+        _window_sum(transactions, end, window_seconds, priced, token)
+        for end in times for token in (tokens if not priced else [None])
+    )
+    return peak_count, peak_value
+
+def _store(seed, tokens):
+    addresses = make_addresses(5)
+    transactions = make_transactions(seed, addresses, 80, tokens=tokens, spread_seconds=600, unparseable_share=0.2)
+    return addresses, transactions, TransactionStore.from_transactions(transactions)
+
+@pytest.mark.parametrize("priced", [False, True])
+@pytest.mark.parametrize("seed", range(10))
+def test_windows_match_brute_force(monkeypatch, seed, priced):
+    monkeypatch.setattr(config, "TOKEN_PRICES", PRICES if priced else None)
+    # USDT has no price, so its common values are NaN
+    addresses, transactions, store = _store(seed, ("ETH", "USDT", "DAI"))
+    windows = [{"window_seconds": width, "min_count": 1} for width in (1, 30, 120)]
+    detector = BurstDetector(windows)
+
+    rows = [store.rows_for_address(address) for address in addresses]
+    grouped = detector.detect_grouped(
+        store.table, np.concatenate(rows), np.repeat(np.arange(len(addresses)), [len(r) for r in rows]), len(addresses)
+    )
+    for address, address_rows, reports in zip(addresses, rows, grouped):
+        assert reports == detector.detect(store.table, address_rows)
+        address_transactions = [
+            tx_data for tx_data in transactions.values() if address in (tx_data["from"], tx_data["to"])
+        ]
+        for window, report in zip(windows, reports):
+            width = window["window_seconds"]
+            peak_count, peak_value = brute_force_peaks(address_transactions, width, priced)
+            assert report["peak_count"] == peak_count
+            assert report["peak_value"] == pytest.approx(round(peak_value, UNIT_DECIMALS))
+            assert report["span_seconds"] < width
+
+            # The reported value window holds the peak value
+            value_end = parse_timestamp(report["peak_value_end_time"])
+            assert value_end - parse_timestamp(report["peak_value_start_time"]) < width
+            assert _window_sum(
+                address_transactions, value_end, width, priced, report["peak_value_token"]
+            ) == pytest.approx(peak_value)
+            assert (report["peak_value_token"] is None) == priced
+
+def _detect(values, monkeypatch, prices=None):
+    monkeypatch.setattr(config, "TOKEN_PRICES", prices)
+    sender, recipient = make_addresses(2)
+    store = TransactionStore.from_transactions({
+        f"0x{index:064x}": {
+            "from": sender, "to": recipient, "value": value,
+            "timestamp": f"2023-11-14T22:{offset // 60:02d}:{offset % 60:02d}Z"
+        }
+        for index, (offset, value) in enumerate(values)
+    })
+    detector = BurstDetector([{"window_seconds": 60, "min_count": 1}])
+    return detector.detect(store.table, store.rows_for_address(sender))[0]
+
+def test_unparseable_amounts_do_not_poison_later_windows(monkeypatch):
+    report = _detect([(0, "unknown ETH"), (100, "1 ETH"), (110, "2 ETH")], monkeypatch)
+
+    assert report["peak_value"] == 3.0
+    assert report["peak_value_token"] == "ETH"
+    assert (report["peak_value_start_time"], report["peak_value_end_time"]) == (
+        "2023-11-14T22:01:40Z", "2023-11-14T22:01:50Z"
+    )
+
+def test_tokens_are_windowed_separately(monkeypatch):
+    report = _detect([(100, "1 ETH"), (105, "5 USDT"), (110, "2 ETH"), (300, "4 USDT")], monkeypatch)
+
+    assert report["peak_count"] == 3
+    assert report["peak_value"] == 5.0
+    assert report["peak_value_token"] == "USDT"
+
+def test_priced_values_sum_across_tokens(monkeypatch):
+    report = _detect(
+        [(0, "1 ETH"), (100, "1 ETH"), (105, "500 DAI"), (110, "9 USDT")], monkeypatch, prices=PRICES
+    )
+
+    assert report["peak_value"] == 2500.0
+    assert report["peak_value_token"] is None
+    assert report["peak_value_start_time"] == "2023-11-14T22:01:40Z"
+
+def test_window_needs_a_threshold():
+    with pytest.raises(ValueError):
+        BurstDetector([{"window_seconds": 60}])
@@ -0,0 +1,117 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the circular flow search against a brute-force enumeration."""
+
+from collections import defaultdict
+from typing import Dict, Any, Set, Tuple
+
+import pytest
+
+from blockchain_security import config
+from blockchain_security.tools.cycle_detector import FlowGraph
+from blockchain_security.tools.data_source import DataSource
+from blockchain_security.tools.transaction_store import TransactionStore
+from blockchain_security.tools.transaction_table import format_timestamp, parse_timestamp
+
+from .conftest import BASE_TIME, make_addresses, make_transactions
+
+MAX_LENGTH = 4
+WINDOW_SECONDS = 40
+UNLIMITED = {"max_cycles": 10 ** 6, "time_budget_seconds": 60.0}
+
+def brute_force_cycles(transactions: Dict[str, Dict[str, Any]], start: str) -> Set[Tuple[str, ...]]:
+    # Every simple cycle through start, listed from start's transfer, whose
+    # timestamps are a rotation of a non-decreasing sequence within the window
+    outgoing = defaultdict(list)
+    for tx_hash, tx_data in transactions.items():
+        outgoing[tx_data["from"]].append((tx_hash, tx_data["to"], parse_timestamp(tx_data["timestamp"])))
+
+    cycles = set()
+
+    def extend(node, path, visited):
+        for tx_hash, recipient, timestamp in outgoing[node]:
+            edges = path + [(tx_hash, timestamp)]
+            if recipient == start:
+                times = [timestamp for _, timestamp in edges]
+                descents = sum(times[index] > times[(index + 1) % len(times)] for index in range(len(times)))
+                if descents <= 1 and max(times) - min(times) <= WINDOW_SECONDS:
+                    cycles.add(tuple(tx_hash for tx_hash, _ in edges))
+            elif recipient not in visited and len(edges) < MAX_LENGTH:
+                extend(recipient, edges, visited | {recipient})
+
+    extend(start, [], {start})
+    return cycles
+
+def _graph(seed):
+    addresses = make_addresses(6)
+    transactions = make_transactions(seed, addresses, 30, spread_seconds=100)
+    return addresses, transactions, FlowGraph.build(TransactionStore.from_transactions(transactions))
+
+@pytest.mark.parametrize("seed", range(20))
+def test_find_cycles_matches_brute_force(seed):
+    addresses, transactions, graph = _graph(seed)
+    for address in addresses:
+        found = graph.find_cycles(address, MAX_LENGTH, WINDOW_SECONDS, **UNLIMITED)
+        listed = [tuple(transfer["tx_hash"] for transfer in cycle["transfers"]) for cycle in found["cycles"]]
+
+        assert found["complete"]
+        assert len(listed) == len(set(listed))
+        assert set(listed) == brute_force_cycles(transactions, address)
+
+@pytest.mark.parametrize("seed", range(20))
+def test_find_all_cycles_matches_brute_force(seed):
+    addresses, transactions, graph = _graph(seed)
+    found = graph.find_all_cycles(MAX_LENGTH, WINDOW_SECONDS, **UNLIMITED)
+    listed = [frozenset(transfer["tx_hash"] for transfer in cycle["transfers"]) for cycle in found["cycles"]]
+
+    expected = {frozenset(cycle) for address in addresses for cycle in brute_force_cycles(transactions, address)}
+    assert found["complete"]
+    assert len(listed) == len(set(listed))
+    assert set(listed) == expected
+
+def test_search_stops_at_max_cycles():
+    addresses, transactions, graph = _graph(3)
+    everything = graph.find_all_cycles(MAX_LENGTH, WINDOW_SECONDS, **UNLIMITED)
+    assert len(everything["cycles"]) > 1
+
+    limited = graph.find_all_cycles(MAX_LENGTH, WINDOW_SECONDS, max_cycles=1, time_budget_seconds=60.0)
+    assert len(limited["cycles"]) == 1
+    assert not limited["complete"]
+
+def _transfer(sender, recipient, offset):
+    return {"from": sender, "to": recipient, "value": "1 ETH", "timestamp": format_timestamp(BASE_TIME + offset)}
+
+def test_flow_graph_is_rebuilt_for_new_transactions(monkeypatch):
+    monkeypatch.setattr(config, "FLOW_GRAPH_REBUILD_GROWTH", 0.1)
+    addresses = make_addresses(8)
+    transactions = make_transactions(5, addresses[:6], 40, spread_seconds=100)
+    source = DataSource(TransactionStore.from_transactions(transactions), {}, {}, version="test")
+    graph = source.flow_graph
+
+    # A new two-address loop is served from the old graph, except to its own addresses
+    loop = [(addresses[6], addresses[7]), (addresses[7], addresses[6])]
+    source.add_transactions(
+        (f"0xloop{index}", _transfer(sender, recipient, index)) for index, (sender, recipient) in enumerate(loop)
+    )
+    assert source.flow_graph is graph
+    assert source.flow_graph_for(addresses[0]) is graph
+    rebuilt = source.flow_graph_for(addresses[6])
+    assert rebuilt is not graph
+    assert rebuilt.component_size(addresses[6]) == 2
+    assert source.flow_graph_for(addresses[6]) is rebuilt
+
+    # Past the growth threshold every search gets a rebuilt graph
+    source.add_transactions((f"0xmore{index}", _transfer(addresses[0], addresses[1], index)) for index in range(5))
+    assert source.flow_graph is not rebuilt
@@ -0,0 +1,101 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for writing datasets and reading them back memory-mapped."""
+
+import numpy as np
+import pytest
+
+from blockchain_security.tools import blockchain_data
+from blockchain_security.tools.address_lookup import address_lookup_tool
+from blockchain_security.tools.data_source import DataSource, mapped_source, using_data_source
+from blockchain_security.tools.dataset import open_dataset, write_dataset
+from blockchain_security.tools.label_store import LabelStore
+from blockchain_security.tools.risk_score_api import risk_score_api
+from blockchain_security.tools.transaction_data import transaction_data_tool
+from blockchain_security.tools.transaction_store import TransactionStore
+
+from .conftest import make_addresses, make_transactions
+
+def _records(seed):
+    addresses = make_addresses(12)
+    transactions = make_transactions(seed, addresses, 200, tokens=("ETH", "USDT", "DAI"))
+    transactions.update(blockchain_data.SAMPLE_TRANSACTIONS)
+    wallets = dict(blockchain_data.SAMPLE_WALLETS)
+    wallets[addresses[0]] = {"current_balance": {"ETH": "1.5"}, "connected_addresses": addresses[1:3]}
+    labels = dict(blockchain_data.KNOWN_SCAM_ADDRESSES)
+    labels[addresses[3]] = {
+        "scam_type": "phishing",
+        "risk_score": 0.9,
+        "reported_by": ["Etherscan"],
+        "first_reported": "2025-01-01",
+        "description": "Test label"
+    }
+    return transactions, wallets, labels
+
+@pytest.fixture(params=[0, 1])
+def round_trip(request, tmp_path):
+    transactions, wallets, labels = _records(request.param)
+    store = TransactionStore.from_transactions(transactions)
+    path = str(tmp_path / "data.bcs")
+    write_dataset(path, store, wallets, labels, version="test", prices={"ETH": 2000.0})
+    return store, wallets, labels, path
+
+def test_records_read_back_unchanged(round_trip):
+    store, wallets, labels, path = round_trip
+    dataset = open_dataset(path)
+    mapped = dataset.transactions
+
+    assert dataset.version == "test"
+    assert len(mapped) == len(store)
+    assert dict(mapped.iter_transactions()) == dict(store.iter_transactions())
+    for tx_hash in list(dict(store.iter_transactions()))[:50]:
+        assert mapped.get_transaction(tx_hash) == store.get_transaction(tx_hash)
+    assert mapped.get_transaction("0xmissing") is None
+    assert dict(dataset.wallets) == wallets
+    assert dict(dataset.scam_addresses.items()) == labels
+    assert mapped.table.prices == {"ETH": 2000.0}
+
+def test_address_index_matches(round_trip):
+    store, wallets, labels, path = round_trip
+    mapped = open_dataset(path).transactions
+
+    for address in store.table.addresses:
+        for direction in ("both", "in", "out"):
+            expected = [store.materialize(row) for row in store.rows_for_address(address, direction).tolist()]
+            rows = mapped.rows_for_address(address, direction)
+            assert [mapped.materialize(row) for row in rows.tolist()] == expected
+            assert np.array_equal(mapped.table.timestamps[rows], store.table.timestamps[
+                store.rows_for_address(address, direction)
+            ])
+        assert mapped.get_transactions_by_address(address) == store.get_transactions_by_address(address)
+    assert len(mapped.rows_for_address("0xmissing")) == 0
+
+def test_tools_agree_on_both_sources(round_trip):
+    store, wallets, labels, path = round_trip
+    # The dataset carries its prices, which the burst values are summed in
+    store.table.prices = {"ETH": 2000.0}
+    in_memory = DataSource(store, wallets, LabelStore(labels), version="test")
+    tools = [
+        address_lookup_tool.check_scam_status,
+        transaction_data_tool.analyze_transaction_patterns,
+        risk_score_api.get_risk_score,
+        risk_score_api.analyze_behavioral_patterns,
+    ]
+    for address in store.table.addresses[:20]:
+        for tool in tools:
+            with using_data_source(in_memory):
+                expected = tool(address)
+            with using_data_source(mapped_source(path)):
+                assert tool(address) == expected, (tool.__name__, address)
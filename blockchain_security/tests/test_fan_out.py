@@ -0,0 +1,53 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the parallel fan-out of the three security analyses."""
+
+import asyncio
+
+from blockchain_security.fan_out import full_security_check, merge_reports
+from blockchain_security.sub_agents.risk_classification.agent import classify_risk
+from blockchain_security.sub_agents.scam_detection.agent import check_address
+from blockchain_security.sub_agents.transaction_analysis.agent import analyze_transactions
+from blockchain_security.tools import blockchain_data
+
+ADDRESS = "0x1111aaaa2222bbbb3333cccc4444dddd5555eeee"
+
+def test_report_merges_the_three_analyses():
+    report = asyncio.run(full_security_check(ADDRESS))
+
+    transaction_analysis = analyze_transactions(ADDRESS)
+    assert report["scam_status"] == check_address(ADDRESS)["scam_status"]
+    assert report["behavior_analysis"] == classify_risk(ADDRESS)["behavior_analysis"]
+    assert report["transaction_summary"] == transaction_analysis["transaction_summary"]
+    assert report["transactions"] == transaction_analysis["transactions"]
+    assert "transaction_analysis" not in report["risk_assessment"]["details"]
+    assert "errors" not in report
+
+def test_transaction_hash_is_rejected():
+    tx_hash = next(iter(blockchain_data.SAMPLE_TRANSACTIONS))
+    for value in (tx_hash, "0x" + "ab" * 32):
+        report = asyncio.run(full_security_check(value))
+        assert report["address"] == value
+        assert "transaction hash" in report["error"]
+
+def test_merge_tolerates_error_results():
+    scam_detection = check_address(ADDRESS)
+    risk_classification = classify_risk(ADDRESS)
+    report = merge_reports(ADDRESS, scam_detection, risk_classification, {"address": ADDRESS, "error": "expired"})
+
+    assert report["scam_status"] == scam_detection["scam_status"]
+    assert report["transaction_patterns"] is None
+    assert report["transactions"] == []
+    assert report["errors"] == {"transaction_analysis": "expired"}
@@ -0,0 +1,115 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the bulk ingest readers and their handling of malformed input."""
+
+import json
+
+from blockchain_security.tools.dataset import open_dataset
+from blockchain_security.tools.ingest import (
+    ingest_address_records, ingest_transactions, main, read_address_records, read_block_dump, read_csv, read_jsonl
+)
+from blockchain_security.tools.transaction_store import TransactionStore
+
+from .conftest import make_addresses
+
+SENDER, RECIPIENT, WALLET = make_addresses(3)
+TIMESTAMP = "2025-05-10T14:32:15Z"
+
+def _write_lines(path, lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    return str(path)
+
+def _transaction(tx_hash, **fields):
+    return json.dumps({"hash": tx_hash, "from": SENDER, "to": RECIPIENT, "value": "1 ETH", "timestamp": TIMESTAMP, **fields})
+
+def test_malformed_jsonl_lines_are_skipped(tmp_path):
+    path = _write_lines(tmp_path / "transactions.jsonl", [
+        _transaction("0x01"),
+        "{not json",
+        "[1, 2, 3]",
+        "",
+        _transaction("0x02", timestamp="yesterday"),
+        _transaction("0x01"),
+        _transaction("0x03", value="2 USDT"),
+    ])
+    store = TransactionStore()
+    stats = ingest_transactions(read_jsonl(path), store, chunk_size=2)
+
+    assert (stats["rows"], stats["skipped"], stats["duplicates"]) == (2, 3, 1)
+    assert len(store) == 2
+    assert store.get_transaction("0x03")["value"] == "2 USDT"
+
+def test_csv_token_column(tmp_path):
+    with_value = tmp_path / "with_value.csv"
+    with_value.write_text(f"hash,from,to,value,token,timestamp\n0x01,{SENDER},{RECIPIENT},5.2,ETH,{TIMESTAMP}\n")
+    without_value = tmp_path / "without_value.csv"
+    without_value.write_text(f"hash,from,to,token,timestamp\n0x02,{SENDER},{RECIPIENT},ETH,{TIMESTAMP}\n")
+
+    assert [tx_data["value"] for _, tx_data in read_csv(str(with_value))] == ["5.2 ETH"]
+    assert [("value" in tx_data) for _, tx_data in read_csv(str(without_value))] == [False]
+
+def test_malformed_blocks_are_skipped(tmp_path):
+    block = {
+        "number": "0x10",
+        "timestamp": "0x6554d7a0",
+        "transactions": [
+            {"hash": "0x01", "from": SENDER, "to": RECIPIENT, "value": "0xde0b6b3a7640000", "gas": "0x5208"},
+            {"hash": "0x02", "from": SENDER, "to": RECIPIENT, "value": "not hex"},
+            {"hash": "0x03", "from": SENDER, "to": None, "value": "0x0"},
+            "0xhash-only",
+        ],
+    }
+    path = _write_lines(tmp_path / "blocks.jsonl", [
+        json.dumps({"jsonrpc": "2.0", "id": 1, "result": block}),
+        json.dumps({"jsonrpc": "2.0", "id": 2, "result": None}),
+        "{truncated",
+        json.dumps({"number": "0x11"}),
+        json.dumps("a string"),
+    ])
+    store = TransactionStore()
+    stats = ingest_transactions(read_block_dump(path), store)
+
+    assert (stats["rows"], stats["skipped"]) == (2, 4)
+    assert store.get_transaction("0x01")["value"] == "1 ETH"
+    assert store.get_transaction("0x03")["to"] == ""
+
+def test_malformed_address_records_are_skipped(tmp_path):
+    path = _write_lines(tmp_path / "wallets.jsonl", [
+        json.dumps({"address": WALLET, "current_balance": {"ETH": "1"}}),
+        json.dumps({"current_balance": {"ETH": "2"}}),
+        json.dumps({"address": 7}),
+        "not json",
+    ])
+    wallets = {}
+    skipped = ingest_address_records(read_address_records(path), wallets.update)
+
+    assert skipped == 3
+    assert wallets == {WALLET: {"current_balance": {"ETH": "1"}}}
+
+def test_command_line_ingest(tmp_path):
+    transactions = _write_lines(tmp_path / "transactions.jsonl", [_transaction("0x01"), "garbage", _transaction("0x02")])
+    labels = _write_lines(tmp_path / "labels.jsonl", [
+        json.dumps({"address": SENDER, "scam_type": "phishing", "risk_score": 0.9}),
+        "{",
+    ])
+    output = str(tmp_path / "dataset.bcs")
+
+    assert main([output, transactions, "--labels", labels]) == 0
+    assert main([output, transactions, "--merge"]) == 0
+
+    dataset = open_dataset(output)
+    assert len(dataset.transactions) == 2
+    assert dataset.scam_addresses.get(SENDER)["scam_type"] == "phishing"
+    assert RECIPIENT not in dataset.scam_addresses
@@ -0,0 +1,132 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for per-chain shards, shared scam labels and bridge linking."""
+
+import pytest
+
+from blockchain_security import config
+from blockchain_security.sub_agents.transaction_analysis.agent import analyze_transactions
+from blockchain_security.tools import blockchain_data, data_source, multi_chain
+from blockchain_security.tools.address_lookup import address_lookup_tool
+from blockchain_security.tools.dataset import write_dataset
+from blockchain_security.tools.multi_chain import MultiChainSource
+from blockchain_security.tools.transaction_table import format_timestamp
+
+from .conftest import BASE_TIME, make_addresses
+
+BRIDGE = next(iter(blockchain_data.KNOWN_BRIDGE_ADDRESSES))
+USER, RECIPIENT, ETHEREUM_SCAM, ARBITRUM_SCAM, WALLET = make_addresses(5)
+
+def _label(scam_type):
+    return {
+        "scam_type": scam_type,
+        "risk_score": 0.9,
+        "reported_by": ["Etherscan"],
+        "first_reported": "2025-01-01",
+        "description": "Test label"
+    }
+
+def _transfer(sender, recipient, value, offset, chain):
+    return {
+        "from": sender, "to": recipient, "value": value,
+        "timestamp": format_timestamp(BASE_TIME + offset), "chain": chain
+    }
+
+TRANSACTIONS = {
+    "0x01": _transfer(USER, BRIDGE, "100 USDT", 0, "ethereum"),
+    # Paid out on another chain within the delay, less a fee
+    "0x02": _transfer(BRIDGE, RECIPIENT, "99.5 USDT", 600, "arbitrum"),
+    # Too large a fee, and a payout on the deposit's own chain
+    "0x03": _transfer(USER, BRIDGE, "50 USDT", 1000, "ethereum"),
+    "0x04": _transfer(BRIDGE, RECIPIENT, "40 USDT", 1100, "arbitrum"),
+    "0x05": _transfer(BRIDGE, USER, "50 USDT", 1200, "ethereum"),
+    "0x06": _transfer(ETHEREUM_SCAM, USER, "1 ETH", 2000, "ethereum"),
+}
+WALLETS = {WALLET: {"current_balance": {"ETH": "1"}, "connected_addresses": [ARBITRUM_SCAM], "chain": "arbitrum"}}
+
+@pytest.fixture
+def paths(tmp_path):
+    # Each chain's dataset carries only the labels reported on that chain
+    source = MultiChainSource.from_records(TRANSACTIONS, WALLETS, {})
+    labels = {"ethereum": {ETHEREUM_SCAM: _label("phishing")}, "arbitrum": {ARBITRUM_SCAM: _label("rug_pull")}}
+    paths = {}
+    for chain in ("ethereum", "arbitrum"):
+        shard = source.shard(chain)
+        paths[chain] = str(tmp_path / f"{chain}.bcs")
+        write_dataset(paths[chain], shard.transactions, dict(shard.wallets), labels[chain], version=chain)
+    return paths
+
+@pytest.fixture
+def source(paths):
+    source = MultiChainSource.from_datasets(paths)
+    yield source
+    source.close()
+
+def scam_verdicts():
+    return {
+        address: address_lookup_tool.check_scam_status(address)
+        for address in (ETHEREUM_SCAM, ARBITRUM_SCAM, WALLET)
+    }
+
+def test_every_shard_sees_every_dataset_labels(source):
+    for chain in source.chains:
+        verdicts = source.query(chain, scam_verdicts)
+        assert verdicts[ETHEREUM_SCAM]["is_scam"]
+        assert verdicts[ARBITRUM_SCAM]["is_scam"]
+    assert source.query("arbitrum", scam_verdicts)[WALLET]["connected_scam_address"] == ARBITRUM_SCAM
+
+def test_process_and_thread_queries_agree(source):
+    source.add_label(USER, _label("phishing"))
+    threads = source.query_all(scam_verdicts)
+    processes = source.query_all(scam_verdicts, processes=True)
+
+    assert processes == threads
+    assert all(verdicts[ARBITRUM_SCAM]["is_scam"] for verdicts in processes.values())
+    assert source.query("ethereum", address_lookup_tool.check_scam_status, USER)["is_scam"]
+
+def test_bridge_links(source):
+    links = source.bridge_links()
+
+    assert [(link["deposit"]["tx_hash"], link["withdrawal"]["tx_hash"]) for link in links] == [("0x01", "0x02")]
+    assert links[0]["delay_seconds"] == 600
+    assert source.cross_chain_transfers(USER) == links
+    assert source.cross_chain_transfers(RECIPIENT) == links
+    assert source.cross_chain_transfers(ETHEREUM_SCAM) == []
+
+def test_added_chains_get_versioned_shards():
+    source = MultiChainSource.from_records(TRANSACTIONS, {}, {}, version="sample")
+    source.add_transactions([("0x07", _transfer(USER, RECIPIENT, "1 BNB", 0, "bsc"))])
+
+    assert source.shard("bsc").version == "sample:bsc"
+    assert source.shard("arbitrum").version == "sample:arbitrum"
+    with pytest.raises(KeyError):
+        source.shard("solana")
+
+def test_tools_read_the_configured_shards(paths, monkeypatch):
+    monkeypatch.setattr(config, "BLOCKCHAIN_CHAIN_DATASETS", paths)
+    monkeypatch.setattr(config, "DEFAULT_CHAIN", "ethereum")
+    monkeypatch.setattr(multi_chain, "_multi_chain_source", None)
+    monkeypatch.setattr(data_source, "_active_source", None)
+
+    response = analyze_transactions(USER)
+    assert response["chain"] == "ethereum"
+    assert {transaction["hash"] for transaction in response["transactions"]} == {"0x01", "0x03", "0x05", "0x06"}
+    assert [link["withdrawal"]["tx_hash"] for link in response["cross_chain_transfers"]] == ["0x02"]
+
+    response = analyze_transactions(RECIPIENT, chain="arbitrum")
+    assert response["chain"] == "arbitrum"
+    assert {transaction["hash"] for transaction in response["transactions"]} == {"0x02", "0x04"}
+    assert "error" in analyze_transactions(USER, chain="solana")
+    multi_chain.get_multi_chain_source().close()
@@ -0,0 +1,212 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the declarative transaction and behavioural pattern rules."""
+
+import math
+
+import numpy as np
+import pytest
+
+from blockchain_security.tools import blockchain_data
+from blockchain_security.tools.data_source import DataSource, using_data_source
+from blockchain_security.tools.label_store import LabelStore
+from blockchain_security.tools.pattern_rules import PatternFeatures, RuleEngine
+from blockchain_security.tools.risk_score_api import risk_score_api
+from blockchain_security.tools.transaction_data import transaction_data_tool
+from blockchain_security.tools.transaction_store import TransactionStore
+from blockchain_security.tools.transaction_table import format_timestamp, parse_timestamp, parse_value
+
+from .conftest import BASE_TIME, make_addresses, make_transactions
+
+ZERO = blockchain_data.ZERO_ADDRESS
+BRIDGE = next(iter(blockchain_data.KNOWN_BRIDGE_ADDRESSES))
+ADDRESSES = make_addresses(20)
+
+def _transfer(sender, recipient, value, offset):
+    return {"from": sender, "to": recipient, "value": value, "timestamp": format_timestamp(BASE_TIME + offset)}
+
+def _source(transfers):
+    transactions = {f"0x{index:064x}": tx_data for index, tx_data in enumerate(transfers, 1)}
+    return DataSource(TransactionStore.from_transactions(transactions), {}, LabelStore({}), version="pattern-rules")
+
+def _patterns(result):
+    return {pattern["pattern"]: pattern["details"] for pattern in result["detected_patterns"]}
+
+def _reference_features(transactions, address):
+    # Each feature computed directly from its definition
+    sides = []
+    for tx_data in transactions.values():
+        amount, token = parse_value(tx_data["value"])
+        for is_out, owner, counterparty in ((True, tx_data["from"], tx_data["to"]), (False, tx_data["to"], tx_data["from"])):
+            if owner == address:
+                sides.append((is_out, counterparty, parse_timestamp(tx_data["timestamp"]), token, float(amount or 0)))
+    sent = [side for side in sides if side[0]]
+    received = [side for side in sides if not side[0]]
+    mints = [side for side in received if side[1] == ZERO] + [side for side in sent if side[1] == ""]
+
+    hold_seconds = math.inf
+    for _, counterparty, timestamp, _, _ in sent:
+        earlier = [side[2] for side in received if side[2] <= timestamp]
+        if counterparty in blockchain_data.KNOWN_BRIDGE_ADDRESSES and earlier:
+            hold_seconds = min(hold_seconds, timestamp - max(earlier))
+
+    address_features = {
+        "transaction_count": sum(address in (tx_data["from"], tx_data["to"]) for tx_data in transactions.values()),
+        "in_count": len(received),
+        "out_count": len(sent),
+        "distinct_senders": len({side[1] for side in received}),
+        "distinct_recipients": len({side[1] for side in sent}),
+        "mint_count": len(mints),
+        "bridge_out_count": sum(side[1] in blockchain_data.KNOWN_BRIDGE_ADDRESSES for side in sent),
+        "bridge_hold_seconds": hold_seconds,
+    }
+    token_features = {}
+    for token in {side[3] for side in sides}:
+        token_in = [side for side in received if side[3] == token]
+        token_out = [side for side in sent if side[3] == token]
+        in_amount = sum(side[4] for side in token_in)
+        out_amount = sum(side[4] for side in token_out)
+        first_in = min((side[2] for side in token_in), default=math.inf)
+        last_out = max((side[2] for side in token_out), default=-math.inf)
+        token_features[token] = {
+            "in_amount": in_amount,
+            "minted_amount": sum(side[4] for side in token_in if side[1] == ZERO),
+            "out_amount": out_amount,
+            "out_ratio": out_amount / in_amount if in_amount > 0 else 0.0,
+            "dump_seconds": last_out - first_in if last_out >= first_in else math.inf,
+        }
+    return address_features, token_features
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_vectorized_features_match_reference(seed):
+    # Mints, contract creations and bridges among the counterparties
+    addresses = make_addresses(6) + [ZERO, BRIDGE, ""]
+    transactions = make_transactions(seed, addresses, 300, spread_seconds=4 * 3600)
+    store = TransactionStore.from_transactions(transactions)
+    queried = make_addresses(6) + [BRIDGE, ADDRESSES[-1]]
+
+    features = PatternFeatures.for_row_groups(
+        store.table, [store.rows_for_address(address) for address in queried], queried
+    )
+
+    for group, address in enumerate(queried):
+        address_features, token_features = _reference_features(transactions, address)
+        assert {name: features.address[name][group] for name in address_features} == pytest.approx(address_features)
+        pairs = {features.token_symbols[pair]: pair for pair in np.flatnonzero(features.token_groups == group).tolist()}
+        assert pairs.keys() == token_features.keys()
+        for token, values in token_features.items():
+            assert {name: features.token[name][pairs[token]] for name in values} == pytest.approx(values)
+
+def test_token_honeypot():
+    honeypot, collector = ADDRESSES[:2]
+    senders = ADDRESSES[2:7]
+    transfers = [_transfer(sender, honeypot, "10 TKN", index) for index, sender in enumerate(senders)]
+    transfers.append(_transfer(honeypot, collector, "50 TKN", 100))
+    # The same pattern with one sender too few
+    transfers += [_transfer(sender, collector, "10 TKN", 200) for sender in senders[:3]]
+
+    with using_data_source(_source(transfers)):
+        matched = _patterns(transaction_data_tool.analyze_transaction_patterns(honeypot))
+        unmatched = _patterns(transaction_data_tool.analyze_transaction_patterns(collector))
+
+    assert matched["token_honeypot"] == {"distinct_senders": 5, "distinct_recipients": 1, "out_count": 1}
+    assert "token_honeypot" not in unmatched
+
+@pytest.mark.parametrize("hold_seconds, matched", [(0, True), (3600, True), (3601, False)])
+def test_chain_hopping(hold_seconds, matched):
+    hopper, funder = ADDRESSES[:2]
+    transfers = [
+        _transfer(funder, hopper, "1 ETH", 0),
+        _transfer(funder, hopper, "1 ETH", 1000),
+        _transfer(hopper, BRIDGE, "2 ETH", 1000 + hold_seconds),
+    ]
+
+    with using_data_source(_source(transfers)):
+        patterns = _patterns(transaction_data_tool.analyze_transaction_patterns(hopper))
+
+    if matched:
+        # Held from the latest receipt before the send
+        assert patterns["chain_hopping"] == {"bridge_out_count": 1, "bridge_hold_seconds": hold_seconds}
+    else:
+        assert "chain_hopping" not in patterns
+
+def test_bridge_send_without_receipt_is_not_chain_hopping():
+    hopper, funder = ADDRESSES[:2]
+    transfers = [_transfer(hopper, BRIDGE, "1 ETH", 0), _transfer(funder, hopper, "1 ETH", 10)]
+
+    with using_data_source(_source(transfers)):
+        patterns = _patterns(transaction_data_tool.analyze_transaction_patterns(hopper))
+
+    assert "chain_hopping" not in patterns
+
+def test_excessive_minting():
+    minter, creator, holder = ADDRESSES[:3]
+    transfers = [_transfer(ZERO, minter, "100 TKN", index) for index in range(3)]
+    # Contract creations sent count as mints too
+    transfers += [_transfer(minter, "", "0 ETH", 10 + index) for index in range(2)]
+    transfers += [_transfer(ZERO, creator, "100 TKN", index) for index in range(4)]
+    transfers += [_transfer(creator, holder, "100 TKN", 10 + index) for index in range(4)]
+
+    with using_data_source(_source(transfers)):
+        results = risk_score_api.analyze_behavioral_patterns_many([minter, creator])
+
+    assert _patterns(results[0])["excessive_minting"] == {"mint_count": 5}
+    assert "excessive_minting" not in _patterns(results[1])
+
+def test_dump_cycle():
+    dumper, holder, trader, buyer = ADDRESSES[:4]
+    day = 24 * 3600
+    transfers = [
+        # Minted, then 90% sold within three days
+        _transfer(ZERO, dumper, "1000 TKN", 0),
+        _transfer(dumper, buyer, "900 TKN", 3 * day),
+        _transfer(ZERO, dumper, "1 ETH", 0),
+        # Minted but sold too late
+        _transfer(ZERO, holder, "1000 TKN", 0),
+        _transfer(holder, buyer, "900 TKN", 3 * day + 1),
+        # Sold quickly, but received from another holder rather than minted
+        _transfer(buyer, trader, "100 TKN", 4 * day),
+        _transfer(trader, holder, "100 TKN", 4 * day + 60),
+    ]
+
+    with using_data_source(_source(transfers)):
+        results = risk_score_api.analyze_behavioral_patterns_many([dumper, holder, trader])
+
+    assert _patterns(results[0])["dump_cycle"] == {
+        "tokens": [{"token": "TKN", "minted_amount": 1000, "out_ratio": 0.9, "dump_seconds": 3 * day}]
+    }
+    assert [result["risk_assessment"] for result in results[1:]] == [False, False]
+
+@pytest.mark.parametrize("spec, message", [
+    ({"scope": "wallet", "all": [("mint_count", ">", 0)]}, "unknown scope"),
+    ({"scope": "address", "all": [("minted_amount", ">", 0)]}, "unknown address feature"),
+    ({"scope": "token", "all": [("mint_count", ">", 0)]}, "unknown token feature"),
+    ({"all": [("mint_count", "=>", 0)]}, "unknown operator"),
+])
+def test_invalid_rules_are_rejected(spec, message):
+    with pytest.raises(ValueError, match=message):
+        RuleEngine({"invalid": spec})
+
+def test_rules_without_transactions():
+    features = PatternFeatures.for_row_groups(_source([]).transactions.table, [], [])
+    assert RuleEngine({"minting": {"all": [("mint_count", ">=", 1)]}}).evaluate(features) == []
+
+    store = _source([_transfer(ADDRESSES[0], ADDRESSES[1], "1 ETH", 0)]).transactions
+    unknown = ADDRESSES[-1]
+    features = PatternFeatures.for_row_groups(store.table, [store.rows_for_address(unknown)], [unknown])
+    assert features.address["transaction_count"].tolist() == [0]
+    assert RuleEngine({"quiet": {"all": [("transaction_count", "==", 0)]}}).evaluate(features) == [
+        [("quiet", {"transaction_count": 0})]
+    ]
@@ -0,0 +1,62 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the persistent result store."""
+
+import pytest
+
+from blockchain_security import config
+from blockchain_security.tools.persistent_cache import PersistentResultStore
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+@pytest.fixture
+def store(tmp_path, clock):
+    # Large batches and intervals keep results queued until flushed
+    store = PersistentResultStore(
+        str(tmp_path / "results.db"), ttl_seconds=60, write_batch=1000,
+        flush_seconds=3600, sweep_seconds=3600, clock=clock
+    )
+    yield store
+    store.close()
+
+@pytest.mark.parametrize("flushed", [False, True])
+def test_expired_results_are_not_served(store, clock, flushed):
+    store.put_many("classify_risk", "v1", [("0xa", {"risk": 1})])
+    if flushed:
+        store.flush()
+    assert store.get_many("classify_risk", "v1", ["0xa"]) == {"0xa": {"risk": 1}}
+
+    clock.now += 61
+    assert store.get_many("classify_risk", "v1", ["0xa"]) == {}
+
+@pytest.mark.parametrize("flushed", [False, True])
+def test_results_are_keyed_on_tool_output_bounds(store, monkeypatch, flushed):
+    store.put_many("classify_risk", "v1", [("0xa", {"risk": 1})])
+    if flushed:
+        store.flush()
+
+    monkeypatch.setattr(config, "TOOL_OUTPUT_MAX_DETAILS", config.TOOL_OUTPUT_MAX_DETAILS + 1)
+    assert store.get_many("classify_risk", "v1", ["0xa"]) == {}
+    monkeypatch.undo()
+    assert store.get_many("classify_risk", "v1", ["0xa"]) == {"0xa": {"risk": 1}}
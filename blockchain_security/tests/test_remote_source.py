@@ -0,0 +1,195 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the remote data source against the stub API server."""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from blockchain_security.tools import blockchain_data
+from blockchain_security.tools.address_lookup import address_lookup_tool
+from blockchain_security.tools.api_stub import start_stub_server
+from blockchain_security.tools.data_source import in_memory_source, using_data_source
+from blockchain_security.tools.remote_source import BlockchainAPIClient, RemoteDataSource
+from blockchain_security.tools.result_cache import result_cache
+from blockchain_security.tools.risk_score_api import risk_score_api
+from blockchain_security.tools.transaction_data import transaction_data_tool
+from blockchain_security.tools.transaction_store import TransactionStore
+
+SAMPLE_ADDRESSES = sorted(
+    {address for tx_data in blockchain_data.SAMPLE_TRANSACTIONS.values() for address in (tx_data["from"], tx_data["to"])}
+    | set(blockchain_data.SAMPLE_WALLETS)
+)
+
+@pytest.fixture
+def server():
+    server = start_stub_server(api_key="test-key")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def remote(server):
+    source = RemoteDataSource({"base_url": server.url, "api_key": "test-key"})
+    yield source
+    source.close()
+
+def _fetch_many(server, endpoint, addresses, **client_options):
+    async def run():
+        async with BlockchainAPIClient(base_url=server.url, api_key="test-key", **client_options) as client:
+            return await client.fetch_many(endpoint, addresses), client.stats
+    return asyncio.run(run())
+
+def test_lookups_are_batched(server):
+    results, stats = _fetch_many(server, "wallets", SAMPLE_ADDRESSES, batch_size=3, batch_window_seconds=0.05)
+
+    assert results == {address: blockchain_data.SAMPLE_WALLETS.get(address) for address in SAMPLE_ADDRESSES}
+    assert stats["requests"] == -(-len(SAMPLE_ADDRESSES) // 3)
+    assert [count for _, count in server.requests] == [3] * (len(SAMPLE_ADDRESSES) // 3) + (
+        [len(SAMPLE_ADDRESSES) % 3] if len(SAMPLE_ADDRESSES) % 3 else []
+    )
+
+def test_identical_lookups_are_coalesced(server):
+    address = SAMPLE_ADDRESSES[0]
+
+    async def run():
+        async with BlockchainAPIClient(base_url=server.url, api_key="test-key") as client:
+            results = await asyncio.gather(*(client.fetch("labels", address) for _ in range(5)))
+            return results, client.stats
+
+    results, stats = asyncio.run(run())
+
+    assert results == [blockchain_data.KNOWN_SCAM_ADDRESSES.get(address)] * 5
+    assert stats["coalesced"] == 4
+    assert server.requests == [("labels", 1)]
+
+def test_request_errors_reach_every_waiting_lookup(server):
+    async def run():
+        async with BlockchainAPIClient(base_url=server.url, api_key="wrong-key") as client:
+            results = await asyncio.gather(
+                *(client.fetch("wallets", address) for address in SAMPLE_ADDRESSES * 2), return_exceptions=True
+            )
+            return results, dict(client._in_flight)
+
+    results, in_flight = asyncio.run(run())
+
+    assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+    assert {result.response.status_code for result in results} == {401}
+    assert in_flight == {}
+
+def test_remote_source_matches_static_source(remote):
+    static = in_memory_source()
+    tools = [
+        address_lookup_tool.check_scam_status,
+        address_lookup_tool.get_address_details,
+        transaction_data_tool.get_transactions_by_address,
+        transaction_data_tool.analyze_transaction_patterns,
+        risk_score_api.get_risk_score,
+        risk_score_api.analyze_behavioral_patterns,
+    ]
+    for tool in tools:
+        for address in SAMPLE_ADDRESSES:
+            result_cache.clear()
+            with using_data_source(static):
+                expected = tool(address)
+            result_cache.clear()
+            with using_data_source(remote):
+                assert tool(address) == expected, (tool.__name__, address)
+
+def test_fetching_keeps_versions_of_other_addresses(server, remote):
+    first, second = SAMPLE_ADDRESSES[:2]
+    data_version = remote.data_version
+    remote.prepare([first])
+    first_version = remote.address_version(first)
+    remote.prepare([second])
+
+    assert remote.data_version == data_version
+    assert remote.address_version(first) == first_version
+
+    # The key depends on the address's data, not on the order of fetches
+    other = RemoteDataSource({"base_url": server.url, "api_key": "test-key"})
+    try:
+        other.prepare([second])
+        other.prepare([first])
+        assert other.address_version(first) == first_version
+    finally:
+        other.close()
+
+    remote.add_label(second, {"scam_type": "phishing", "risk_score": 0.9})
+    assert remote.data_version != data_version
+
+def test_concurrent_prepares_add_an_address_once(server):
+    address = SAMPLE_ADDRESSES[0]
+    server.latency_seconds = 0.05
+    sources = [RemoteDataSource({"base_url": server.url, "api_key": "test-key"}) for _ in range(2)]
+    try:
+        single, concurrent = sources
+        single.prepare([address])
+        concurrent.graph
+        threads = [threading.Thread(target=concurrent.prepare, args=([address],)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert concurrent.revision == single.revision > 0
+        assert len(concurrent.transactions) == len(single.transactions)
+        assert concurrent.address_version(address) == single.address_version(address)
+    finally:
+        for source in sources:
+            source.close()
+
+def test_malformed_transactions_are_skipped(server, remote):
+    address = SAMPLE_ADDRESSES[0]
+    lookup = server.lookup
+
+    def malformed_lookup(endpoint, lookup_address):
+        result = lookup(endpoint, lookup_address)
+        if endpoint == "transactions" and lookup_address == address:
+            result = result + [
+                {"hash": "0xmissing-timestamp", "from": address, "to": SAMPLE_ADDRESSES[1], "value": "1 ETH"},
+                {"hash": "0xbad-timestamp", "from": address, "to": SAMPLE_ADDRESSES[1], "timestamp": "yesterday"},
+                {"from": address, "to": SAMPLE_ADDRESSES[1], "timestamp": "2025-05-10T14:32:15Z"},
+                "not a transaction",
+            ]
+        return result
+
+    server.lookup = malformed_lookup
+    remote.prepare([address])
+
+    assert remote.skipped == 4
+    assert "0xmissing-timestamp" not in remote.transactions
+    assert remote.transactions.get_transactions_by_address(address) == (
+        in_memory_source().transactions.get_transactions_by_address(address)
+    )
+
+def test_store_rows_are_published_whole():
+    store = TransactionStore()
+    intern = store._intern
+    seen = []
+
+    def observing_intern(value):
+        # Runs while the row is being written, before it is published
+        seen.append((len(store), len(store.table.timestamps), "0xnew" in store, list(store.iter_transactions())))
+        return intern(value)
+
+    store._intern = observing_intern
+    store.add_transaction("0xnew", {"from": "0xa", "to": "0xb", "value": "1 ETH", "timestamp": "2025-05-10T14:32:15Z"})
+
+    assert seen and all(state == (0, 0, False, []) for state in seen)
+    assert len(store) == 1
+    assert store.get_transaction("0xnew")["value"] == "1 ETH"
@@ -0,0 +1,124 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for result cache invalidation when data is added."""
+
+import pytest
+
+from blockchain_security import config
+from blockchain_security.tools import blockchain_data
+from blockchain_security.tools.data_source import DataSource, using_data_source
+from blockchain_security.tools.label_store import LabelStore
+from blockchain_security.tools.result_cache import result_cache
+from blockchain_security.tools.risk_score_api import risk_score_api
+from blockchain_security.tools.transaction_data import transaction_data_tool
+from blockchain_security.tools.transaction_store import TransactionStore
+from blockchain_security.tools.transaction_table import format_timestamp
+
+from .conftest import BASE_TIME
+
+ADDRESS = "0x6666ffff7777gggg8888hhhh9999iiii0000jjjj"
+OTHER_ADDRESS = "0x7777gggg8888hhhh9999iiii0000jjjj1111kkkk"
+
+def _source():
+    return DataSource(
+        TransactionStore.from_transactions(dict(blockchain_data.SAMPLE_TRANSACTIONS)),
+        {address: dict(wallet) for address, wallet in blockchain_data.SAMPLE_WALLETS.items()},
+        LabelStore(dict(blockchain_data.KNOWN_SCAM_ADDRESSES)),
+        version="test",
+    )
+
+def _add_label(source):
+    source.add_label(ADDRESS, {
+        "scam_type": "rug_pull",
+        "risk_score": 0.9,
+        "reported_by": ["Etherscan"],
+        "first_reported": "2025-01-01",
+        "description": "Test label"
+    })
+
+def _add_transactions(source):
+    source.add_transactions(
+        (f"0x{index:064x}", {
+            "from": ADDRESS,
+            "to": OTHER_ADDRESS,
+            "value": "40 ETH",
+            "timestamp": format_timestamp(BASE_TIME + index),
+            "status": "success",
+        })
+        for index in range(1, 4)
+    )
+
+def _add_wallet(source):
+    source.add_wallet(ADDRESS, {
+        "first_activity": "2025-05-01",
+        "transaction_count": 3,
+        "current_balance": {"ETH": "0.1"},
+        "connected_addresses": [OTHER_ADDRESS]
+    })
+
+@pytest.fixture(params=[False, True], ids=["memory", "persistent"])
+def persistent(request, tmp_path, monkeypatch):
+    if request.param:
+        monkeypatch.setattr(config, "PERSISTENT_CACHE_PATH", str(tmp_path / "results.db"))
+    return request.param
+
+@pytest.mark.parametrize("change", [_add_label, _add_transactions, _add_wallet])
+@pytest.mark.parametrize("tool", [
+    risk_score_api.get_risk_score,
+    risk_score_api.analyze_behavioral_patterns,
+    transaction_data_tool.analyze_transaction_patterns,
+])
+def test_results_are_recomputed_after_data_is_added(persistent, change, tool):
+    def counts():
+        return result_cache.stats()["namespaces"][tool.__name__]
+
+    source = _source()
+    with using_data_source(source):
+        tool(ADDRESS)
+        hits = counts()["hits"]
+        tool(ADDRESS)
+        assert counts()["hits"] == hits + 1
+
+        change(source)
+        misses = counts()["misses"]
+        after = tool(ADDRESS)
+        assert counts()["misses"] == misses + 1
+
+        result_cache.clear()
+        config_path, config.PERSISTENT_CACHE_PATH = config.PERSISTENT_CACHE_PATH, None
+        try:
+            assert after == tool(ADDRESS)
+        finally:
+            config.PERSISTENT_CACHE_PATH = config_path
+
+def test_new_label_reaches_cached_risk_score(persistent):
+    source = _source()
+    with using_data_source(source):
+        assert risk_score_api.get_risk_score(ADDRESS)["risk_level"] == "Low"
+        _add_label(source)
+        assert risk_score_api.get_risk_score(ADDRESS)["risk_level"] == "High"
+
+def test_new_transactions_reach_cached_patterns(persistent):
+    source = _source()
+    with using_data_source(source):
+        count = transaction_data_tool.analyze_transaction_patterns(ADDRESS)["transaction_count"]
+        _add_transactions(source)
+        assert transaction_data_tool.analyze_transaction_patterns(ADDRESS)["transaction_count"] == count + 3
+
+def test_cached_results_are_copies():
+    with using_data_source(_source()):
+        result = risk_score_api.get_risk_score(ADDRESS)
+        result["risk_score"] = -1
+        assert risk_score_api.get_risk_score(ADDRESS)["risk_score"] != -1
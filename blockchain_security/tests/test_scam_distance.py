@@ -0,0 +1,143 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the scam-distance index against a breadth-first search of the raw data."""
+
+import random
+from collections import deque
+
+import pytest
+
+from blockchain_security.tools.address_graph import EDGE_ANY, EDGE_TRANSACTION, EDGE_WALLET_LINK
+from blockchain_security.tools.address_lookup import address_lookup_tool
+from blockchain_security.tools.data_source import DataSource, using_data_source
+from blockchain_security.tools.label_store import LabelStore
+from blockchain_security.tools.transaction_store import TransactionStore
+
+from .conftest import make_addresses, make_transactions
+
+MAX_HOPS = 3
+LABEL = {
+    "scam_type": "phishing",
+    "risk_score": 0.9,
+    "reported_by": ["Etherscan"],
+    "first_reported": "2025-01-01",
+    "description": "Test label"
+}
+
+def _random_data(seed, count=40):
+    rng = random.Random(seed)
+    addresses = make_addresses(count)
+    transactions = make_transactions(seed, addresses[:count // 2], count // 2)
+    wallets = {
+        address: {"connected_addresses": rng.sample(addresses, rng.randrange(3))}
+        for address in rng.sample(addresses, count // 2)
+    }
+    labels = {address: LABEL for address in rng.sample(addresses, 3)}
+    return addresses, transactions, wallets, labels
+
+def _source(transactions, wallets, labels):
+    return DataSource(TransactionStore.from_transactions(transactions), dict(wallets), LabelStore(dict(labels)), "test")
+
+def brute_force_distance(transactions, wallets, labels, address, edge_kinds):
+    # Shortest path from the address to a labelled address, following a
+    # wallet's own connected_addresses and transactions in either direction
+    adjacency = {}
+    if edge_kinds & EDGE_WALLET_LINK:
+        for wallet, wallet_data in wallets.items():
+            adjacency.setdefault(wallet, set()).update(wallet_data["connected_addresses"])
+    if edge_kinds & EDGE_TRANSACTION:
+        for tx_data in transactions.values():
+            adjacency.setdefault(tx_data["from"], set()).add(tx_data["to"])
+            adjacency.setdefault(tx_data["to"], set()).add(tx_data["from"])
+
+    distances = {address: 0}
+    queue = deque([address])
+    while queue:
+        node = queue.popleft()
+        for neighbor in adjacency.get(node, ()):
+            if neighbor not in distances:
+                if neighbor in labels:
+                    return distances[node] + 1
+                distances[neighbor] = distances[node] + 1
+                queue.append(neighbor)
+    return None
+
+def _check_distances(source, addresses, transactions, wallets, labels, edge_kinds):
+    index = source.scam_distance(edge_kinds)
+    for address in addresses:
+        if address in labels:
+            continue
+        expected = brute_force_distance(transactions, wallets, labels, address, edge_kinds)
+        if expected is not None and expected > MAX_HOPS:
+            expected = None
+        found = index.lookup(address)
+        assert (found and found["hops"]) == expected, address
+        if found is not None:
+            assert found["path"][0] == address and found["path"][-1] in labels
+            assert found["path"][-1] == found["address"]
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("edge_kinds", [EDGE_WALLET_LINK, EDGE_TRANSACTION, EDGE_ANY])
+def test_index_matches_brute_force(seed, edge_kinds, monkeypatch):
+    monkeypatch.setattr("blockchain_security.config.SCAM_DISTANCE_MAX_HOPS", MAX_HOPS)
+    addresses, transactions, wallets, labels = _random_data(seed)
+    source = _source(transactions, wallets, labels)
+
+    _check_distances(source, addresses, transactions, wallets, labels, edge_kinds)
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("edge_kinds", [EDGE_WALLET_LINK, EDGE_ANY])
+def test_incremental_updates_match_brute_force(seed, edge_kinds, monkeypatch):
+    monkeypatch.setattr("blockchain_security.config.SCAM_DISTANCE_MAX_HOPS", MAX_HOPS)
+    addresses, transactions, wallets, labels = _random_data(seed)
+    initial_transactions = dict(list(transactions.items())[:len(transactions) // 2])
+    initial_wallets = dict(list(wallets.items())[:len(wallets) // 2])
+    initial_labels = dict(list(labels.items())[:1])
+    source = _source(initial_transactions, initial_wallets, initial_labels)
+    source.scam_distance(edge_kinds)
+
+    source.add_transactions(
+        (tx_hash, tx_data) for tx_hash, tx_data in transactions.items() if tx_hash not in initial_transactions
+    )
+    for address, wallet_data in wallets.items():
+        if address not in initial_wallets:
+            source.add_wallet(address, wallet_data)
+    for address, record in labels.items():
+        if address not in initial_labels:
+            source.add_label(address, record)
+
+    _check_distances(source, addresses, transactions, wallets, labels, edge_kinds)
+
+def test_wallet_links_are_directed():
+    scam, listed_by_scam, listing_scam, two_hops = make_addresses(4)
+    wallets = {
+        scam: {"connected_addresses": [listed_by_scam]},
+        listing_scam: {"connected_addresses": [scam]},
+        two_hops: {"connected_addresses": [listing_scam]},
+    }
+    source = _source({}, wallets, {scam: LABEL})
+
+    with using_data_source(source):
+        # A scam wallet listing an address does not connect that address to it
+        assert address_lookup_tool.check_scam_status(listed_by_scam) == {
+            "is_scam": False, "is_connected_to_scam": False
+        }
+        connected = address_lookup_tool.check_scam_status(listing_scam)
+        assert connected["connected_scam_address"] == scam
+        assert connected["path_edges"] == ["wallet_link"]
+        assert address_lookup_tool.check_scam_status(two_hops, max_hops=2)["path"] == [two_hops, listing_scam, scam]
+        # Beyond the index's hop limit the graph search follows the same direction
+        assert not address_lookup_tool.check_scam_status(listed_by_scam, max_hops=10)["is_connected_to_scam"]
+        assert address_lookup_tool.check_scam_status(two_hops, max_hops=10)["hops"] == 2
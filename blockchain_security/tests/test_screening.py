@@ -0,0 +1,100 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for bulk address screening."""
+
+import io
+import json
+
+import pytest
+
+from blockchain_security.tools import data_source, screening
+from blockchain_security.tools.address_lookup import address_lookup_tool
+from blockchain_security.tools.data_source import mapped_source, using_data_source
+from blockchain_security.tools.dataset import write_dataset
+from blockchain_security.tools.risk_score_api import risk_score_api
+from blockchain_security.tools.transaction_store import TransactionStore
+
+from .conftest import make_addresses, make_transactions
+
+ADDRESSES = make_addresses(12)
+# Unknown addresses and a repeat are screened too
+SCREENED = ADDRESSES + [ADDRESSES[3], "0x" + "ab" * 20]
+
+@pytest.fixture(autouse=True)
+def restore_data_source(monkeypatch):
+    # Screening in-process activates the dataset for the rest of the process
+    monkeypatch.setattr(data_source, "_active_source", data_source._active_source)
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    wallets = {ADDRESSES[0]: {"current_balance": {"ETH": "1.5"}, "connected_addresses": ADDRESSES[1:3]}}
+    labels = {ADDRESSES[3]: {
+        "scam_type": "phishing",
+        "risk_score": 0.9,
+        "reported_by": ["Etherscan"],
+        "first_reported": "2025-01-01",
+        "description": "Test label"
+    }}
+    path = str(tmp_path / "data.bcs")
+    store = TransactionStore.from_transactions(make_transactions(0, ADDRESSES, 200))
+    write_dataset(path, store, wallets, labels, version="screening")
+    return path
+
+def _expected(path):
+    # Each address screened on its own with the single-address tools
+    with using_data_source(mapped_source(path)):
+        results = [
+            {
+                "address": address,
+                "scam_status": address_lookup_tool.check_scam_status(address),
+                "risk_score": risk_score_api.get_risk_score(address),
+                "behavioral_patterns": risk_score_api.analyze_behavioral_patterns(address)
+            }
+            for address in SCREENED
+        ]
+    return json.loads(json.dumps(results))
+
+def _read_results(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_screen_matches_single_address_tools(dataset_path, workers):
+    output = io.StringIO()
+    stats = screening.screen(SCREENED, output, workers=workers, chunk_size=3, dataset_path=dataset_path)
+
+    expected = _expected(dataset_path)
+    # Results are written in input order, whatever order the chunks finish in
+    assert _read_results(output.getvalue()) == expected
+    assert stats["addresses"] == len(SCREENED)
+    assert stats["high_risk"] == sum(result["risk_score"]["risk_level"] == "High" for result in expected)
+    assert stats["high_risk"] >= 2
+
+def test_read_addresses_skips_blank_and_comment_lines(tmp_path):
+    path = tmp_path / "addresses.txt"
+    path.write_text(f"# Watch list\n{ADDRESSES[0]}\n\n  {ADDRESSES[1]}  \n#{ADDRESSES[2]}\n", encoding="utf-8")
+
+    assert list(screening.read_addresses(str(path))) == ADDRESSES[:2]
+
+def test_main_writes_results(dataset_path, tmp_path):
+    addresses_path = tmp_path / "addresses.txt"
+    addresses_path.write_text("\n".join(SCREENED) + "\n", encoding="utf-8")
+    output_path = tmp_path / "results.jsonl"
+
+    exit_code = screening.main([
+        str(addresses_path), "--output", str(output_path), "--dataset", dataset_path, "--workers", "0"
+    ])
+
+    assert exit_code == 0
+    assert _read_results(output_path.read_text(encoding="utf-8")) == _expected(dataset_path)
@@ -0,0 +1,103 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for single-flight sharing of results and errors."""
+
+import threading
+import time
+
+import pytest
+
+from blockchain_security.tools.single_flight import SingleFlight
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+def _start(target, *args):
+    outcome = {}
+
+    def run():
+        try:
+            outcome["value"] = target(*args)
+        except Exception as error:
+            outcome["error"] = error
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, outcome
+
+def _blocked_leader(flight, addresses, compute):
+    # Start a leader computing addresses, holding it until released
+    started, release = threading.Event(), threading.Event()
+
+    def blocked(missing):
+        started.set()
+        release.wait()
+        return compute(missing)
+
+    thread, outcome = _start(flight.do_many, "ns", 1, addresses, blocked)
+    started.wait()
+    return thread, outcome, release
+
+def test_leader_error_reaches_every_waiter():
+    flight = SingleFlight()
+
+    def fail(missing):
+        raise RuntimeError("lookup failed")
+
+    leader, leader_outcome, release = _blocked_leader(flight, ["a", "b"], fail)
+    waiters = [_start(flight.do_many, "ns", 1, ["b", "a"], pytest.fail) for _ in range(4)]
+    _wait_for(lambda: flight.stats()["deduplicated"] == 8)
+    release.set()
+    for thread, _ in [(leader, None), *waiters]:
+        thread.join()
+
+    assert str(leader_outcome["error"]) == "lookup failed"
+    assert all(outcome["error"] is leader_outcome["error"] for _, outcome in waiters)
+    assert flight.stats()["in_flight"] == 0
+
+    # The failed keys are released, so the next call computes again
+    assert flight.do_many("ns", 1, ["a"], lambda missing: ["ok"]) == ["ok"]
+
+def test_waiter_computes_keys_nobody_else_is_computing():
+    flight = SingleFlight()
+    leader, leader_outcome, release = _blocked_leader(flight, ["a", "b"], lambda missing: [{"v": address} for address in missing])
+    computed = []
+
+    def compute(missing):
+        computed.extend(missing)
+        return [{"v": address} for address in missing]
+
+    waiter, waiter_outcome = _start(flight.do_many, "ns", 1, ["b", "c"], compute)
+    _wait_for(lambda: flight.stats()["deduplicated"] == 1)
+    release.set()
+    leader.join()
+    waiter.join()
+
+    assert computed == ["c"]
+    assert leader_outcome["value"] == [{"v": "a"}, {"v": "b"}]
+    assert waiter_outcome["value"] == [{"v": "b"}, {"v": "c"}]
+    # Waiters get their own copy of the leader's result
+    assert waiter_outcome["value"][0] is not leader_outcome["value"][1]
+
+def test_versions_are_computed_separately():
+    flight = SingleFlight()
+    leader, _, release = _blocked_leader(flight, ["a"], lambda missing: ["old"])
+
+    assert flight.do_many("ns", 2, ["a"], lambda missing: ["new"]) == ["new"]
+    release.set()
+    leader.join()
@@ -0,0 +1,151 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the real-time stream monitor and its stream readers."""
+
+import asyncio
+import json
+
+from blockchain_security.tools.data_source import DataSource, using_data_source
+from blockchain_security.tools.label_store import LabelStore
+from blockchain_security.tools.risk_score_api import risk_score_api
+from blockchain_security.tools.stream_monitor import StreamMonitor, parse_stream_line, tail_file
+from blockchain_security.tools.transaction_store import TransactionStore
+from blockchain_security.tools.transaction_table import format_timestamp
+
+from .conftest import BASE_TIME, make_addresses
+
+SCAM, USER, WALLET, OTHER, LATE = make_addresses(5)
+WINDOWS = [{"window_seconds": 60, "min_count": 3, "min_value": None}]
+LABEL = {
+    "scam_type": "phishing",
+    "risk_score": 0.9,
+    "reported_by": ["Etherscan"],
+    "first_reported": "2025-01-01",
+    "description": "Test label"
+}
+
+def _source():
+    wallets = {WALLET: {"current_balance": {"ETH": "1"}, "connected_addresses": [SCAM]}}
+    return DataSource(TransactionStore.from_transactions({}), wallets, LabelStore({SCAM: LABEL}), version="stream")
+
+def _transfer(sender, recipient, offset, value="1 ETH"):
+    return {"from": sender, "to": recipient, "value": value, "timestamp": format_timestamp(BASE_TIME + offset)}
+
+def _hash(index):
+    return f"0x{index:064x}"
+
+def test_scam_interaction_alerts_once():
+    monitor = StreamMonitor(_source(), windows=WINDOWS)
+
+    alerts = monitor.process(_hash(1), _transfer(USER, SCAM, 0))
+    assert {alert["address"]: alert["risk_level"] for alert in alerts} == {USER: "High", SCAM: "High"}
+    assert all(alert["tx_hash"] == _hash(1) for alert in alerts)
+    assert "scam_interaction" in monitor.states[USER].patterns
+
+    # The scores did not rise, so nothing is raised again
+    assert monitor.process(_hash(2), _transfer(USER, SCAM, 10)) == []
+    assert (monitor.events, monitor.alerts) == (2, 2)
+
+def test_connected_wallet_scored_like_risk_score():
+    source = _source()
+    monitor = StreamMonitor(source, windows=WINDOWS)
+
+    [alert] = monitor.process(_hash(1), _transfer(WALLET, OTHER, 0))
+
+    with using_data_source(source):
+        expected = risk_score_api.get_risk_score(WALLET)
+    assert alert["address"] == WALLET
+    assert (alert["risk_score"], alert["risk_level"]) == (expected["risk_score"], expected["risk_level"])
+
+def test_burst_alone_does_not_alert():
+    monitor = StreamMonitor(_source(), windows=WINDOWS)
+
+    alerts = [monitor.process(_hash(index), _transfer(USER, OTHER, index * 20)) for index in range(3)]
+
+    assert alerts == [[], [], []]
+    assert monitor.states[USER].patterns["rapid_transfers"]["details"]["count"] == 3
+
+def test_labels_and_wallets_added_later_are_picked_up():
+    source = _source()
+    monitor = StreamMonitor(source, windows=WINDOWS)
+    assert monitor.process(_hash(1), _transfer(LATE, OTHER, 0)) == []
+
+    source.add_label(LATE, LABEL)
+    alerts = monitor.process(_hash(2), _transfer(LATE, USER, 10))
+    assert [alert["address"] for alert in alerts] == [LATE, USER]
+
+    # A wallet linked to the new scam address is found through the index
+    source.add_wallet(OTHER, {"current_balance": {}, "connected_addresses": [LATE]})
+    alerts = monitor.process(_hash(3), _transfer(OTHER, USER, 20))
+    assert [alert["address"] for alert in alerts] == [OTHER]
+
+def test_state_stays_bounded():
+    addresses = make_addresses(50)
+    monitor = StreamMonitor(_source(), windows=WINDOWS, max_addresses=10, idle_seconds=100)
+
+    for index in range(1, 50):
+        monitor.process(_hash(index), _transfer(addresses[index - 1], addresses[index], index))
+    assert len(monitor.states) == 10
+    assert list(monitor.states)[-1] == addresses[49]
+
+    # Everything but the two parties of the latest transaction is now idle
+    monitor.process(_hash(50), _transfer(USER, OTHER, 200))
+    assert set(monitor.states) == {USER, OTHER}
+    assert monitor.evicted == 50 - 2 + 2
+
+def test_ingest_adds_transactions():
+    source = _source()
+    monitor = StreamMonitor(source, windows=WINDOWS, ingest=True)
+
+    monitor.process(_hash(1), _transfer(USER, OTHER, 0))
+    monitor.process(_hash(1), _transfer(USER, OTHER, 0))
+
+    assert len(source.transactions) == 1
+    assert source.transactions.get_transaction(_hash(1))["from"] == USER
+
+def test_parse_stream_line():
+    transaction = {"hash": _hash(1), **_transfer(USER, OTHER, 0)}
+    assert list(parse_stream_line(json.dumps(transaction))) == [(_hash(1), _transfer(USER, OTHER, 0))]
+
+    block = {
+        "number": "0x10",
+        "timestamp": hex(BASE_TIME),
+        "transactions": [
+            {"hash": _hash(2), "from": USER, "to": None, "value": hex(10 ** 18), "gas": "0x5208"},
+            {"hash": _hash(3), "from": USER, "to": OTHER, "value": "not hex"},
+            {"hash": _hash(4), "to": OTHER, "value": "0x0"},
+        ]
+    }
+    records = list(parse_stream_line(json.dumps({"jsonrpc": "2.0", "id": 1, "result": block})))
+    assert [(tx_hash, tx_data["from"], tx_data["to"]) for tx_hash, tx_data in records] == [(_hash(2), USER, "")]
+    assert records[0][1]["timestamp"] == format_timestamp(BASE_TIME)
+
+    assert list(parse_stream_line('{"jsonrpc": "2.0", "id": 1, "result": null}')) == []
+    assert list(parse_stream_line("  \n")) == []
+
+def test_monitor_tails_file(tmp_path):
+    path = tmp_path / "stream.jsonl"
+    lines = [json.dumps({"hash": _hash(1), **_transfer(USER, OTHER, 0)}), ""]
+    lines.append(json.dumps({"hash": _hash(2), **_transfer(USER, SCAM, 10)}))
+    # The last line has no newline yet
+    path.write_text("\n".join(lines), encoding="utf-8")
+    monitor = StreamMonitor(_source(), windows=WINDOWS)
+
+    async def collect():
+        return [alert async for alert in monitor.monitor(tail_file(str(path), follow=False))]
+
+    alerts = asyncio.run(collect())
+    assert monitor.events == 2
+    assert {alert["address"] for alert in alerts} == {USER, SCAM}
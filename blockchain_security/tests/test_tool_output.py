@@ -0,0 +1,93 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for paging through an address's transactions with cursors."""
+
+import pytest
+
+from blockchain_security.sub_agents.transaction_analysis.agent import analyze_transactions
+from blockchain_security.tools.data_source import DataSource, using_data_source
+from blockchain_security.tools.label_store import LabelStore
+from blockchain_security.tools.tool_output import estimate_tokens, evidence_order, transaction_page
+from blockchain_security.tools.transaction_store import TransactionStore
+from blockchain_security.tools.transaction_table import format_timestamp
+
+from .conftest import BASE_TIME, make_addresses, make_transactions
+
+ADDRESSES = make_addresses(4)
+ADDRESS = ADDRESSES[0]
+
+@pytest.fixture
+def source():
+    transactions = make_transactions(7, ADDRESSES, 120)
+    labels = {ADDRESSES[1]: {"scam_type": "phishing", "risk_score": 0.9}}
+    return DataSource(TransactionStore.from_transactions(transactions), {}, LabelStore(labels), version="test")
+
+def _pages(source, address, **bounds):
+    rows = source.transactions.rows_for_address(address)
+    pages = []
+    cursor = None
+    while True:
+        page = transaction_page(source, address, rows, {"address": address}, "transactions", cursor, **bounds)
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return rows, pages
+
+@pytest.mark.parametrize("token_budget, max_rows", [(400, 10), (2000, 7), (50, 10)])
+def test_pages_cover_every_transaction_once_in_evidence_order(source, token_budget, max_rows):
+    rows, pages = _pages(source, ADDRESS, token_budget=token_budget, max_rows=max_rows)
+
+    listed = [transaction["hash"] for page in pages for transaction in page["transactions"]]
+    expected = [source.transactions.hash_at(row) for row in evidence_order(source, ADDRESS, rows).tolist()]
+    assert listed == expected
+    offset = 0
+    for page in pages:
+        assert page["page"] == {"offset": offset, "returned": len(page["transactions"]), "total": len(rows)}
+        assert 1 <= len(page["transactions"]) <= max_rows
+        assert len(page["transactions"]) == 1 or estimate_tokens(page) <= token_budget
+        offset += len(page["transactions"])
+
+def test_scam_counterparties_come_first(source):
+    rows, pages = _pages(source, ADDRESS)
+    scam_flags = [
+        ADDRESSES[1] in (transaction["from"], transaction["to"])
+        for page in pages for transaction in page["transactions"]
+    ]
+    assert scam_flags == sorted(scam_flags, reverse=True)
+
+def test_cursors_expire_when_data_changes(source):
+    rows, pages = _pages(source, ADDRESS, max_rows=5)
+    cursor = pages[0]["next_cursor"]
+
+    assert transaction_page(source, ADDRESSES[2], rows, {}, "transactions", cursor)["error"]
+    assert transaction_page(source, ADDRESS, rows, {}, "transactions", "12.deadbeef")["error"]
+    assert "error" not in transaction_page(source, ADDRESS, rows, {}, "transactions", cursor)
+
+    source.add_transactions([(f"0x{0:064x}", {
+        "from": ADDRESS, "to": ADDRESSES[3], "value": "1 ETH", "timestamp": format_timestamp(BASE_TIME)
+    })])
+    assert transaction_page(source, ADDRESS, rows, {}, "transactions", cursor)["error"]
+
+def test_tool_pages_through_transactions(source):
+    with using_data_source(source):
+        response = analyze_transactions(ADDRESS)
+        listed = [transaction["hash"] for transaction in response["transactions"]]
+        while response["next_cursor"]:
+            response = analyze_transactions(ADDRESS, cursor=response["next_cursor"])
+            assert "transaction_summary" not in response
+            listed += [transaction["hash"] for transaction in response["transactions"]]
+
+    store = source.transactions
+    assert sorted(listed) == sorted(store.hash_at(row) for row in store.rows_for_address(ADDRESS).tolist())
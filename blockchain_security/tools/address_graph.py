@@ -0,0 +1,375 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compressed sparse row address graph for scam proximity queries."""
+
+from collections.abc import Mapping
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+# Edge kinds, combined as bit flags when two addresses are linked both ways.
+# A wallet link points from the wallet to an address in its
+# connected_addresses; the reverse edge has kind EDGE_WALLET_LINKED_BY, so a
+# search that follows EDGE_WALLET_LINK only sees the wallet's own list.
+EDGE_WALLET_LINK = 1
+EDGE_TRANSACTION = 2
+EDGE_WALLET_LINKED_BY = 4
+EDGE_ANY = EDGE_WALLET_LINK | EDGE_TRANSACTION
+_EDGE_ALL = EDGE_ANY | EDGE_WALLET_LINKED_BY
+
+EDGE_KIND_NAMES = {
+    EDGE_WALLET_LINK: "wallet_link",
+    EDGE_TRANSACTION: "transaction",
+}
+
+def reverse_kinds(edge_kinds: int) -> int:
+    """
+    Get the kinds of the reverse edges of edges with the given kinds.
+
+    Args:
+        edge_kinds: Bit mask of EDGE_* kinds
+
+    Returns:
+        The mask with EDGE_WALLET_LINK and EDGE_WALLET_LINKED_BY swapped
+    """
+    swapped = EDGE_WALLET_LINKED_BY if edge_kinds & EDGE_WALLET_LINK else 0
+    swapped |= EDGE_WALLET_LINK if edge_kinds & EDGE_WALLET_LINKED_BY else 0
+    return (edge_kinds & EDGE_TRANSACTION) | swapped
+
+class AddressGraph:
+    """
+    Address graph stored as compressed sparse row arrays.
+
+    Node IDs reuse the transaction table's address IDs, with addresses that
+    only appear in wallet records appended after them. Each node's
+    neighbours are the slice indices[indptr[node]:indptr[node + 1]], with a
+    parallel kinds array recording whether the link comes from the node's
+    wallet connected_addresses, another wallet listing the node,
+    transactions or several of these. Every edge is stored in both
+    directions; transaction edges have the same kind both ways, wallet
+    links have EDGE_WALLET_LINK one way and EDGE_WALLET_LINKED_BY back.
+    Wallet links keep the order of each wallet's connected_addresses list.
+
+    The CSR arrays are immutable; edges and addresses added after the build
+    go into a small overlay adjacency that neighbour queries also read.
+    """
+
+    def __init__(
+        self,
+        table: Any,
+        extra_addresses: List[str],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        kinds: np.ndarray,
+    ) -> None:
+        self._table = table
+        self._base_count = len(table.addresses)
+        self._extra_addresses = extra_addresses
+        self._extra_lookup = {address: self._base_count + index for index, address in enumerate(extra_addresses)}
+        self.indptr = indptr
+        self.indices = indices
+        self.kinds = kinds
+        self._overlay: Dict[int, List[Tuple[int, int]]] = {}
+
+    @classmethod
+    def build(cls, wallets: Mapping, transactions: Any) -> "AddressGraph":
+        """
+        Build the graph from wallet links and transaction edges.
+
+        Args:
+            wallets: Mapping of address to wallet record with connected_addresses
+            transactions: A TransactionStore or MappedTransactionStore
+
+        Returns:
+            The built AddressGraph
+        """
+        table = transactions.table
+        base_count = len(table.addresses)
+        extra_addresses: List[str] = []
+        extra_lookup: Dict[str, int] = {}
+
+        def node_id(address: str) -> int:
+            found = table.find_address_id(address)
+            if found is not None:
+                return found
+            if address not in extra_lookup:
+                extra_lookup[address] = base_count + len(extra_addresses)
+                extra_addresses.append(address)
+            return extra_lookup[address]
+
+        wallet_sources: List[int] = []
+        wallet_targets: List[int] = []
+        for address, wallet_data in wallets.items():
+            source = node_id(address)
+            for connected_address in wallet_data.get("connected_addresses", []):
+                wallet_sources.append(source)
+                wallet_targets.append(node_id(connected_address))
+
+        wallet_sources_array = np.asarray(wallet_sources, dtype=np.int64)
+        wallet_targets_array = np.asarray(wallet_targets, dtype=np.int64)
+        from_ids = np.asarray(table.from_ids, dtype=np.int64)
+        to_ids = np.asarray(table.to_ids, dtype=np.int64)
+
+        # Forward wallet links first so each wallet keeps its list order
+        sources = np.concatenate((wallet_sources_array, wallet_targets_array, from_ids, to_ids))
+        targets = np.concatenate((wallet_targets_array, wallet_sources_array, to_ids, from_ids))
+        kinds = np.concatenate((
+            np.full(len(wallet_sources_array), EDGE_WALLET_LINK, dtype=np.int8),
+            np.full(len(wallet_sources_array), EDGE_WALLET_LINKED_BY, dtype=np.int8),
+            np.full(2 * len(from_ids), EDGE_TRANSACTION, dtype=np.int8),
+        ))
+        node_count = base_count + len(extra_addresses)
+        return cls(table, extra_addresses, *cls._compress(sources, targets, kinds, node_count))
+
+    @staticmethod
+    def _compress(sources: np.ndarray, targets: np.ndarray, kinds: np.ndarray, node_count: int):
+        keep = sources != targets
+        sources, targets, kinds = sources[keep], targets[keep], kinds[keep]
+
+        # Merge duplicate edges, OR-ing their kinds and keeping first-seen order
+        keys = sources * max(node_count, 1) + targets
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]) if len(keys) else np.zeros(0, dtype=np.int64)
+        merged_kinds = np.bitwise_or.reduceat(kinds[order], starts) if len(starts) else kinds[:0]
+        first_seen = order[starts]
+
+        edge_order = np.lexsort((first_seen, sources[first_seen]))
+        indices = targets[first_seen][edge_order]
+        edge_kinds = merged_kinds[edge_order].astype(np.int8)
+        indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources[first_seen], minlength=node_count), out=indptr[1:])
+        return indptr, indices, edge_kinds
+
+    def __len__(self) -> int:
+        return self._base_count + len(self._extra_addresses)
+
+    def node_id(self, address: str) -> Optional[int]:
+        """
+        Get the node ID of an address.
+
+        Args:
+            address: The blockchain address
+
+        Returns:
+            The node ID, or None if the address is not in the graph
+        """
+        found = self._table.find_address_id(address)
+        if found is not None and found < self._base_count:
+            return found
+        return self._extra_lookup.get(address)
+
+    def add_node(self, address: str) -> int:
+        """
+        Get the node ID of an address, adding it to the graph if it is new.
+
+        Args:
+            address: The blockchain address
+
+        Returns:
+            The node ID
+        """
+        node = self.node_id(address)
+        if node is None:
+            node = len(self)
+            self._extra_lookup[address] = node
+            self._extra_addresses.append(address)
+        return node
+
+    def add_edge(self, address: str, other_address: str, kind: int) -> Optional[Tuple[int, int]]:
+        """
+        Link two addresses in the overlay adjacency.
+
+        Args:
+            address: One end of the link, the wallet for a wallet link
+            other_address: The other end of the link
+            kind: EDGE_* kind of the link from address to other_address
+
+        Returns:
+            The two node IDs, or None for a self-link
+        """
+        if address == other_address:
+            return None
+        node = self.add_node(address)
+        other = self.add_node(other_address)
+        self._overlay.setdefault(node, []).append((other, kind))
+        self._overlay.setdefault(other, []).append((node, reverse_kinds(kind)))
+        return node, other
+
+    def address_of(self, node: int) -> str:
+        """
+        Get the address of a node.
+
+        Args:
+            node: The node ID
+
+        Returns:
+            The blockchain address
+        """
+        if node < self._base_count:
+            return self._table.addresses[node]
+        return self._extra_addresses[node - self._base_count]
+
+    def neighbors(self, node: int, edge_kinds: int = EDGE_ANY) -> np.ndarray:
+        """
+        Get the neighbours of a node over the given edge kinds.
+
+        Args:
+            node: The node ID
+            edge_kinds: Bit mask of EDGE_* kinds to follow
+
+        Returns:
+            Array of neighbour node IDs in adjacency order
+        """
+        neighbors = self.indices[:0]
+        if node < len(self.indptr) - 1:
+            start, end = self.indptr[node], self.indptr[node + 1]
+            neighbors = self.indices[start:end]
+            if edge_kinds != _EDGE_ALL:
+                neighbors = neighbors[(self.kinds[start:end] & edge_kinds) != 0]
+
+        overlay = self._overlay.get(node)
+        if overlay:
+            added = [neighbor for neighbor, kind in overlay if kind & edge_kinds]
+            neighbors = np.concatenate((neighbors, np.asarray(added, dtype=neighbors.dtype)))
+        return neighbors
+
+    def expand(self, frontier: np.ndarray, edge_kinds: int = EDGE_ANY) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the neighbours of a whole BFS frontier in one vectorized pass.
+
+        Args:
+            frontier: Array of node IDs
+            edge_kinds: Bit mask of EDGE_* kinds to follow
+
+        Returns:
+            Tuple of (owners, neighbors) arrays, where neighbors[i] is adjacent
+            to owners[i], in frontier then adjacency order
+        """
+        csr_frontier = frontier[frontier < len(self.indptr) - 1]
+        starts = self.indptr[csr_frontier]
+        counts = self.indptr[csr_frontier + 1] - starts
+        owners = np.repeat(csr_frontier, counts)
+        positions = np.arange(counts.sum(), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions += np.repeat(starts, counts)
+        neighbors = self.indices[positions]
+        if edge_kinds != _EDGE_ALL:
+            keep = (self.kinds[positions] & edge_kinds) != 0
+            owners, neighbors = owners[keep], neighbors[keep]
+
+        if self._overlay:
+            added = [
+                (node, neighbor)
+                for node in frontier.tolist()
+                for neighbor, kind in self._overlay.get(node, ())
+                if kind & edge_kinds
+            ]
+            if added:
+                added_array = np.asarray(added, dtype=np.int64)
+                owners = np.concatenate((owners, added_array[:, 0]))
+                neighbors = np.concatenate((neighbors, added_array[:, 1]))
+        return owners, neighbors
+
+    def edge_kind(self, source: int, target: int) -> int:
+        """
+        Get the combined EDGE_* kinds linking two adjacent nodes.
+
+        Args:
+            source: One node ID
+            target: The other node ID
+
+        Returns:
+            Bit mask of the kinds linking the nodes, 0 if they are not adjacent
+        """
+        kind = 0
+        if source < len(self.indptr) - 1:
+            start, end = self.indptr[source], self.indptr[source + 1]
+            positions = np.flatnonzero(self.indices[start:end] == target)
+            if len(positions):
+                kind = int(self.kinds[start + positions[0]])
+        for neighbor, overlay_kind in self._overlay.get(source, ()):
+            if neighbor == target:
+                kind |= overlay_kind
+        return kind
+
+    def describe_path(self, nodes: List[int]) -> Dict[str, Any]:
+        """
+        Describe a path of node IDs as addresses and edge kind names.
+
+        Args:
+            nodes: Node IDs from the start address to the target
+
+        Returns:
+            Dictionary with the target address, hop count, path of addresses
+            and the kind of each edge on the path
+        """
+        edges = []
+        for source, destination in zip(nodes, nodes[1:]):
+            kind = self.edge_kind(source, destination)
+            edges.append("+".join(name for flag, name in EDGE_KIND_NAMES.items() if kind & flag))
+
+        return {
+            "address": self.address_of(nodes[-1]),
+            "hops": len(nodes) - 1,
+            "path": [self.address_of(node) for node in nodes],
+            "path_edges": edges,
+        }
+
+    def nearest_labelled(
+        self,
+        address: str,
+        labels: Mapping,
+        max_hops: int = 1,
+        edge_kinds: int = EDGE_ANY,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the closest labelled address within a hop limit using breadth-first search.
+
+        Only the neighbourhood up to max_hops is visited, and the search stops
+        at the first level that contains a labelled address.
+
+        Args:
+            address: The address to start from
+            labels: Mapping whose keys are the target addresses, e.g. scam labels
+            max_hops: Maximum path length to search
+            edge_kinds: Bit mask of EDGE_* kinds to follow
+
+        Returns:
+            Dictionary with the labelled address, hop count, path of addresses
+            and the kind of each edge on the path, or None if none is in range
+        """
+        start = self.node_id(address)
+        if start is None or max_hops < 1:
+            return None
+
+        parents: Dict[int, int] = {start: -1}
+        frontier = [start]
+        for hops in range(1, max_hops + 1):
+            next_frontier: List[int] = []
+            for node in frontier:
+                for neighbor in self.neighbors(node, edge_kinds).tolist():
+                    if neighbor in parents:
+                        continue
+                    parents[neighbor] = node
+                    if self.address_of(neighbor) in labels:
+                        nodes = [neighbor]
+                        while parents[nodes[-1]] != -1:
+                            nodes.append(parents[nodes[-1]])
+                        return self.describe_path(nodes[::-1])
+                    next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return None
@@ -15,44 +15,94 @@
 """Address lookup tool for blockchain security."""
 
 from typing import Dict, Any, List, Optional
-from . import blockchain_data
+from .address_graph import EDGE_TRANSACTION, EDGE_WALLET_LINK
+from .data_source import DataSource, prepared_source
 
 class AddressLookup:
     """Tool for looking up address information from simulated blockchain data."""
     
     @staticmethod
-    def check_scam_status(address: str) -> Dict[str, Any]:
+    def check_scam_status(
+        address: str, max_hops: int = 1, include_transactions: bool = False
+    ) -> Dict[str, Any]:
         """
         Check if an address is in the known scammer database.
         
+        Connections are answered from the precomputed scam-distance index,
+        or a bounded breadth-first search over the address graph for hop
+        limits beyond it, so the cost does not depend on the size of the
+        wallet table.
+        
         Args:
             address: The blockchain address to check
+            max_hops: How many links away a known scammer may be
+            include_transactions: Also follow transaction edges, not just
+                wallet connected_addresses links
             
         Returns:
             Dictionary with scam status information
         """
-        if address in blockchain_data.KNOWN_SCAM_ADDRESSES:
-            return {
-                "is_scam": True,
-                "details": blockchain_data.KNOWN_SCAM_ADDRESSES[address]
-            }
+        return AddressLookup.check_scam_status_many([address], max_hops, include_transactions)[0]
+    
+    @staticmethod
+    def check_scam_status_many(
+        addresses: List[str],
+        max_hops: int = 1,
+        include_transactions: bool = False,
+        source: Optional[DataSource] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Check a batch of addresses against the known scammer database.
+        
+        Labels are looked up once per distinct address and all connection
+        checks share one gather over the scam-distance index.
+        
+        Args:
+            addresses: The blockchain addresses to check
+            max_hops: How many links away a known scammer may be
+            include_transactions: Also follow transaction edges, not just
+                wallet connected_addresses links
+            source: DataSource to read from instead of the one
+                get_data_source returns
+            
+        Returns:
+            One check_scam_status result per address, in input order
+        """
+        source = prepared_source(addresses, source)
+        unique_addresses = list(dict.fromkeys(addresses))
+        results: Dict[str, Dict[str, Any]] = {}
+        
+        unlabelled = []
+        for address in unique_addresses:
+            scam_details = source.scam_addresses.get(address)
+            if scam_details is not None:
+                results[address] = {
+                    "is_scam": True,
+                    "details": scam_details
+                }
+            else:
+                unlabelled.append(address)
         
         # Check for connection to known scam addresses
-        for wallet_address, wallet_data in blockchain_data.SAMPLE_WALLETS.items():
-            if address == wallet_address:
-                for connected_address in wallet_data.get("connected_addresses", []):
-                    if connected_address in blockchain_data.KNOWN_SCAM_ADDRESSES:
-                        return {
-                            "is_scam": False,
-                            "is_connected_to_scam": True,
-                            "connected_scam_address": connected_address,
-                            "scam_details": blockchain_data.KNOWN_SCAM_ADDRESSES[connected_address]
-                        }
+        edge_kinds = EDGE_WALLET_LINK | (EDGE_TRANSACTION if include_transactions else 0)
+        for address, nearest in zip(unlabelled, source.nearest_scam_many(unlabelled, max_hops, edge_kinds)):
+            if nearest is not None:
+                results[address] = {
+                    "is_scam": False,
+                    "is_connected_to_scam": True,
+                    "connected_scam_address": nearest["address"],
+                    "scam_details": source.scam_addresses[nearest["address"]],
+                    "hops": nearest["hops"],
+                    "path": nearest["path"],
+                    "path_edges": nearest["path_edges"]
+                }
+            else:
+                results[address] = {
+                    "is_scam": False,
+                    "is_connected_to_scam": False
+                }
         
-        return {
-            "is_scam": False,
-            "is_connected_to_scam": False
-        }
+        return [results[address] for address in addresses]
     
     @staticmethod
     def get_address_details(address: str) -> Dict[str, Any]:
@@ -65,25 +115,33 @@ class AddressLookup:
         Returns:
             Dictionary with address details
         """
-        # Check if we have this address in our sample wallet data
-        wallet_data = blockchain_data.SAMPLE_WALLETS.get(address, {})
-        scam_status = AddressLookup.check_scam_status(address)
+        return AddressLookup.get_address_details_many([address])[0]
+    
+    @staticmethod
+    def get_address_details_many(addresses: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get detailed information about a batch of addresses.
         
-        # Get transactions related to this address
-        related_transactions = []
-        for tx_hash, tx_data in blockchain_data.SAMPLE_TRANSACTIONS.items():
-            if tx_data["from"] == address or tx_data["to"] == address:
-                related_transactions.append({
-                    "hash": tx_hash,
-                    **tx_data
-                })
+        Args:
+            addresses: The blockchain addresses to look up
+            
+        Returns:
+            One get_address_details result per address, in input order
+        """
+        source = prepared_source(addresses)
+        scam_statuses = AddressLookup.check_scam_status_many(addresses)
         
-        return {
-            "address": address,
-            "wallet_data": wallet_data,
-            "scam_status": scam_status,
-            "related_transactions": related_transactions
-        }
+        return [
+            {
+                "address": address,
+                # Check if we have this address in our wallet data
+                "wallet_data": source.wallets.get(address, {}),
+                "scam_status": scam_status,
+                # Get transactions related to this address
+                "related_transactions": source.transactions.get_transactions_by_address(address)
+            }
+            for address, scam_status in zip(addresses, scam_statuses)
+        ]
     
     @staticmethod
     def get_connected_addresses(address: str) -> List[str]:
@@ -96,7 +154,7 @@ class AddressLookup:
         Returns:
             List of connected addresses
         """
-        wallet_data = blockchain_data.SAMPLE_WALLETS.get(address, {})
+        wallet_data = prepared_source([address]).wallets.get(address, {})
         return wallet_data.get("connected_addresses", [])
 
 # Initialize the tool
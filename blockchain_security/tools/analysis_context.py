@@ -0,0 +1,209 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-request analysis context shared by the blockchain security tools."""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+import numpy as np
+
+from .address_lookup import address_lookup_tool
+from .data_source import DataSource, get_data_source
+from .result_cache import result_cache
+from .risk_score_api import RiskScoreAPI
+from .tool_output import summarize_transactions
+from .transaction_data import TransactionData
+
+class AnalysisContext:
+    """
+    Facts about one address, each computed at most once per request.
+
+    The sub-agent tool functions read what they need from the context
+    instead of calling the tool methods one after another, so a request
+    that asks for a risk score, behavioural patterns and the address's
+    transactions scans the transaction index once and checks the scam
+    labels once. Composite results still go through the versioned result
+    cache, and on a cache miss they are built from the facts already held
+    here. Tools running in parallel threads can share a context: each fact
+    has its own lock, so a fact being computed by one thread is waited for
+    by the others rather than computed again.
+
+    Attributes:
+        address: The blockchain address being analyzed
+        source: The DataSource the facts were read from
+        data_version: DataSource.data_version when the context was created
+        computed: Count of each fact computed, for benchmarking
+    """
+
+    def __init__(self, address: str, source: Optional[DataSource] = None) -> None:
+        self.address = address
+        self.source = source if source is not None else get_data_source()
+        self.source.prepare([address])
+        self.data_version = self.source.data_version
+        self.computed: Dict[str, int] = {}
+        self._facts: Dict[str, Any] = {}
+        self._fact_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _fact(self, name: str, compute: Callable[[], Any]) -> Any:
+        if name in self._facts:
+            return self._facts[name]
+        with self._lock:
+            fact_lock = self._fact_locks.setdefault(name, threading.Lock())
+        # Facts only read facts below them, so the locks are always taken in
+        # the same order
+        with fact_lock:
+            if name not in self._facts:
+                self._facts[name] = compute()
+                self.computed[name] = self.computed.get(name, 0) + 1
+        return self._facts[name]
+
+    def _cached(self, namespace: str, compute: Callable[[], Any]) -> Any:
+        return result_cache.get_many(namespace, [self.address], lambda missing: [compute()], self.source)[0]
+
+    @property
+    def rows(self) -> np.ndarray:
+        """Table rows of the address's transactions, from one index scan."""
+        return self._fact("rows", lambda: self.source.transactions.rows_for_address(self.address))
+
+    @property
+    def transactions(self) -> List[Dict[str, Any]]:
+        """The address's transactions as dicts, built from the shared rows."""
+        store = self.source.transactions
+        return self._fact("transactions", lambda: [store.materialize(row) for row in self.rows.tolist()])
+
+    @property
+    def transaction_summary(self) -> Dict[str, Any]:
+        """Fixed-size summary of the address's transactions, from the shared rows."""
+        return self._fact("transaction_summary", lambda: summarize_transactions(self.source, self.address, self.rows))
+
+    @property
+    def scam_status(self) -> Dict[str, Any]:
+        """Result of check_scam_status for the address."""
+        return self._fact("scam_status", lambda: address_lookup_tool.check_scam_status_many(
+            [self.address], source=self.source
+        )[0])
+
+    @property
+    def wallet_data(self) -> Dict[str, Any]:
+        """The address's wallet record, or an empty dict."""
+        return self._fact("wallet_data", lambda: self.source.wallets.get(self.address, {}))
+
+    @property
+    def address_details(self) -> Dict[str, Any]:
+        """Result of get_address_details for the address."""
+        return self._fact("address_details", lambda: {
+            "address": self.address,
+            "wallet_data": self.wallet_data,
+            "scam_status": self.scam_status,
+            "related_transactions": self.transactions
+        })
+
+    @property
+    def transaction_patterns(self) -> Dict[str, Any]:
+        """Result of analyze_transaction_patterns for the address."""
+        return self._fact("transaction_patterns", lambda: self._cached(
+            "analyze_transaction_patterns",
+            lambda: TransactionData._analyze_transaction_patterns_many([self.address], [self.rows], self.source)[0]
+        ))
+
+    @property
+    def behavioral_patterns(self) -> Dict[str, Any]:
+        """Result of analyze_behavioral_patterns for the address."""
+        return self._fact("behavioral_patterns", lambda: self._cached(
+            "analyze_behavioral_patterns",
+            lambda: RiskScoreAPI._analyze_behavioral_patterns_many([self.address], [self.rows], self.source)[0]
+        ))
+
+    @property
+    def risk_score(self) -> Dict[str, Any]:
+        """Result of get_risk_score for the address."""
+        def compute() -> Dict[str, Any]:
+            transaction_analysis = None
+            if RiskScoreAPI._needs_transaction_analysis(self.scam_status):
+                transaction_analysis = self.transaction_patterns
+            return RiskScoreAPI._build_risk_score(
+                self.address, self.scam_status, transaction_analysis, self.wallet_data
+            )
+        return self._fact("risk_score", lambda: self._cached("get_risk_score", compute))
+
+_request_contexts: ContextVar[Optional[Dict[str, AnalysisContext]]] = ContextVar(
+    "analysis_contexts", default=None
+)
+_request_contexts_lock = threading.Lock()
+
+def get_analysis_context(address: str) -> AnalysisContext:
+    """
+    Get the analysis context for an address.
+
+    Inside an analysis scope, every caller asking about the same address gets
+    the same context until the data changes; outside one, each call gets a
+    fresh context.
+
+    Args:
+        address: The blockchain address to analyze
+
+    Returns:
+        The AnalysisContext for the address
+    """
+    contexts = _request_contexts.get()
+    if contexts is None:
+        return AnalysisContext(address)
+
+    source = get_data_source()
+    with _request_contexts_lock:
+        context = contexts.get(address)
+    if _is_current(context, source):
+        return context
+    # Built outside the lock, since preparing a remote source fetches data;
+    # when two threads race, both use the context stored first
+    new_context = AnalysisContext(address, source)
+    with _request_contexts_lock:
+        context = contexts.get(address)
+        if not _is_current(context, source):
+            context = contexts[address] = new_context
+    return context
+
+def _is_current(context: Optional[AnalysisContext], source: DataSource) -> bool:
+    return context is not None and context.source is source and context.data_version == source.data_version
+
+def begin_analysis_scope(*args: Any, **kwargs: Any) -> None:
+    """
+    Start sharing analysis contexts for the current request.
+
+    Accepts and ignores any arguments, so it can be registered directly as
+    an agent callback.
+    """
+    _request_contexts.set({})
+
+def end_analysis_scope(*args: Any, **kwargs: Any) -> None:
+    """
+    Stop sharing analysis contexts and drop the ones collected.
+
+    Accepts and ignores any arguments, so it can be registered directly as
+    an agent callback.
+    """
+    _request_contexts.set(None)
+
+@contextmanager
+def analysis_scope() -> Iterator[None]:
+    """Share analysis contexts between all tool calls made inside the block."""
+    token = _request_contexts.set({})
+    try:
+        yield
+    finally:
+        _request_contexts.reset(token)
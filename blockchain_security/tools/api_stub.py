@@ -0,0 +1,201 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Local stub of the blockchain data REST API.
+
+Serves the batch endpoints described in tools/remote_source.py from a
+DataSource, by default the static sample data, over HTTP/1.1 with
+keep-alive. It counts the connections and requests it receives, so the
+tests in blockchain_security/tests can check the client's batching and
+coalescing, and can add a fixed latency to each request.
+
+Usage:
+    python -m blockchain_security.tools.api_stub [--host HOST] [--port PORT]
+        [--dataset PATH] [--api-key KEY] [--latency SECONDS]
+
+Set config.BLOCKCHAIN_API_BASE_URL to the printed URL and
+config.BLOCKCHAIN_DATA_SOURCE to "remote" to run the tools against it.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+
+from .data_source import DataSource, in_memory_source, mapped_source
+
+class StubAPIServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering the blockchain data API from a DataSource.
+
+    Attributes:
+        source: The DataSource the answers come from
+        api_key: Bearer token every request must carry, or None to accept any
+        latency_seconds: Delay added to every request
+        connections: Number of connections accepted
+        requests: (endpoint, address count) of every request served
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: Tuple[str, int],
+        source: DataSource,
+        api_key: Optional[str] = None,
+        latency_seconds: float = 0.0,
+    ) -> None:
+        super().__init__(server_address, StubAPIHandler)
+        self.source = source
+        self.api_key = api_key
+        self.latency_seconds = latency_seconds
+        self.connections = 0
+        self.requests: List[Tuple[str, int]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    def record(self, endpoint: str, address_count: int) -> None:
+        """
+        Count a served request.
+
+        Args:
+            endpoint: The endpoint requested
+            address_count: Number of addresses in the request
+        """
+        with self._lock:
+            self.requests.append((endpoint, address_count))
+
+    def lookup(self, endpoint: str, address: str) -> Any:
+        """
+        Answer one address on an endpoint.
+
+        Args:
+            endpoint: "transactions", "wallets" or "labels"
+            address: The blockchain address
+
+        Returns:
+            The endpoint's result for the address
+        """
+        if endpoint == "transactions":
+            return self.source.transactions.get_transactions_by_address(address)
+        if endpoint == "wallets":
+            return self.source.wallets.get(address)
+        return self.source.scam_addresses.get(address)
+
+class StubAPIHandler(BaseHTTPRequestHandler):
+    """Request handler for StubAPIServer."""
+
+    protocol_version = "HTTP/1.1"
+    server: StubAPIServer
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        endpoint = self.path.strip("/").rsplit("/", 1)[-1]
+        if self.server.api_key is not None and self.headers.get("Authorization") != f"Bearer {self.server.api_key}":
+            self._send_json(401, {"error": "Invalid API key"})
+            return
+        if endpoint not in ("transactions", "wallets", "labels"):
+            self._send_json(404, {"error": f"Unknown endpoint {endpoint!r}"})
+            return
+        try:
+            addresses = json.loads(body)["addresses"]
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"error": "Expected a JSON body with an addresses list"})
+            return
+
+        if self.server.latency_seconds:
+            time.sleep(self.server.latency_seconds)
+        self.server.record(endpoint, len(addresses))
+        self._send_json(200, {"results": {address: self.server.lookup(endpoint, address) for address in addresses}})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # Keep test output quiet
+
+def start_stub_server(
+    source: Optional[DataSource] = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    api_key: Optional[str] = None,
+    latency_seconds: float = 0.0,
+) -> StubAPIServer:
+    """
+    Start a stub API server on a background thread.
+
+    Args:
+        source: DataSource to serve, defaulting to the static sample data
+        host: Interface to listen on
+        port: Port to listen on; 0 picks a free one
+        api_key: Bearer token to require, or None to accept any
+        latency_seconds: Delay added to every request
+
+    Returns:
+        The running server; call shutdown() and server_close() to stop it
+    """
+    server = StubAPIServer((host, port), source or in_memory_source(), api_key, latency_seconds)
+    threading.Thread(target=server.serve_forever, name="blockchain-api-stub", daemon=True).start()
+    return server
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for the stub API server.
+
+    Args:
+        argv: Command-line arguments, defaulting to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Serve blockchain data over the stub REST API")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8545, help="Port to listen on")
+    parser.add_argument("--dataset", help="Dataset file to serve instead of the sample data")
+    parser.add_argument("--api-key", help="Bearer token to require")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of delay added to every request")
+    args = parser.parse_args(argv)
+
+    source = mapped_source(args.dataset) if args.dataset else in_memory_source()
+    server = StubAPIServer((args.host, args.port), source, args.api_key, args.latency)
+    print(f"Serving blockchain data at {server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -39,6 +39,21 @@ KNOWN_SCAM_ADDRESSES = {
     }
 }
 
+# Sample cross-chain bridge contracts for demonstration
+KNOWN_BRIDGE_ADDRESSES = {
+    "0x8888hhhh9999iiii0000jjjj1111kkkk2222llll": {
+        "name": "Sample Token Bridge",
+        "chains": ["ethereum", "arbitrum", "optimism"]
+    },
+    "0x9999iiii0000jjjj1111kkkk2222llll3333mmmm": {
+        "name": "Sample Liquidity Bridge",
+        "chains": ["ethereum", "polygon", "bsc"]
+    }
+}
+
+# Sender of token mint transfers
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
 # Sample transaction patterns for demonstration
 SUSPICIOUS_TRANSACTION_PATTERNS = {
     "rapid_transfers": {
@@ -0,0 +1,190 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Sliding-window burst detection over transaction timestamps."""
+
+from typing import Dict, Any, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from blockchain_security import config
+from .transaction_table import (
+    MISSING_UNITS, UNIT_DECIMALS, UNITS_PER_TOKEN, TransactionTable, format_timestamp
+)
+
+class BurstDetector:
+    """
+    Find the busiest time window of each address's transactions.
+
+    Each window is configured as a mapping with:
+        window_seconds: Width of the sliding window; transactions count as
+            being in the same window when they are strictly less than this
+            far apart
+        min_count: Optional number of transactions in one window that makes
+            a burst
+        min_value: Optional summed value in one window that makes a burst
+
+    A window fires when either of its thresholds is met. For every window
+    that fires, the detector reports the peak number of transactions inside
+    it and where that peak starts and ends, and the peak summed value and
+    where that peak starts and ends.
+
+    Values are summed in the common denomination when the table has a price
+    table, with unpriced tokens counting as zero. Otherwise amounts of
+    different tokens cannot be added up, so each token is windowed on its
+    own and the peak value is that of the token with the largest window sum,
+    in whole tokens. Unparseable amounts count as zero either way.
+
+    The default configuration, a 60 second window with min_count 2, fires
+    exactly when two transactions are less than 60 seconds apart.
+    """
+
+    def __init__(self, windows: Sequence[Mapping[str, Any]]) -> None:
+        for window in windows:
+            if window.get("min_count") is None and window.get("min_value") is None:
+                raise ValueError(f"Burst window {dict(window)} needs a min_count or min_value threshold")
+        self.windows = list(windows)
+
+    def detect(self, table: TransactionTable, rows: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Detect bursts in one address's transactions.
+
+        Args:
+            table: The transaction table the rows index into
+            rows: Row indices of the address's transactions
+
+        Returns:
+            List of burst reports, one per window that fired
+        """
+        return self.detect_grouped(table, rows, np.zeros(len(rows), dtype=np.int64), 1)[0]
+
+    def detect_grouped(
+        self, table: TransactionTable, rows: np.ndarray, groups: np.ndarray, group_count: int
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Detect bursts for many addresses in one vectorized pass.
+
+        The transactions are sorted once by address and timestamp, and the
+        start of every sliding window is found with a single searchsorted
+        over a key that keeps each address's timestamps apart from the
+        next address's. Value windows are found the same way, keyed by
+        address and token unless the values are priced.
+
+        Args:
+            table: The transaction table the rows index into
+            rows: Row indices of the transactions of every address, concatenated
+            groups: For each entry of rows, the index of the address it belongs to
+            group_count: Number of addresses
+
+        Returns:
+            One list of burst reports per address
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in range(group_count)]
+        if not len(rows) or not self.windows:
+            return results
+
+        groups = np.asarray(groups, dtype=np.int64)
+        timestamps = table.timestamps[rows]
+        count_windows = _SlidingWindows(groups, timestamps)
+
+        token_ids = None
+        if table.priced:
+            values = np.nan_to_num(table.common_values(rows), nan=0.0)
+            value_windows = _SlidingWindows(groups, timestamps)
+        else:
+            # Units are integers, exact in float64 sums up to 2**53
+            units = table.units[rows]
+            values = np.where(units == MISSING_UNITS, 0, units).astype(np.float64)
+            token_ids = table.token_ids[rows].astype(np.int64)
+            value_windows = _SlidingWindows(groups * max(len(table.tokens), 1) + token_ids, timestamps)
+        value_sums = np.concatenate(([0.0], np.cumsum(values[value_windows.order])))
+        value_groups = groups[value_windows.order]
+
+        for window in self.windows:
+            window_seconds = int(window["window_seconds"])
+
+            starts = count_windows.starts(window_seconds)
+            counts = count_windows.positions - starts + 1
+            peak_groups, peak_positions = _peaks(counts, count_windows.groups)
+
+            value_starts = value_windows.starts(window_seconds)
+            sums = value_sums[value_windows.positions + 1] - value_sums[value_starts]
+            if token_ids is not None:
+                sums /= UNITS_PER_TOKEN
+            value_peak_positions = np.zeros(group_count, dtype=np.int64)
+            value_peak_groups, positions = _peaks(sums, value_groups)
+            value_peak_positions[value_peak_groups] = positions
+            peak_values = np.zeros(group_count)
+            peak_values[value_peak_groups] = sums[positions]
+
+            fired = np.zeros(len(peak_groups), dtype=bool)
+            if window.get("min_count") is not None:
+                fired |= counts[peak_positions] >= window["min_count"]
+            if window.get("min_value") is not None:
+                fired |= peak_values[peak_groups] >= window["min_value"]
+
+            for group, position in zip(peak_groups[fired].tolist(), peak_positions[fired].tolist()):
+                start_time = int(count_windows.timestamps[starts[position]])
+                end_time = int(count_windows.timestamps[position])
+                value_position = int(value_peak_positions[group])
+                value_start_time = int(value_windows.timestamps[value_starts[value_position]])
+                value_end_time = int(value_windows.timestamps[value_position])
+                results[group].append({
+                    "window_seconds": window_seconds,
+                    "peak_count": int(counts[position]),
+                    "start_time": format_timestamp(start_time),
+                    "end_time": format_timestamp(end_time),
+                    "span_seconds": end_time - start_time,
+                    "peak_value": round(float(peak_values[group]), UNIT_DECIMALS),
+                    "peak_value_token": (
+                        table.tokens[int(token_ids[value_windows.order[value_position]])]
+                        if token_ids is not None else None
+                    ),
+                    "peak_value_start_time": format_timestamp(value_start_time),
+                    "peak_value_end_time": format_timestamp(value_end_time)
+                })
+        return results
+
+class _SlidingWindows:
+    """Transactions sorted by group and time, with sliding window starts per width."""
+
+    def __init__(self, groups: np.ndarray, timestamps: np.ndarray) -> None:
+        self.order = np.lexsort((timestamps, groups))
+        self.groups = groups[self.order]
+        self.timestamps = timestamps[self.order]
+        self.positions = np.arange(len(self.order))
+        self._offsets = self.timestamps - self.timestamps.min()
+
+    def starts(self, window_seconds: int) -> np.ndarray:
+        # Keys put each group's offsets beyond the reach of the previous group's windows
+        keys = self.groups * (int(self._offsets.max()) + window_seconds + 1) + self._offsets
+        return np.searchsorted(keys, keys - window_seconds, side="right")
+
+def _peaks(values: np.ndarray, groups: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Position of the largest value per group, the earliest winning ties
+    order = np.lexsort((-values, groups))
+    peak_groups, first = np.unique(groups[order], return_index=True)
+    return peak_groups, order[first]
+
+def rapid_transfer_detector(windows: Optional[Sequence[Mapping[str, Any]]] = None) -> BurstDetector:
+    """
+    Build the detector behind the rapid_transfers pattern.
+
+    Args:
+        windows: Window configuration, defaulting to config.RAPID_TRANSFER_WINDOWS
+
+    Returns:
+        A BurstDetector
+    """
+    return BurstDetector(config.RAPID_TRANSFER_WINDOWS if windows is None else windows)
@@ -0,0 +1,413 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Time-ordered circular flow detection over the directed transaction graph."""
+
+import time
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from blockchain_security import config
+
+# Rounds of vectorized source/sink trimming before the component search
+_MAX_TRIM_ROUNDS = 32
+
+class FlowGraph:
+    """
+    Directed transaction graph for finding circular flows of funds.
+
+    Every transaction is an edge from sender to recipient. The edges are
+    stored as compressed sparse row arrays sorted by sender and then
+    timestamp, so a search standing at an address skips every transfer made
+    before it arrived there with one bisect.
+
+    Strongly connected components are labelled once when the graph is
+    built. A cycle never leaves its component, so cycle searches only follow
+    edges inside the start address's component, and addresses outside every
+    non-trivial component are answered without searching at all.
+
+    Attributes:
+        indptr: Edge offsets per address ID
+        targets: Recipient address ID of each edge
+        rows: Transaction table row of each edge
+        components: Component label of each address ID, -1 when the address
+            is on no cycle
+        component_sizes: Number of addresses in each component
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        indptr: np.ndarray,
+        targets: np.ndarray,
+        rows: np.ndarray,
+        components: np.ndarray,
+    ) -> None:
+        self._store = store
+        self.indptr = indptr
+        self.targets = targets
+        self.rows = rows
+        self.components = components
+        self.component_sizes = np.bincount(components[components >= 0])
+        # Plain lists for the per-edge search loop
+        self._indptr_list = indptr.tolist()
+        self._targets_list = targets.tolist()
+        self._timestamps_list = store.table.timestamps[rows].tolist()
+        self._components_list = components.tolist()
+
+    @classmethod
+    def build(cls, store: Any) -> "FlowGraph":
+        """
+        Build the flow graph and its strongly connected components.
+
+        Args:
+            store: A TransactionStore or MappedTransactionStore
+
+        Returns:
+            The built FlowGraph
+        """
+        table = store.table
+        node_count = len(table.addresses)
+        from_ids = np.asarray(table.from_ids, dtype=np.int64)
+        to_ids = np.asarray(table.to_ids, dtype=np.int64)
+
+        # Self-transfers and contract creations cannot be part of a cycle
+        keep = from_ids != to_ids
+        creation_id = table.find_address_id("")
+        if creation_id is not None:
+            keep &= (from_ids != creation_id) & (to_ids != creation_id)
+        rows = np.flatnonzero(keep)
+
+        order = np.lexsort((table.timestamps[rows], from_ids[rows]))
+        rows = rows[order]
+        sources = from_ids[rows]
+        targets = to_ids[rows]
+        indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=node_count), out=indptr[1:])
+
+        components = strongly_connected_components(sources, targets, node_count)
+        return cls(store, indptr, targets, rows, components)
+
+    def component_size(self, address: str) -> int:
+        """
+        Get the size of the strongly connected component holding an address.
+
+        Args:
+            address: The blockchain address
+
+        Returns:
+            Number of addresses in the component, 1 if the address is on no cycle
+        """
+        node = self._store.table.find_address_id(address)
+        if node is None or node >= len(self.components) or self.components[node] < 0:
+            return 1
+        return int(self.component_sizes[self.components[node]])
+
+    def find_cycles(
+        self,
+        address: str,
+        max_length: Optional[int] = None,
+        window_seconds: Optional[int] = None,
+        max_cycles: Optional[int] = None,
+        time_budget_seconds: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Find time-ordered cycles of transfers that start and end at an address.
+
+        Each transfer on a cycle happens no earlier than the one before it,
+        the whole cycle completes within window_seconds of its first
+        transfer, and no address is visited twice. The cycles are listed
+        from the address's own transfer, which need not be the earliest.
+
+        Args:
+            address: The blockchain address
+            max_length: Most transfers on a cycle, defaulting to config.WASH_TRADING_MAX_CYCLE_LENGTH
+            window_seconds: Longest cycle duration, defaulting to config.WASH_TRADING_WINDOW_SECONDS
+            max_cycles: Stop after this many cycles, defaulting to config.WASH_TRADING_MAX_CYCLES
+            time_budget_seconds: Stop searching after this long, defaulting to
+                config.WASH_TRADING_TIME_BUDGET_SECONDS
+
+        Returns:
+            Dictionary with the cycles found, the size of the address's
+            component and whether the search ran to completion
+        """
+        node = self._store.table.find_address_id(address)
+        if node is None or node >= len(self.components) or self.components[node] < 0:
+            return {"cycles": [], "component_size": 1, "complete": True}
+
+        cycles, complete = self._search(
+            node,
+            config.WASH_TRADING_MAX_CYCLE_LENGTH if max_length is None else max_length,
+            config.WASH_TRADING_WINDOW_SECONDS if window_seconds is None else window_seconds,
+            config.WASH_TRADING_MAX_CYCLES if max_cycles is None else max_cycles,
+            time.perf_counter() + (
+                config.WASH_TRADING_TIME_BUDGET_SECONDS if time_budget_seconds is None else time_budget_seconds
+            ),
+            True,
+        )
+        return {
+            "cycles": [self.describe_cycle(edges) for edges in cycles],
+            "component_size": int(self.component_sizes[self.components[node]]),
+            "complete": complete,
+        }
+
+    def find_all_cycles(
+        self,
+        max_length: Optional[int] = None,
+        window_seconds: Optional[int] = None,
+        max_cycles: Optional[int] = None,
+        time_budget_seconds: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Find time-ordered cycles anywhere in the graph.
+
+        Searches from every address in a non-trivial component in turn. A
+        time-ordered cycle is found from the sender of its earliest transfer;
+        cycles found again from another address because of equal timestamps
+        are reported once. The searches share one time budget.
+
+        Args:
+            max_length: Most transfers on a cycle, defaulting to config.WASH_TRADING_MAX_CYCLE_LENGTH
+            window_seconds: Longest cycle duration, defaulting to config.WASH_TRADING_WINDOW_SECONDS
+            max_cycles: Stop after this many cycles in total, defaulting to config.WASH_TRADING_MAX_CYCLES
+            time_budget_seconds: Stop searching after this long, defaulting to
+                config.WASH_TRADING_TIME_BUDGET_SECONDS
+
+        Returns:
+            Dictionary with the cycles found, the number of non-trivial
+            components and whether the search ran to completion
+        """
+        max_length = config.WASH_TRADING_MAX_CYCLE_LENGTH if max_length is None else max_length
+        window_seconds = config.WASH_TRADING_WINDOW_SECONDS if window_seconds is None else window_seconds
+        max_cycles = config.WASH_TRADING_MAX_CYCLES if max_cycles is None else max_cycles
+        deadline = time.perf_counter() + (
+            config.WASH_TRADING_TIME_BUDGET_SECONDS if time_budget_seconds is None else time_budget_seconds
+        )
+
+        cycles: List[List[int]] = []
+        seen = set()
+        complete = True
+        for node in np.flatnonzero(self.components >= 0).tolist():
+            found, complete = self._search(
+                node, max_length, window_seconds, max_cycles - len(cycles), deadline, False
+            )
+            for edges in found:
+                key = frozenset(edges)
+                if key not in seen:
+                    seen.add(key)
+                    cycles.append(edges)
+            if not complete:
+                break
+        return {
+            "cycles": [self.describe_cycle(edges) for edges in cycles],
+            "component_count": len(self.component_sizes),
+            "complete": complete,
+        }
+
+    def _search(
+        self, start: int, max_length: int, window_seconds: int, max_cycles: int, deadline: float, rotations: bool
+    ) -> Tuple[List[List[int]], bool]:
+        # Depth-first search over time-ordered simple paths from start that
+        # stay inside start's component; returns lists of edge positions and
+        # whether the search finished within its limits. With rotations, a
+        # path may also wrap around once to transfers made before start's
+        # first transfer, which finds the cycles through start whose earliest
+        # transfer was made by another address.
+        indptr = self._indptr_list
+        targets = self._targets_list
+        timestamps = self._timestamps_list
+        components = self._components_list
+        component = components[start]
+        cycles: List[List[int]] = []
+        path_edges: List[int] = []
+        on_path = {start}
+
+        def scan(node: int, lower: int, upper: int, first: int, low: int, high: int, wrapped: bool) -> bool:
+            # Follow node's transfers with timestamps in [lower, upper]
+            end = indptr[node + 1]
+            position = bisect_left(timestamps, lower, indptr[node], end)
+            last_hop = len(path_edges) + 1 == max_length
+            while position < end and timestamps[position] <= upper:
+                target = targets[position]
+                if target == start:
+                    cycles.append(path_edges + [position])
+                    if len(cycles) >= max_cycles:
+                        return False
+                elif not last_hop and target not in on_path and components[target] == component:
+                    timestamp = timestamps[position]
+                    path_edges.append(position)
+                    on_path.add(target)
+                    finished = visit(target, timestamp, first, min(low, timestamp), max(high, timestamp), wrapped)
+                    on_path.discard(target)
+                    path_edges.pop()
+                    if not finished:
+                        return False
+                position += 1
+            return True
+
+        def visit(node: int, arrival: int, first: int, low: int, high: int, wrapped: bool) -> bool:
+            if time.perf_counter() > deadline:
+                return False
+            # Transfers made no earlier than the arrival keep the path in
+            # time order; once wrapped, the path must end by start's first
+            # transfer
+            upper = first if wrapped else low + window_seconds
+            if not scan(node, arrival, upper, first, low, high, wrapped):
+                return False
+            if rotations and not wrapped:
+                return scan(node, high - window_seconds, min(arrival - 1, first), first, low, high, True)
+            return True
+
+        if max_cycles <= 0:
+            return cycles, False
+
+        for position in range(indptr[start], indptr[start + 1]):
+            target = targets[position]
+            if components[target] != component:
+                continue
+            timestamp = timestamps[position]
+            path_edges.append(position)
+            on_path.add(target)
+            finished = max_length > 1 and visit(target, timestamp, timestamp, timestamp, timestamp, False)
+            on_path.discard(target)
+            path_edges.pop()
+            if max_length > 1 and not finished:
+                return cycles, False
+        return cycles, True
+
+    def describe_cycle(self, edges: List[int]) -> Dict[str, Any]:
+        """
+        Describe a cycle of edge positions as its transfers.
+
+        Args:
+            edges: Edge positions in path order
+
+        Returns:
+            Dictionary with the addresses on the cycle, its length and
+            duration, and each transfer's hash, addresses, value and timestamp
+        """
+        transfers = []
+        for row in self.rows[edges].tolist():
+            transaction = self._store.materialize(row)
+            transfers.append({
+                "tx_hash": transaction["hash"],
+                "from": transaction["from"],
+                "to": transaction["to"],
+                "value": transaction.get("value"),
+                "timestamp": transaction["timestamp"],
+            })
+        timestamps = [self._timestamps_list[position] for position in edges]
+        return {
+            "addresses": [transfer["from"] for transfer in transfers],
+            "length": len(edges),
+            "span_seconds": max(timestamps) - min(timestamps),
+            "transfers": transfers,
+        }
+
+def strongly_connected_components(sources: np.ndarray, targets: np.ndarray, node_count: int) -> np.ndarray:
+    """
+    Label the strongly connected components of a directed graph.
+
+    Addresses that only send or only receive can never be on a cycle, so
+    they are first trimmed away in a few vectorized rounds, which removes
+    most of a typical transaction graph. An iterative Tarjan search then
+    labels what remains.
+
+    Args:
+        sources: Source node of each edge
+        targets: Target node of each edge
+        node_count: Number of nodes
+
+    Returns:
+        Component label of each node, -1 for nodes in single-node components
+    """
+    labels = np.full(node_count, -1, dtype=np.int64)
+    keys = np.unique(sources * max(node_count, 1) + targets)
+    sources, targets = keys // max(node_count, 1), keys % max(node_count, 1)
+    sources, targets = sources[sources != targets], targets[sources != targets]
+
+    for _ in range(_MAX_TRIM_ROUNDS):
+        alive = (np.bincount(sources, minlength=node_count) > 0) & (np.bincount(targets, minlength=node_count) > 0)
+        keep = alive[sources] & alive[targets]
+        if keep.all():
+            break
+        sources, targets = sources[keep], targets[keep]
+    if not len(sources):
+        return labels
+
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=node_count), out=indptr[1:])
+    indptr_list = indptr.tolist()
+    targets_list = targets.tolist()
+
+    index = [-1] * node_count
+    low = [0] * node_count
+    on_stack = [False] * node_count
+    component_of = [-1] * node_count
+    stack: List[int] = []
+    counter = 0
+    component_count = 0
+    for root in np.unique(sources).tolist():
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, indptr_list[root])]
+        while work:
+            node, position = work[-1]
+            end = indptr_list[node + 1]
+            descended = False
+            while position < end:
+                neighbor = targets_list[position]
+                position += 1
+                if index[neighbor] == -1:
+                    work[-1] = (node, position)
+                    index[neighbor] = low[neighbor] = counter
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack[neighbor] = True
+                    work.append((neighbor, indptr_list[neighbor]))
+                    descended = True
+                    break
+                if on_stack[neighbor] and index[neighbor] < low[node]:
+                    low[node] = index[neighbor]
+            if descended:
+                continue
+
+            work.pop()
+            if low[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component_of[member] = component_count
+                    if member == node:
+                        break
+                component_count += 1
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+
+    components = np.asarray(component_of, dtype=np.int64)
+    sizes = np.bincount(components[components >= 0], minlength=component_count)
+    nontrivial = np.flatnonzero(sizes > 1)
+    relabel = np.full(component_count, -1, dtype=np.int64)
+    relabel[nontrivial] = np.arange(len(nontrivial))
+    has_component = components >= 0
+    labels[has_component] = relabel[components[has_component]]
+    return labels
@@ -0,0 +1,389 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Data source selection for the blockchain security tools."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from blockchain_security import config
+from . import blockchain_data
+from .address_graph import AddressGraph, EDGE_TRANSACTION, EDGE_WALLET_LINK
+from .cycle_detector import FlowGraph
+from .dataset import open_dataset
+from .label_store import LabelStore
+from .scam_distance import ScamDistanceIndex
+from .transaction_store import transaction_store
+
+class DataSource:
+    """
+    The transactions, wallets and scam labels the tools read from.
+
+    Attributes:
+        transactions: A TransactionStore or MappedTransactionStore
+        wallets: Mapping of address to wallet record
+        scam_addresses: LabelStore mapping address to scam label record
+        version: Identifier of the loaded data
+        chain: Chain ID of the data when it is one shard of a
+            MultiChainSource, otherwise None
+        revision: Count of changes made through this DataSource
+        graph: AddressGraph built lazily from the wallets and transactions
+        flow_graph: Directed FlowGraph built lazily from the transactions
+
+    Data added through add_transactions, add_wallet and add_label is folded
+    into the graph and scam-distance indexes incrementally, and bumps the
+    revision so that cached results computed before the change are not reused.
+    """
+
+    def __init__(
+        self,
+        transactions: Any,
+        wallets: Mapping[str, Any],
+        scam_addresses: Mapping[str, Any],
+        version: str,
+        chain: Optional[str] = None,
+    ) -> None:
+        self.transactions = transactions
+        self.wallets = wallets
+        self.scam_addresses = scam_addresses
+        self.version = version
+        self.chain = chain
+        self.revision = 0
+        self._graph: Optional[AddressGraph] = None
+        self._graph_built_for = (-1, -1)
+        self._scam_distance: Dict[int, ScamDistanceIndex] = {}
+        self._flow_graph: Optional[FlowGraph] = None
+        self._flow_graph_built_for = 0
+        self._flow_graph_stale: Set[str] = set()
+
+    def _size(self) -> Tuple[int, int]:
+        return len(self.transactions), len(self.wallets)
+
+    @property
+    def data_version(self) -> Tuple[Any, ...]:
+        """
+        Key identifying the current state of the data, for result caching.
+
+        Combines the dataset version and revision with the record counts, so
+        data added without going through this DataSource also changes it.
+        """
+        return (id(self), self.version, self.revision, *self._size(), len(self.scam_addresses))
+
+    @property
+    def persistent_version(self) -> str:
+        """
+        Key identifying the current state of the data across processes and restarts.
+
+        As data_version, without the identity of this DataSource object, for
+        results persisted outside the process.
+        """
+        return ":".join(str(part) for part in self.data_version[1:])
+
+    def address_version(self, address: str) -> str:
+        """
+        Key identifying the data about one address across processes and restarts.
+
+        Keys persisted per-address results and cursors. Local sources use
+        persistent_version for every address.
+
+        Args:
+            address: The blockchain address
+
+        Returns:
+            The version key
+        """
+        return self.persistent_version
+
+    @property
+    def graph(self) -> AddressGraph:
+        """
+        The address graph over wallet links and transactions.
+
+        Built on first use, and rebuilt if the data was changed without going
+        through this DataSource.
+        """
+        if self._graph is None or self._graph_built_for != self._size():
+            self._graph = AddressGraph.build(self.wallets, self.transactions)
+            self._graph_built_for = self._size()
+            self._scam_distance = {}
+        return self._graph
+
+    @property
+    def flow_graph(self) -> FlowGraph:
+        """
+        The directed transaction graph for circular-flow searches.
+
+        Built on first use and rebuilt once the transactions have grown by
+        config.FLOW_GRAPH_REBUILD_GROWTH since; use flow_graph_for to search
+        from an address that may be on newer transactions.
+        """
+        growth = len(self.transactions) - self._flow_graph_built_for
+        if self._flow_graph is None or growth > self._flow_graph_built_for * config.FLOW_GRAPH_REBUILD_GROWTH:
+            self._build_flow_graph()
+        return self._flow_graph
+
+    def flow_graph_for(self, address: str) -> FlowGraph:
+        """
+        Get the flow graph for a search from an address.
+
+        Args:
+            address: The blockchain address the search starts from
+
+        Returns:
+            The flow graph, rebuilt first if transactions of the address
+            were added after it was built
+        """
+        if address in self._flow_graph_stale:
+            self._build_flow_graph()
+        return self.flow_graph
+
+    def _build_flow_graph(self) -> None:
+        # Reset before building, so addresses added meanwhile stay stale
+        self._flow_graph_stale = set()
+        built_for = len(self.transactions)
+        self._flow_graph = FlowGraph.build(self.transactions)
+        self._flow_graph_built_for = built_for
+
+    def scam_distance(self, edge_kinds: int) -> ScamDistanceIndex:
+        """
+        Get the scam-distance index over the given edge kinds, building it on first use.
+
+        Args:
+            edge_kinds: Bit mask of EDGE_* kinds the distances follow
+
+        Returns:
+            The ScamDistanceIndex
+        """
+        graph = self.graph
+        if edge_kinds not in self._scam_distance:
+            self._scam_distance[edge_kinds] = ScamDistanceIndex.build(
+                graph, self.scam_addresses, edge_kinds, config.SCAM_DISTANCE_MAX_HOPS
+            )
+        return self._scam_distance[edge_kinds]
+
+    def nearest_scam(self, address: str, max_hops: int, edge_kinds: int) -> Optional[Dict[str, Any]]:
+        """
+        Find the closest known scam address to an address.
+
+        Uses the precomputed scam-distance index when max_hops is within its
+        range and falls back to a bounded graph search otherwise.
+
+        Args:
+            address: The address to start from
+            max_hops: Maximum path length
+            edge_kinds: Bit mask of EDGE_* kinds to follow
+
+        Returns:
+            Dictionary with the scam address, hops, path and path_edges, or None
+        """
+        if max_hops <= config.SCAM_DISTANCE_MAX_HOPS:
+            return self.scam_distance(edge_kinds).lookup(address, max_hops)
+        return self.graph.nearest_labelled(address, self.scam_addresses, max_hops, edge_kinds)
+
+    def nearest_scam_many(
+        self, addresses: List[str], max_hops: int, edge_kinds: int
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Find the closest known scam address for several addresses.
+
+        Args:
+            addresses: The addresses to start from
+            max_hops: Maximum path length
+            edge_kinds: Bit mask of EDGE_* kinds to follow
+
+        Returns:
+            One nearest_scam() result per address, in input order
+        """
+        if max_hops <= config.SCAM_DISTANCE_MAX_HOPS:
+            return self.scam_distance(edge_kinds).lookup_many(addresses, max_hops)
+        return [self.nearest_scam(address, max_hops, edge_kinds) for address in addresses]
+
+    def prepare(self, addresses: Iterable[str]) -> None:
+        """
+        Make sure the data about some addresses is available locally.
+
+        The tool methods call this before reading about a batch of
+        addresses. Local sources already hold everything, so this does
+        nothing; remote sources fetch what is missing.
+
+        Args:
+            addresses: The blockchain addresses about to be analyzed
+        """
+
+    def _add_edge(self, address: str, other_address: str, kind: int) -> None:
+        if self._graph is None:
+            return
+        if self._graph.add_edge(address, other_address, kind) is None:
+            return
+        for index in self._scam_distance.values():
+            index.add_edge(address, other_address, kind)
+
+    def add_transactions(self, transactions: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Add transactions and link their addresses in the graph.
+
+        Args:
+            transactions: Iterable of (tx_hash, tx_data) pairs
+        """
+        in_sync = self._graph is not None and self._graph_built_for == self._size()
+        for tx_hash, tx_data in transactions:
+            if tx_hash in self.transactions:
+                continue
+            self.transactions.add_transaction(tx_hash, tx_data)
+            self.revision += 1
+            if self._flow_graph is not None:
+                self._flow_graph_stale.update((tx_data["from"], tx_data["to"]))
+            if in_sync:
+                self._add_edge(tx_data["from"], tx_data["to"], EDGE_TRANSACTION)
+        if in_sync:
+            self._graph_built_for = self._size()
+
+    def add_wallet(self, address: str, wallet_data: Dict[str, Any]) -> None:
+        """
+        Add or replace a wallet record and link its connected addresses.
+
+        Args:
+            address: The wallet address
+            wallet_data: The wallet record
+        """
+        in_sync = self._graph is not None and self._graph_built_for == self._size()
+        self.wallets[address] = wallet_data
+        self.revision += 1
+        if in_sync:
+            for connected_address in wallet_data.get("connected_addresses", []):
+                self._add_edge(address, connected_address, EDGE_WALLET_LINK)
+            self._graph_built_for = self._size()
+
+    def add_label(self, address: str, record: Dict[str, Any]) -> None:
+        """
+        Add or replace a scam label and update the scam-distance indexes.
+
+        Args:
+            address: The scam address
+            record: The label record
+        """
+        self.scam_addresses.add_label(address, record)
+        self.revision += 1
+        for index in self._scam_distance.values():
+            index.add_label(address)
+
+def in_memory_source() -> DataSource:
+    """
+    Build a data source over the module globals in blockchain_data.
+
+    Returns:
+        DataSource backed by the simulated sample data
+    """
+    return DataSource(
+        transaction_store,
+        blockchain_data.SAMPLE_WALLETS,
+        LabelStore(blockchain_data.KNOWN_SCAM_ADDRESSES),
+        version="sample",
+    )
+
+def mapped_source(path: str, chain: Optional[str] = None) -> DataSource:
+    """
+    Build a data source over a memory-mapped dataset file.
+
+    Args:
+        path: Path of a dataset written by dataset.write_dataset
+        chain: Chain ID of the dataset when it is one chain's shard
+
+    Returns:
+        DataSource backed by the dataset file
+    """
+    dataset = open_dataset(path)
+    return DataSource(
+        dataset.transactions,
+        dataset.wallets,
+        dataset.scam_addresses,
+        version=dataset.version,
+        chain=chain,
+    )
+
+_active_source: Optional[DataSource] = None
+_source_override: ContextVar[Optional[DataSource]] = ContextVar("data_source_override", default=None)
+
+def get_data_source() -> DataSource:
+    """
+    Get the data source the tools read from, opening the configured one on first use.
+
+    Returns:
+        The DataSource selected with using_data_source, or else the active one
+    """
+    global _active_source
+    override = _source_override.get()
+    if override is not None:
+        return override
+    if _active_source is None:
+        if config.BLOCKCHAIN_DATA_SOURCE == "remote":
+            # Imported here because the remote source builds on this module
+            from .remote_source import remote_source
+            _active_source = remote_source()
+        elif config.BLOCKCHAIN_CHAIN_DATASETS:
+            # Imported here because the chain shards build on this module
+            from .multi_chain import get_multi_chain_source
+            _active_source = get_multi_chain_source().shard(config.DEFAULT_CHAIN)
+        elif config.BLOCKCHAIN_DATASET_PATH:
+            _active_source = mapped_source(config.BLOCKCHAIN_DATASET_PATH)
+        else:
+            _active_source = in_memory_source()
+    return _active_source
+
+def prepared_source(addresses: Iterable[str], source: Optional[DataSource] = None) -> DataSource:
+    """
+    Get the data source the tools read from, with the data about some addresses available.
+
+    Args:
+        addresses: The blockchain addresses about to be analyzed
+        source: DataSource to prepare instead of the one get_data_source returns
+
+    Returns:
+        The DataSource, after DataSource.prepare
+    """
+    if source is None:
+        source = get_data_source()
+    source.prepare(addresses)
+    return source
+
+def set_data_source(source: DataSource) -> None:
+    """
+    Replace the data source the tools read from.
+
+    Args:
+        source: The DataSource to activate
+    """
+    global _active_source
+    _active_source = source
+
+@contextmanager
+def using_data_source(source: DataSource) -> Iterator[DataSource]:
+    """
+    Make the tools read from a data source inside the block.
+
+    Unlike set_data_source, the choice only applies to the current thread or
+    asyncio task, so queries against different sources can run concurrently.
+
+    Args:
+        source: The DataSource to read from
+
+    Returns:
+        Context manager yielding the source
+    """
+    token = _source_override.set(source)
+    try:
+        yield source
+    finally:
+        _source_override.reset(token)
@@ -0,0 +1,630 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Memory-mapped on-disk dataset format for blockchain security data.
+
+A dataset file holds the transaction columns, per-address posting lists,
+wallet records and scam labels as flat sections. Opening a dataset only
+reads a small header and table of contents; every section is a zero-copy
+view over the memory map, so startup cost does not depend on dataset size
+and pages are faulted in as lookups touch them.
+
+Layout:
+    header   8-byte magic, uint64 table-of-contents offset, uint64 length
+    sections 8-byte aligned arrays, UTF-8 string heaps and the scam label
+             Bloom filter bits
+    toc      JSON object mapping section names to offset, dtype and length
+"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import uuid
+from collections.abc import Mapping
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .label_store import BloomFilter, LabelStore, build_bloom
+from .transaction_store import TransactionRecord, TransactionStore
+from .transaction_table import MISSING_UNITS, UNITS_PER_TOKEN, TransactionTable
+
+MAGIC = b"BCSDATA1"
+_HEADER = struct.Struct("<8sQQ")
+_ALIGNMENT = 8
+
+class StringColumn:
+    """Read-only sequence of strings stored as an offsets array over a UTF-8 heap."""
+
+    def __init__(self, offsets: np.ndarray, heap: memoryview) -> None:
+        self._offsets = offsets
+        self._heap = heap
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        start = int(self._offsets[index])
+        end = int(self._offsets[index + 1])
+        return str(self._heap[start:end], "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def search(self, key: str, order: Optional[np.ndarray] = None) -> Optional[int]:
+        """
+        Binary search for a string in a sorted column.
+
+        Args:
+            key: The string to find
+            order: Optional permutation that sorts the column; when omitted
+                the column itself must be sorted
+
+        Returns:
+            The index of the string in the column, or None if it is absent
+        """
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            index = int(order[middle]) if order is not None else middle
+            value = self[index]
+            if value == key:
+                return index
+            if value < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+class MappedRecords(Mapping):
+    """Read-only mapping of address to JSON record backed by sorted string columns."""
+
+    def __init__(self, keys: StringColumn, values: StringColumn) -> None:
+        self._keys = keys
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._keys.search(key) is not None
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        index = self._keys.search(key) if isinstance(key, str) else None
+        if index is None:
+            raise KeyError(key)
+        return json.loads(self._values[index])
+
+class MappedTransactionTable(TransactionTable):
+    """Read-only TransactionTable whose columns are views over a memory map."""
+
+    def __init__(
+        self, sections: Dict[str, Any], tokens: List[str], prices: Optional[Dict[str, float]] = None
+    ) -> None:
+        self._timestamps = sections["tx_timestamps"]
+        self._amounts = sections["tx_amounts"]
+        self._units = sections.get("tx_units")
+        if self._units is None:
+            # Datasets written before the units column existed
+            self._units = np.where(
+                np.isfinite(self._amounts), np.round(self._amounts * UNITS_PER_TOKEN), MISSING_UNITS
+            ).astype(np.int64)
+        self._token_ids = sections["tx_token_ids"]
+        self._from_ids = sections["tx_from_ids"]
+        self._to_ids = sections["tx_to_ids"]
+        self._size = len(self._timestamps)
+
+        self.tokens = tokens
+        self._token_lookup = {symbol: token_id for token_id, symbol in enumerate(tokens)}
+        self.prices = prices
+        self.addresses = sections["addresses"]
+        self._address_order = sections["address_order"]
+
+    def find_address_id(self, address: str) -> Optional[int]:
+        return self.addresses.search(address, self._address_order)
+
+    def address_id(self, address: str) -> int:
+        raise TypeError("Mapped datasets are read-only")
+
+    def token_id(self, symbol: str) -> int:
+        raise TypeError("Mapped datasets are read-only")
+
+    def append(self, tx_data: Dict[str, Any]) -> int:
+        raise TypeError("Mapped datasets are read-only")
+
+class MappedTransactionStore:
+    """
+    Read-only transaction store over a memory-mapped dataset.
+
+    Provides the same lookup methods as TransactionStore. Per-address
+    posting lists are stored in compressed sparse row form, so an address
+    lookup is a binary search over the address table plus a slice of the
+    sender and recipient postings.
+    """
+
+    def __init__(
+        self, sections: Dict[str, Any], tokens: List[str], prices: Optional[Dict[str, float]] = None
+    ) -> None:
+        self.table = MappedTransactionTable(sections, tokens, prices)
+        self._hashes: StringColumn = sections["tx_hashes"]
+        self._hash_order = sections["tx_hash_order"]
+        self._records: StringColumn = sections["tx_records"]
+        self._out_offsets = sections["out_offsets"]
+        self._out_rows = sections["out_rows"]
+        self._in_offsets = sections["in_offsets"]
+        self._in_rows = sections["in_rows"]
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, tx_hash: object) -> bool:
+        return isinstance(tx_hash, str) and self._find_row(tx_hash) is not None
+
+    def _find_row(self, tx_hash: str) -> Optional[int]:
+        return self._hashes.search(tx_hash, self._hash_order)
+
+    def hash_at(self, row: int) -> str:
+        """
+        Get the hash of the transaction at a row.
+
+        Args:
+            row: Row of the transaction
+
+        Returns:
+            The transaction hash
+        """
+        return self._hashes[row]
+
+    def materialize(self, row: int) -> Dict[str, Any]:
+        """
+        Build the dict form of the transaction at a row.
+
+        Args:
+            row: Row of the transaction
+
+        Returns:
+            Dictionary with transaction details including the hash
+        """
+        return {"hash": self._hashes[row], **json.loads(self._records[row])}
+
+    def get_transaction(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get transaction data by hash.
+
+        Args:
+            tx_hash: The transaction hash to look up
+
+        Returns:
+            Dictionary with transaction details including the hash, or None
+        """
+        row = self._find_row(tx_hash)
+        if row is None:
+            return None
+        return self.materialize(row)
+
+    def rows_for_address(self, address: str, direction: str = "both") -> np.ndarray:
+        """
+        Get table rows of the transactions sent or received by an address.
+
+        Args:
+            address: The blockchain address to look up
+            direction: "out" for sent, "in" for received or "both"
+
+        Returns:
+            Ascending int64 array of rows, each transaction listed once
+        """
+        address_id = self.table.find_address_id(address)
+        if address_id is None:
+            return np.zeros(0, dtype=np.int64)
+
+        outgoing = self._out_rows[self._out_offsets[address_id]:self._out_offsets[address_id + 1]]
+        incoming = self._in_rows[self._in_offsets[address_id]:self._in_offsets[address_id + 1]]
+        if direction == "out":
+            return np.array(outgoing, dtype=np.int64)
+        if direction == "in":
+            return np.array(incoming, dtype=np.int64)
+        return np.union1d(outgoing, incoming).astype(np.int64, copy=False)
+
+    def positions_for_address(self, address: str) -> List[int]:
+        """
+        Get store positions of the transactions sent or received by an address.
+
+        Args:
+            address: The blockchain address to look up
+
+        Returns:
+            Ascending list of positions, each transaction listed once
+        """
+        return self.rows_for_address(address).tolist()
+
+    def records_for_address(self, address: str) -> List[TransactionRecord]:
+        """
+        Get lightweight records of the transactions sent or received by an address.
+
+        Args:
+            address: The blockchain address to look up
+
+        Returns:
+            List of TransactionRecord views in insertion order
+        """
+        return [TransactionRecord(self, row) for row in self.positions_for_address(address)]
+
+    def get_transactions_by_address(self, address: str) -> List[Dict[str, Any]]:
+        """
+        Get transactions sent or received by an address.
+
+        Args:
+            address: The blockchain address to find transactions for
+
+        Returns:
+            List of transaction details in insertion order
+        """
+        return [self.materialize(row) for row in self.positions_for_address(address)]
+
+    def iter_transactions(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over all transactions in insertion order.
+
+        Returns:
+            Iterator of (tx_hash, tx_data) pairs
+        """
+        for row in range(len(self)):
+            yield self._hashes[row], json.loads(self._records[row])
+
+class MappedDataset:
+    """An open dataset file exposing its transactions, wallets and scam labels."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, toc_offset, toc_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a blockchain security dataset")
+        toc = json.loads(self._mmap[toc_offset:toc_offset + toc_length])
+
+        buffer = memoryview(self._mmap)
+        arrays = {
+            name: np.frombuffer(buffer, dtype=entry["dtype"], count=entry["count"], offset=entry["offset"])
+            for name, entry in toc["arrays"].items()
+        }
+
+        def strings(name: str) -> StringColumn:
+            heap = toc["arrays"][f"{name}_heap"]
+            return StringColumn(
+                arrays[f"{name}_offsets"],
+                buffer[heap["offset"]:heap["offset"] + heap["count"]]
+            )
+
+        sections = dict(arrays)
+        for name in ("tx_hashes", "tx_records", "addresses"):
+            sections[name] = strings(name)
+
+        self.version: str = toc["version"]
+        self.transactions = MappedTransactionStore(sections, toc["tokens"], toc.get("token_prices"))
+        self.wallets = MappedRecords(strings("wallet_keys"), strings("wallet_values"))
+        self.scam_addresses = LabelStore(
+            MappedRecords(strings("label_keys"), strings("label_values")),
+            BloomFilter(arrays["label_bloom"], toc["label_bloom_hashes"])
+        )
+
+def _string_arrays(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+def _postings(address_ids: np.ndarray, address_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    rows = np.argsort(address_ids, kind="stable").astype(np.int64)
+    offsets = np.zeros(address_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(address_ids, minlength=address_count), out=offsets[1:])
+    return offsets, rows
+
+class _StringSpill:
+    """Append-only string column spilled to a lengths file and a UTF-8 heap file."""
+
+    def __init__(self, directory: str, name: str) -> None:
+        self.lengths = open(os.path.join(directory, f"{name}.lengths"), "w+b")
+        self.heap = open(os.path.join(directory, f"{name}.heap"), "w+b")
+
+    def extend(self, values: List[str]) -> None:
+        encoded = [value.encode("utf-8") for value in values]
+        self.heap.write(b"".join(encoded))
+        self.lengths.write(np.asarray([len(value) for value in encoded], dtype=np.int64).tobytes())
+
+    def offsets(self) -> np.ndarray:
+        self.lengths.flush()
+        lengths = np.fromfile(self.lengths.name, dtype=np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return offsets
+
+    def close(self) -> None:
+        self.lengths.close()
+        self.heap.close()
+
+class DatasetWriter:
+    """
+    Streaming writer for dataset files.
+
+    Transactions are parsed into columns and spilled to temporary files next
+    to the destination every _FLUSH_ROWS rows, so memory stays bounded by the
+    flush size plus the address and token dictionaries and the hash index
+    used to drop duplicate transactions. close() derives the posting lists
+    and sort orders and assembles the final file.
+
+    Wallet and scam label records are not spilled: they are kept in dicts
+    until close() sorts and writes them, at about 1 KB per record. A label
+    feed of tens of millions of addresses therefore needs tens of GB of
+    memory; split such a feed across per-chain datasets (see
+    multi_chain.MultiChainSource.from_datasets, which merges their labels)
+    or build the dataset on a machine sized for it.
+
+    Use as a context manager; the destination is only replaced when the
+    block exits without an exception.
+    """
+
+    _FLUSH_ROWS = 65536
+    _COLUMNS = ("tx_timestamps", "tx_amounts", "tx_units", "tx_token_ids", "tx_from_ids", "tx_to_ids")
+
+    def __init__(
+        self, path: str, version: Optional[str] = None, prices: Optional[Dict[str, float]] = None
+    ) -> None:
+        self.path = path
+        self.version = version or uuid.uuid4().hex
+        self.prices = prices
+        self.wallets: Dict[str, Any] = {}
+        self.scam_addresses: Dict[str, Any] = {}
+
+        self._spill_dir = tempfile.mkdtemp(prefix=".dataset-", dir=os.path.dirname(os.path.abspath(path)))
+        self._table = TransactionTable()
+        self._rows: Dict[str, int] = {}
+        self._columns = {
+            name: open(os.path.join(self._spill_dir, name), "w+b") for name in self._COLUMNS
+        }
+        self._hashes = _StringSpill(self._spill_dir, "tx_hashes")
+        self._records = _StringSpill(self._spill_dir, "tx_records")
+        self._pending_hashes: List[str] = []
+        self._pending_records: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def add_transactions(self, transactions: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Append transactions, skipping hashes that were already written.
+
+        Args:
+            transactions: Iterable of (tx_hash, tx_data) pairs
+
+        Returns:
+            Number of transactions appended
+        """
+        added = 0
+        for tx_hash, tx_data in transactions:
+            if tx_hash in self._rows:
+                continue
+            self._rows[tx_hash] = len(self._rows)
+            self._table.append(tx_data)
+            self._pending_hashes.append(tx_hash)
+            self._pending_records.append(json.dumps(tx_data, separators=(",", ":")))
+            added += 1
+            if len(self._table) >= self._FLUSH_ROWS:
+                self._flush()
+        self._flush()
+        return added
+
+    def add_wallets(self, wallets: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Add or replace wallet records.
+
+        Args:
+            wallets: Iterable of (address, wallet record) pairs
+        """
+        self.wallets.update(wallets)
+
+    def add_scam_addresses(self, scam_addresses: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Add or replace scam label records.
+
+        Args:
+            scam_addresses: Iterable of (address, label record) pairs
+        """
+        self.scam_addresses.update(scam_addresses)
+
+    def add_dataset(self, dataset: "MappedDataset") -> None:
+        """
+        Stream the contents of an existing dataset into this writer.
+
+        Every transaction is copied, so merging new data into a dataset
+        costs a full pass over the existing one.
+
+        Args:
+            dataset: An open dataset, typically the one being rebuilt
+        """
+        self.add_transactions(dataset.transactions.iter_transactions())
+        if self.prices is None:
+            self.prices = dataset.transactions.table.prices
+        self.add_wallets(dataset.wallets.items())
+        self.add_scam_addresses(dataset.scam_addresses.items())
+
+    def _flush(self) -> None:
+        for name in self._COLUMNS:
+            column = getattr(self._table, name[len("tx_"):])
+            self._columns[name].write(column.tobytes())
+        self._table.clear_rows()
+        self._hashes.extend(self._pending_hashes)
+        self._records.extend(self._pending_records)
+        self._pending_hashes = []
+        self._pending_records = []
+
+    def close(self) -> None:
+        """Assemble the dataset file and move it into place."""
+        try:
+            self._flush()
+            for spill in self._columns.values():
+                spill.flush()
+
+            table = self._table
+            addresses = list(table.addresses)
+            from_ids = np.fromfile(self._columns["tx_from_ids"].name, dtype=np.int64)
+            to_ids = np.fromfile(self._columns["tx_to_ids"].name, dtype=np.int64)
+
+            sections: List[Tuple[str, Any, Any]] = [
+                (name, self._table_dtype(name), self._columns[name]) for name in self._COLUMNS
+            ]
+            sections.append(("tx_hash_order", np.int64, np.fromiter(
+                (row for _, row in sorted(self._rows.items())), dtype=np.int64, count=len(self._rows)
+            )))
+            sections.append(("address_order", np.int64, np.asarray(
+                sorted(range(len(addresses)), key=addresses.__getitem__), dtype=np.int64
+            )))
+            out_offsets, out_rows = _postings(from_ids, len(addresses))
+            in_offsets, in_rows = _postings(to_ids, len(addresses))
+            sections += [
+                ("out_offsets", np.int64, out_offsets),
+                ("out_rows", np.int64, out_rows),
+                ("in_offsets", np.int64, in_offsets),
+                ("in_rows", np.int64, in_rows),
+            ]
+            del from_ids, to_ids
+
+            for name, spill in (("tx_hashes", self._hashes), ("tx_records", self._records)):
+                sections.append((f"{name}_offsets", np.int64, spill.offsets()))
+                spill.heap.flush()
+                sections.append((f"{name}_heap", np.uint8, spill.heap))
+
+            wallet_keys = sorted(self.wallets)
+            label_keys = sorted(self.scam_addresses)
+            string_columns = {
+                "addresses": addresses,
+                "wallet_keys": wallet_keys,
+                "wallet_values": [json.dumps(self.wallets[key], separators=(",", ":")) for key in wallet_keys],
+                "label_keys": label_keys,
+                "label_values": [json.dumps(self.scam_addresses[key], separators=(",", ":")) for key in label_keys],
+            }
+            for name, values in string_columns.items():
+                offsets, heap = _string_arrays(values)
+                sections.append((f"{name}_offsets", np.int64, offsets))
+                sections.append((f"{name}_heap", np.uint8, heap))
+
+            label_bloom, label_bloom_hashes = build_bloom(iter(label_keys), len(label_keys))
+            sections.append(("label_bloom", np.uint8, label_bloom))
+
+            self._assemble(sections, {
+                "tokens": list(table.tokens),
+                "token_prices": self.prices,
+                "label_bloom_hashes": label_bloom_hashes,
+            })
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        """Remove the temporary spill files without writing the dataset."""
+        for spill in self._columns.values():
+            spill.close()
+        self._hashes.close()
+        self._records.close()
+        shutil.rmtree(self._spill_dir, ignore_errors=True)
+
+    def _table_dtype(self, name: str) -> np.dtype:
+        return getattr(self._table, name[len("tx_"):]).dtype
+
+    def _assemble(self, sections: List[Tuple[str, Any, Any]], metadata: Dict[str, Any]) -> None:
+        toc: Dict[str, Any] = {"version": self.version, **metadata, "arrays": {}}
+
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "wb") as handle:
+            handle.write(_HEADER.pack(MAGIC, 0, 0))
+            for name, dtype, source in sections:
+                dtype = np.dtype(dtype)
+                handle.write(b"\0" * (-handle.tell() % _ALIGNMENT))
+                offset = handle.tell()
+                if isinstance(source, np.ndarray):
+                    handle.write(np.ascontiguousarray(source, dtype=dtype).tobytes())
+                else:
+                    source.seek(0)
+                    shutil.copyfileobj(source, handle)
+                toc["arrays"][name] = {
+                    "offset": offset,
+                    "dtype": dtype.str,
+                    "count": (handle.tell() - offset) // dtype.itemsize,
+                }
+
+            toc_bytes = json.dumps(toc).encode("utf-8")
+            toc_offset = handle.tell()
+            handle.write(toc_bytes)
+            handle.seek(0)
+            handle.write(_HEADER.pack(MAGIC, toc_offset, len(toc_bytes)))
+
+        os.replace(temporary_path, self.path)
+
+def write_dataset(
+    path: str,
+    transactions: TransactionStore,
+    wallets: Mapping,
+    scam_addresses: Mapping,
+    version: Optional[str] = None,
+    prices: Optional[Dict[str, float]] = None,
+) -> None:
+    """
+    Write transactions, wallets and scam labels to a dataset file.
+
+    The file is written to a temporary path and renamed into place, so
+    readers never observe a partially written dataset.
+
+    Args:
+        path: Destination file path
+        transactions: The transaction store to export
+        wallets: Mapping of address to wallet record
+        scam_addresses: Mapping of address to scam label record
+        version: Dataset version recorded in the file; a random one is
+            generated when omitted
+        prices: Optional token price table stored with the dataset
+    """
+    with DatasetWriter(path, version, prices) as writer:
+        writer.add_transactions(transactions.iter_transactions())
+        writer.add_wallets(wallets.items())
+        writer.add_scam_addresses(scam_addresses.items())
+
+def open_dataset(path: str) -> MappedDataset:
+    """
+    Open a dataset file written by write_dataset.
+
+    Args:
+        path: Path of the dataset file
+
+    Returns:
+        The memory-mapped dataset
+    """
+    return MappedDataset(path)
@@ -0,0 +1,432 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Streaming bulk ingest of transaction dumps for blockchain security.
+
+Reads JSONL or CSV transaction exports and eth_getBlockByNumber-style block
+dumps one record at a time and appends them in fixed-size chunks to a
+transaction store or dataset writer, reporting throughput as it goes.
+Lines that are not JSON objects, and records without a hash, sender,
+recipient or parseable timestamp, are counted and skipped, as are wallet
+and label records without an address.
+
+Usage:
+    python -m blockchain_security.tools.ingest OUTPUT INPUT [INPUT ...]
+        [--format auto|jsonl|csv|blocks] [--wallets FILE] [--labels FILE]
+        [--prices FILE] [--merge] [--chunk-size N]
+
+Point config.BLOCKCHAIN_DATASET_PATH at OUTPUT to serve it to the tools.
+
+Dataset files are immutable once written: --merge rebuilds OUTPUT from its
+existing contents plus the inputs, which costs a full pass over the
+existing dataset. To extend live data incrementally, ingest into the
+in-memory TransactionStore instead.
+
+Transactions are spilled to disk as they are read, but wallet and label
+records are held in memory until the dataset is written, at about 1 KB per
+record; see DatasetWriter.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from itertools import islice
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .dataset import DatasetWriter, open_dataset
+from .transaction_table import parse_timestamp
+
+DEFAULT_CHUNK_SIZE = 10000
+FORMATS = ("jsonl", "csv", "blocks")
+WEI_PER_ETH = Decimal(10) ** 18
+
+Record = Tuple[str, Dict[str, Any]]
+
+# Stands in for an input line that could not be decoded, so that it is
+# counted as a skipped record
+_MALFORMED: Record = ("", {})
+
+def _decode_object(line: str) -> Optional[Dict[str, Any]]:
+    try:
+        value = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return value if isinstance(value, dict) else None
+
+def read_jsonl(path: str) -> Iterator[Record]:
+    """
+    Stream transactions from a JSONL file with one transaction object per line.
+
+    Each object needs "hash", "from", "to", "value" and "timestamp" fields;
+    any other fields are kept as-is. A line that is not a JSON object is
+    passed on as a record that fails valid_record.
+
+    Args:
+        path: Path of the JSONL file
+
+    Returns:
+        Iterator of (tx_hash, tx_data) pairs
+    """
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            tx_data = _decode_object(line)
+            if tx_data is None:
+                yield _MALFORMED
+                continue
+            yield tx_data.pop("hash", ""), tx_data
+
+def read_csv(path: str) -> Iterator[Record]:
+    """
+    Stream transactions from a CSV file with a header row.
+
+    Columns match the JSONL fields. An optional "token" column is appended
+    to a non-empty "value", so "5.2" and "ETH" become "5.2 ETH", and a
+    numeric "gas_used" column is converted to an integer.
+
+    Args:
+        path: Path of the CSV file
+
+    Returns:
+        Iterator of (tx_hash, tx_data) pairs
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            tx_data: Dict[str, Any] = dict(row)
+            tx_hash = tx_data.pop("hash", "")
+            token = tx_data.pop("token", None)
+            if token and tx_data.get("value"):
+                tx_data["value"] = f"{tx_data['value']} {token}"
+            if str(tx_data.get("gas_used", "")).isdigit():
+                tx_data["gas_used"] = int(tx_data["gas_used"])
+            yield tx_hash, tx_data
+
+def format_wei(value: str) -> str:
+    """
+    Convert a hex wei quantity into a decimal ETH amount string.
+
+    Args:
+        value: Hex quantity such as "0x4563918244f40000"
+
+    Returns:
+        The amount in ETH, e.g. "5"
+    """
+    amount = Decimal(int(value, 16)) / WEI_PER_ETH
+    return format(amount.normalize(), "f") if amount else "0"
+
+def transactions_from_block(block: Dict[str, Any]) -> Iterator[Record]:
+    """
+    Extract the transactions of one eth_getBlockByNumber result.
+
+    Values are converted from wei to ETH and the block timestamp is applied
+    to each transaction; contract creations, which have no recipient, get an
+    empty "to". A transaction whose fields cannot be converted is passed on
+    as a record that fails valid_record.
+
+    Args:
+        block: Block object fetched with full transaction objects
+
+    Returns:
+        Iterator of (tx_hash, tx_data) pairs
+    """
+    block_number = int(block["number"], 16)
+    timestamp = datetime.fromtimestamp(int(block["timestamp"], 16), tz=timezone.utc)
+    timestamp_text = timestamp.strftime("%Y-%m-%dT%H:%M:%SZ")
+    for tx in block.get("transactions", []):
+        if isinstance(tx, str):
+            continue  # Block fetched with hashes only
+        try:
+            tx_data = {
+                "from": tx.get("from"),
+                "to": tx.get("to") or "",
+                "value": f"{format_wei(tx.get('value', '0x0'))} ETH",
+                "timestamp": timestamp_text,
+                "gas_limit": int(tx.get("gas", "0x0"), 16),
+                "block_number": block_number,
+            }
+        except (AttributeError, TypeError, ValueError):
+            yield _MALFORMED
+            continue
+        yield tx.get("hash", ""), tx_data
+
+def read_block_dump(path: str) -> Iterator[Record]:
+    """
+    Stream transactions from a dump of eth_getBlockByNumber results.
+
+    The file holds one block per line, either as a raw block object or
+    wrapped in a JSON-RPC response under "result". Blocks must have been
+    fetched with full transaction objects; see transactions_from_block.
+    A line that cannot be read as a block is passed on as one record that
+    fails valid_record.
+
+    Args:
+        path: Path of the block dump
+
+    Returns:
+        Iterator of (tx_hash, tx_data) pairs
+    """
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            block = _decode_object(line)
+            if block is not None and "result" in block:
+                block = block["result"]
+                if block is None:
+                    continue  # Block not found
+            try:
+                yield from transactions_from_block(block)
+            except (AttributeError, KeyError, TypeError, ValueError):
+                yield _MALFORMED
+
+def read_address_records(path: str) -> Iterator[Record]:
+    """
+    Stream wallet or scam label records from a JSONL file.
+
+    Each object needs an "address" field; the rest of the object becomes
+    the record stored for that address. A line that is not a JSON object
+    with an address is passed on as a record that fails
+    valid_address_record.
+
+    Args:
+        path: Path of the JSONL file
+
+    Returns:
+        Iterator of (address, record) pairs
+    """
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = _decode_object(line)
+            if record is None:
+                yield _MALFORMED
+                continue
+            address = record.pop("address", "")
+            yield address if isinstance(address, str) else "", record
+
+READERS: Dict[str, Callable[[str], Iterator[Record]]] = {
+    "jsonl": read_jsonl,
+    "csv": read_csv,
+    "blocks": read_block_dump,
+}
+
+def detect_format(path: str) -> str:
+    """
+    Guess the input format of a transaction file from its extension.
+
+    Block dumps are also JSONL, so they must be requested explicitly.
+
+    Args:
+        path: Path of the input file
+
+    Returns:
+        One of FORMATS
+    """
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+def valid_record(record: Record) -> bool:
+    """
+    Check that a transaction record can be stored.
+
+    Args:
+        record: A (tx_hash, tx_data) pair
+
+    Returns:
+        True if the record has a hash, sender, recipient and parseable timestamp
+    """
+    tx_hash, tx_data = record
+    if not tx_hash or not isinstance(tx_data.get("from"), str) or not isinstance(tx_data.get("to"), str):
+        return False
+    try:
+        parse_timestamp(tx_data["timestamp"])
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return False
+    return True
+
+def valid_address_record(record: Record) -> bool:
+    """
+    Check that a wallet or scam label record can be stored.
+
+    Args:
+        record: An (address, record) pair
+
+    Returns:
+        True if the record has an address
+    """
+    return bool(record[0])
+
+def chunked(records: Iterable[Record], chunk_size: int) -> Iterator[List[Record]]:
+    """
+    Split a record stream into lists of at most chunk_size records.
+
+    Args:
+        records: The record stream
+        chunk_size: Maximum records per chunk
+
+    Returns:
+        Iterator of record lists
+    """
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def ingest_transactions(
+    records: Iterable[Record],
+    sink: Any,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[TextIO] = None,
+) -> Dict[str, Any]:
+    """
+    Append a transaction stream to a store in fixed-size chunks.
+
+    Only one chunk is held in memory at a time. The sink can be a
+    TransactionStore, to extend the live in-memory data, or a
+    DatasetWriter, to build a dataset file. Records that fail valid_record
+    are skipped rather than aborting the ingest, and records whose hash the
+    sink already holds are counted as duplicates.
+
+    Args:
+        records: Stream of (tx_hash, tx_data) pairs
+        sink: Object with an add_transactions(chunk) method returning the
+            number of transactions it added
+        chunk_size: Records per chunk
+        progress: Optional stream to write a progress line to after each chunk
+
+    Returns:
+        Dictionary with rows ingested, rows skipped, duplicate rows,
+        elapsed seconds and rows per second
+    """
+    rows = 0
+    skipped = 0
+    duplicates = 0
+    started = time.perf_counter()
+    for chunk in chunked(records, chunk_size):
+        valid = [record for record in chunk if valid_record(record)]
+        skipped += len(chunk) - len(valid)
+        added = sink.add_transactions(valid)
+        rows += added
+        duplicates += len(valid) - added
+        if progress is not None:
+            elapsed = time.perf_counter() - started
+            progress.write(f"  {rows} rows, {skipped} skipped, {rows / elapsed if elapsed else 0.0:.0f} rows/s\n")
+            progress.flush()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "skipped": skipped,
+        "duplicates": duplicates,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed else 0.0,
+    }
+
+def ingest_address_records(records: Iterable[Record], add_records: Callable[[Iterable[Record]], None]) -> int:
+    """
+    Add a stream of wallet or scam label records, skipping invalid ones.
+
+    Args:
+        records: Stream of (address, record) pairs
+        add_records: Writer method taking the valid pairs, such as
+            DatasetWriter.add_wallets
+
+    Returns:
+        Number of records skipped for failing valid_address_record
+    """
+    skipped = 0
+
+    def valid_records() -> Iterator[Record]:
+        nonlocal skipped
+        for record in records:
+            if valid_address_record(record):
+                yield record
+            else:
+                skipped += 1
+
+    add_records(valid_records())
+    return skipped
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for building or extending a dataset file.
+
+    Args:
+        argv: Command-line arguments, defaulting to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Ingest transaction dumps into a blockchain security dataset")
+    parser.add_argument("output", help="Dataset file to write")
+    parser.add_argument("inputs", nargs="*", help="Transaction files to ingest")
+    parser.add_argument("--format", choices=("auto",) + FORMATS, default="auto",
+                        help="Input format; 'auto' picks csv or jsonl from the file extension")
+    parser.add_argument("--wallets", action="append", default=[], help="JSONL file of wallet records")
+    parser.add_argument("--labels", action="append", default=[], help="JSONL file of scam label records")
+    parser.add_argument("--prices", help="JSON file mapping token symbols to prices in a common denomination")
+    parser.add_argument("--merge", action="store_true",
+                        help="Rebuild an existing output dataset with its contents plus the inputs")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Records per chunk")
+    args = parser.parse_args(argv)
+
+    total_rows = 0
+    total_skipped = 0
+    started = time.perf_counter()
+    prices = None
+    if args.prices:
+        with open(args.prices, encoding="utf-8") as handle:
+            prices = {symbol.upper(): float(price) for symbol, price in json.load(handle).items()}
+
+    with DatasetWriter(args.output, prices=prices) as writer:
+        if args.merge and os.path.exists(args.output):
+            existing = open_dataset(args.output)
+            writer.add_dataset(existing)
+            print(f"Copied {len(existing.transactions)} existing transactions from {args.output}")
+
+        for path in args.inputs:
+            input_format = detect_format(path) if args.format == "auto" else args.format
+            print(f"Ingesting {path} ({input_format})")
+            stats = ingest_transactions(READERS[input_format](path), writer, args.chunk_size, sys.stdout)
+            total_rows += stats["rows"]
+            total_skipped += stats["skipped"]
+            print(f"  done: {stats['rows']} rows, {stats['skipped']} skipped, {stats['duplicates']} duplicates, "
+                  f"in {stats['seconds']:.2f}s ({stats['rows_per_second']:.0f} rows/s)")
+
+        for path in args.wallets:
+            skipped = ingest_address_records(read_address_records(path), writer.add_wallets)
+            print(f"Read wallets from {path}, {skipped} skipped")
+        for path in args.labels:
+            skipped = ingest_address_records(read_address_records(path), writer.add_scam_addresses)
+            print(f"Read labels from {path}, {skipped} skipped")
+
+        print("Writing dataset")
+
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {args.output}: {len(writer)} transactions, {len(writer.wallets)} wallets, "
+          f"{len(writer.scam_addresses)} labels; ingested {total_rows} rows, skipped {total_skipped}, in {elapsed:.2f}s "
+          f"({total_rows / elapsed if elapsed else 0.0:.0f} rows/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
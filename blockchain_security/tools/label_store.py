@@ -0,0 +1,202 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Scam label store with a Bloom filter front end for blockchain security."""
+
+import hashlib
+import math
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_ERROR_RATE = 0.001
+
+class BloomFilter:
+    """
+    Bloom filter over address strings backed by a NumPy bit array.
+
+    Membership tests never give false negatives; false positives occur at
+    roughly the configured error rate once the filter holds its capacity.
+    """
+
+    def __init__(self, bits: np.ndarray, hash_count: int) -> None:
+        self.bits = bits
+        self.hash_count = hash_count
+        self._bit_count = len(bits) * 8
+
+    @classmethod
+    def with_capacity(cls, capacity: int, error_rate: float = DEFAULT_ERROR_RATE) -> "BloomFilter":
+        """
+        Create an empty filter sized for a number of keys.
+
+        Args:
+            capacity: Expected number of keys
+            error_rate: Target false positive rate at capacity
+
+        Returns:
+            An empty BloomFilter
+        """
+        capacity = max(capacity, 1)
+        bit_count = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        hash_count = max(1, round(bit_count / capacity * math.log(2)))
+        return cls(np.zeros((bit_count + 7) // 8, dtype=np.uint8), hash_count)
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hash_count):
+            yield (first + index * second) % self._bit_count
+
+    def add(self, key: str) -> None:
+        """
+        Add a key to the filter.
+
+        Args:
+            key: The address to add
+        """
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        bits = self.bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+class LabelStore(Mapping):
+    """
+    Read-mostly mapping of address to scam label record.
+
+    Every lookup is first checked against a Bloom filter, so the negative
+    lookups that make up nearly all screening traffic are answered without
+    touching the exact-match backing table. The backing table can be a
+    plain dict or a memory-mapped MappedRecords from a dataset file.
+    """
+
+    def __init__(self, records: Mapping, bloom: Optional[BloomFilter] = None) -> None:
+        self._records = records
+        if bloom is None:
+            bloom = BloomFilter.with_capacity(len(records))
+            for address in records:
+                bloom.add(address)
+        self.bloom = bloom
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __contains__(self, address: object) -> bool:
+        return address in self.bloom and address in self._records
+
+    def __getitem__(self, address: str) -> Dict[str, Any]:
+        if address not in self.bloom:
+            raise KeyError(address)
+        return self._records[address]
+
+    def get(self, address: str, default: Any = None) -> Any:
+        if address not in self.bloom:
+            return default
+        return self._records.get(address, default)
+
+    def add_label(self, address: str, record: Dict[str, Any]) -> None:
+        """
+        Add or replace the label for an address.
+
+        Only supported when the backing table is mutable; mapped datasets are
+        extended through the ingest pipeline instead.
+
+        Args:
+            address: The labelled address
+            record: The label record, e.g. scam_type, risk_score, reported_by
+        """
+        self._records[address] = record
+        self.bloom.add(address)
+
+class MergedLabelStore(LabelStore):
+    """
+    Union of several label stores, e.g. the labels of every chain's dataset.
+
+    Labels added through add_label take precedence; otherwise the first
+    store holding an address wins. Each store answers its own negative
+    lookups from its Bloom filter, so memory-mapped stores are read in
+    place rather than copied. len() counts an address once for every
+    store holding it.
+
+    Attributes:
+        stores: The merged label stores, in precedence order
+        added: Labels added through add_label
+    """
+
+    # Expected number of labels added at runtime, for sizing their Bloom filter
+    ADDED_CAPACITY = 1024
+
+    def __init__(self, stores: Sequence[LabelStore]) -> None:
+        self.added: Dict[str, Dict[str, Any]] = {}
+        super().__init__(self.added, BloomFilter.with_capacity(self.ADDED_CAPACITY))
+        self.stores = list(stores)
+
+    def __len__(self) -> int:
+        return len(self.added) + sum(len(store) for store in self.stores)
+
+    def __iter__(self) -> Iterator[str]:
+        seen = set(self.added)
+        yield from self.added
+        for store in self.stores:
+            for address in store:
+                if address not in seen:
+                    seen.add(address)
+                    yield address
+
+    def __contains__(self, address: object) -> bool:
+        return super().__contains__(address) or any(address in store for store in self.stores)
+
+    def __getitem__(self, address: str) -> Dict[str, Any]:
+        record = self.get(address)
+        if record is None:
+            raise KeyError(address)
+        return record
+
+    def get(self, address: str, default: Any = None) -> Any:
+        record = super().get(address)
+        if record is not None:
+            return record
+        for store in self.stores:
+            record = store.get(address)
+            if record is not None:
+                return record
+        return default
+
+def build_bloom(addresses: Iterator[str], count: int, error_rate: float = DEFAULT_ERROR_RATE) -> Tuple[np.ndarray, int]:
+    """
+    Build the bit array and hash count of a filter over a set of addresses.
+
+    Args:
+        addresses: The addresses to insert
+        count: Number of addresses, used to size the filter
+        error_rate: Target false positive rate
+
+    Returns:
+        Tuple of (bit array, hash count) suitable for BloomFilter(...)
+    """
+    bloom = BloomFilter.with_capacity(count, error_rate)
+    for address in addresses:
+        bloom.add(address)
+    return bloom.bits, bloom.hash_count
@@ -0,0 +1,432 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Chain-partitioned data sources with parallel queries and bridge linking.
+
+Every chain's transactions and wallet records live in their own DataSource
+shard, with its own transaction index, graph and caches, while the scam
+labels are shared because an EVM address is the same account on every
+chain. A single-chain query reads only its shard. A multi-chain query runs
+the same function on each shard concurrently: on a thread pool for any
+shards, or on a process pool for memory-mapped shards, which each worker
+process opens once by path.
+
+Set config.BLOCKCHAIN_CHAIN_DATASETS to serve one dataset per chain: the
+tools read the config.DEFAULT_CHAIN shard unless a call names another chain,
+and report the bridge transfers linking an address's activity across chains.
+"""
+
+import bisect
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from blockchain_security import config
+from . import blockchain_data
+from .data_source import DataSource, get_data_source, mapped_source, using_data_source
+from .label_store import LabelStore, MergedLabelStore
+from .transaction_store import TransactionStore
+from .transaction_table import MISSING_UNITS, format_timestamp
+
+class MultiChainSource:
+    """
+    Per-chain DataSource shards with a cross-chain view.
+
+    Attributes:
+        shards: Chain ID to the DataSource holding that chain's data
+        scam_addresses: The LabelStore shared by every shard
+        paths: Chain ID to dataset path for memory-mapped shards
+        max_workers: Size of the query pools, defaulting to the executors' default
+        version: Identifier of the loaded data, prefixed to the versions of
+            shards added later
+
+    The thread and process pools for query_all are started on first use and
+    kept until close().
+    """
+
+    def __init__(
+        self,
+        shards: Mapping[str, DataSource],
+        scam_addresses: Any,
+        paths: Optional[Mapping[str, str]] = None,
+        max_workers: Optional[int] = None,
+        version: str = "multi_chain",
+    ) -> None:
+        self.shards = dict(shards)
+        self.scam_addresses = scam_addresses
+        self.paths = dict(paths or {})
+        self.max_workers = max_workers
+        self.version = version
+        self._executors: Dict[bool, Executor] = {}
+        self._executors_lock = threading.Lock()
+        self._bridge_links: Optional[List[Dict[str, Any]]] = None
+        self._bridge_links_built_for: Tuple[Any, ...] = ()
+        self._links_by_address: Dict[str, List[Dict[str, Any]]] = {}
+
+    @classmethod
+    def from_records(
+        cls,
+        transactions: Mapping[str, Dict[str, Any]],
+        wallets: Mapping[str, Dict[str, Any]],
+        scam_addresses: Mapping[str, Any],
+        version: str = "sample",
+    ) -> "MultiChainSource":
+        """
+        Partition in-memory records into per-chain shards.
+
+        Transactions and wallet records are assigned to the chain in their
+        "chain" field, or to config.DEFAULT_CHAIN when they have none.
+
+        Args:
+            transactions: Mapping of tx_hash to transaction data
+            wallets: Mapping of address to wallet record
+            scam_addresses: Mapping of address to scam label record
+            version: Identifier of the loaded data
+
+        Returns:
+            The MultiChainSource
+        """
+        chain_transactions: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for tx_hash, tx_data in transactions.items():
+            chain_transactions.setdefault(tx_data.get("chain", config.DEFAULT_CHAIN), {})[tx_hash] = tx_data
+        chain_wallets: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for address, wallet_data in wallets.items():
+            chain_wallets.setdefault(wallet_data.get("chain", config.DEFAULT_CHAIN), {})[address] = wallet_data
+
+        labels = scam_addresses if isinstance(scam_addresses, LabelStore) else LabelStore(scam_addresses)
+        shards = {
+            chain: DataSource(
+                TransactionStore.from_transactions(chain_transactions.get(chain, {})),
+                chain_wallets.get(chain, {}),
+                labels,
+                version=f"{version}:{chain}",
+                chain=chain,
+            )
+            for chain in sorted(set(chain_transactions) | set(chain_wallets) | {config.DEFAULT_CHAIN})
+        }
+        return cls(shards, labels, version=version)
+
+    @classmethod
+    def from_datasets(cls, paths: Mapping[str, str]) -> "MultiChainSource":
+        """
+        Open one memory-mapped dataset per chain.
+
+        Every shard shares one MergedLabelStore over the scam labels of all
+        the datasets, the first dataset's label winning where two disagree.
+
+        Args:
+            paths: Chain ID to path of a dataset written by dataset.write_dataset
+
+        Returns:
+            The MultiChainSource
+        """
+        shards = {chain: mapped_source(path, chain=chain) for chain, path in paths.items()}
+        labels = MergedLabelStore([shard.scam_addresses for shard in shards.values()])
+        for shard in shards.values():
+            shard.scam_addresses = labels
+        version = "+".join(shard.version for shard in shards.values())
+        return cls(shards, labels, paths, version=version)
+
+    @property
+    def chains(self) -> List[str]:
+        """Chain IDs of the shards."""
+        return list(self.shards)
+
+    def shard(self, chain: str) -> DataSource:
+        """
+        Get one chain's shard.
+
+        Args:
+            chain: Chain ID
+
+        Returns:
+            The chain's DataSource
+        """
+        if chain not in self.shards:
+            raise KeyError(f"No data for chain {chain!r}; known chains are {', '.join(self.shards)}")
+        return self.shards[chain]
+
+    def query(self, chain: str, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a function against one chain's shard.
+
+        The function runs with the shard selected through
+        using_data_source, so the tool methods read only that chain's data.
+
+        Args:
+            chain: Chain ID
+            function: Callable to run, e.g. a tool method
+            *args: Arguments for the function
+
+        Returns:
+            The function's result
+        """
+        with using_data_source(self.shard(chain)):
+            return function(*args)
+
+    def query_all(
+        self,
+        function: Callable[..., Any],
+        *args: Any,
+        chains: Optional[Sequence[str]] = None,
+        processes: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Run a function against several chains' shards in parallel.
+
+        With processes, each shard must be memory-mapped and the function
+        and its arguments picklable, e.g. a module-level function or a tool
+        method. The process pool's workers open the datasets once, with the
+        same merged scam labels, and keep them open for later queries;
+        labels added with add_label are passed along with each query.
+
+        Args:
+            function: Callable to run against each shard
+            *args: Arguments for the function
+            chains: Chain IDs to query, defaulting to every shard
+            processes: Use a process pool instead of a thread pool
+
+        Returns:
+            Chain ID to the function's result on that chain
+        """
+        chains = list(self.shards if chains is None else chains)
+        if processes:
+            missing = [chain for chain in chains if chain not in self.paths]
+            if missing:
+                raise ValueError(f"Process-pool queries need memory-mapped shards; {', '.join(missing)} are in memory")
+        executor = self._executor(processes)
+        if processes:
+            paths = tuple(sorted(self.paths.items()))
+            added_labels = dict(getattr(self.scam_addresses, "added", {}))
+            futures = {
+                chain: executor.submit(_query_mapped_shard, paths, chain, added_labels, function, args)
+                for chain in chains
+            }
+        else:
+            futures = {chain: executor.submit(self.query, chain, function, *args) for chain in chains}
+        return {chain: future.result() for chain, future in futures.items()}
+
+    def _executor(self, processes: bool) -> Executor:
+        with self._executors_lock:
+            executor = self._executors.get(processes)
+            if executor is None:
+                pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+                executor = self._executors[processes] = pool(max_workers=self.max_workers)
+            return executor
+
+    def close(self) -> None:
+        """Shut down the query pools, waiting for running queries to finish."""
+        with self._executors_lock:
+            executors = list(self._executors.values())
+            self._executors = {}
+        for executor in executors:
+            executor.shutdown()
+
+    def add_transactions(self, transactions: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Add transactions to the shards of their chains.
+
+        Args:
+            transactions: Iterable of (tx_hash, tx_data) pairs
+        """
+        by_chain: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for tx_hash, tx_data in transactions:
+            by_chain.setdefault(tx_data.get("chain", config.DEFAULT_CHAIN), []).append((tx_hash, tx_data))
+        for chain, chain_transactions in by_chain.items():
+            if chain not in self.shards:
+                self.shards[chain] = DataSource(
+                    TransactionStore(), {}, self.scam_addresses, version=f"{self.version}:{chain}", chain=chain
+                )
+            self.shards[chain].add_transactions(chain_transactions)
+
+    def add_label(self, address: str, record: Dict[str, Any]) -> None:
+        """
+        Add or replace a scam label on every chain.
+
+        Args:
+            address: The scam address
+            record: The label record
+        """
+        for shard in self.shards.values():
+            shard.add_label(address, record)
+
+    @property
+    def data_version(self) -> Tuple[Any, ...]:
+        """Key identifying the current state of every shard."""
+        return tuple((chain, shard.data_version) for chain, shard in self.shards.items())
+
+    def bridge_links(self) -> List[Dict[str, Any]]:
+        """
+        Link deposits into known bridges to the withdrawals they paid out.
+
+        Each chain's bridge deposits and withdrawals are collected from its
+        shard in parallel. A withdrawal on one chain is then linked to a
+        deposit on another chain into the same bridge when it pays out the
+        same token within config.BRIDGE_LINK_MAX_DELAY_SECONDS, for at most
+        the deposited amount and at least that amount less
+        config.BRIDGE_LINK_FEE_TOLERANCE. Deposits are matched in time
+        order, each to the first unmatched withdrawal that fits, preferring
+        one paid to the depositor's own address. Withdrawals are grouped by
+        bridge and token and sorted by time, so each deposit only looks at
+        those from its own time onwards within the delay.
+
+        Returns:
+            List of links with the bridge, deposit, withdrawal and delay
+        """
+        if self._bridge_links is not None and self._bridge_links_built_for == self.data_version:
+            return self._bridge_links
+
+        transfers = self.query_all(_bridge_transfers)
+        deposits = sorted(
+            (transfer for chain_transfers in transfers.values() for transfer in chain_transfers if transfer["deposit"]),
+            key=lambda transfer: (transfer["time"], transfer["tx_hash"])
+        )
+        withdrawals: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for transfer in sorted(
+            (transfer for chain_transfers in transfers.values() for transfer in chain_transfers if not transfer["deposit"]),
+            key=lambda transfer: (transfer["time"], transfer["tx_hash"])
+        ):
+            withdrawals.setdefault((transfer["bridge_address"], transfer["token"]), []).append(transfer)
+        withdrawal_times = {key: [transfer["time"] for transfer in group] for key, group in withdrawals.items()}
+
+        links = []
+        matched = set()
+        for deposit in deposits:
+            key = (deposit["bridge_address"], deposit["token"])
+            candidates = withdrawals.get(key, [])
+            best = None
+            start = bisect.bisect_left(withdrawal_times[key], deposit["time"]) if candidates else 0
+            for index in range(start, len(candidates)):
+                withdrawal = candidates[index]
+                if withdrawal["time"] > deposit["time"] + config.BRIDGE_LINK_MAX_DELAY_SECONDS:
+                    break
+                if (withdrawal["tx_hash"] in matched
+                        or withdrawal["chain"] == deposit["chain"]
+                        or not deposit["units"] * (1 - config.BRIDGE_LINK_FEE_TOLERANCE)
+                        <= withdrawal["units"] <= deposit["units"]):
+                    continue
+                if withdrawal["address"] == deposit["address"]:
+                    best = withdrawal
+                    break
+                if best is None:
+                    best = withdrawal
+            if best is None:
+                continue
+            matched.add(best["tx_hash"])
+            links.append({
+                "bridge": blockchain_data.KNOWN_BRIDGE_ADDRESSES[deposit["bridge_address"]]["name"],
+                "bridge_address": deposit["bridge_address"],
+                "deposit": _describe_transfer(deposit, "from"),
+                "withdrawal": _describe_transfer(best, "to"),
+                "delay_seconds": best["time"] - deposit["time"]
+            })
+
+        links_by_address: Dict[str, List[Dict[str, Any]]] = {}
+        for link in links:
+            links_by_address.setdefault(link["deposit"]["from"], []).append(link)
+            if link["withdrawal"]["to"] != link["deposit"]["from"]:
+                links_by_address.setdefault(link["withdrawal"]["to"], []).append(link)
+        self._bridge_links = links
+        self._bridge_links_built_for = self.data_version
+        self._links_by_address = links_by_address
+        return links
+
+    def cross_chain_transfers(self, address: str) -> List[Dict[str, Any]]:
+        """
+        Get the bridge links an address deposited into or withdrew from.
+
+        Args:
+            address: The blockchain address
+
+        Returns:
+            The address's bridge links, in deposit time order
+        """
+        self.bridge_links()
+        return self._links_by_address.get(address, [])
+
+def _describe_transfer(transfer: Dict[str, Any], address_field: str) -> Dict[str, Any]:
+    return {
+        "chain": transfer["chain"],
+        "tx_hash": transfer["tx_hash"],
+        address_field: transfer["address"],
+        "value": transfer["value"],
+        "timestamp": format_timestamp(transfer["time"])
+    }
+
+def _bridge_transfers() -> List[Dict[str, Any]]:
+    # Collect the selected shard's transfers with amounts into and out of the
+    # known bridges
+    source = get_data_source()
+    store = source.transactions
+    table = store.table
+    transfers = []
+    for bridge_address, bridge in blockchain_data.KNOWN_BRIDGE_ADDRESSES.items():
+        if source.chain is not None and source.chain not in bridge["chains"]:
+            continue
+        for direction, deposit in (("in", True), ("out", False)):
+            for row in store.rows_for_address(bridge_address, direction).tolist():
+                if table.units[row] == MISSING_UNITS:
+                    continue
+                counterparty_id = table.from_ids[row] if deposit else table.to_ids[row]
+                transfers.append({
+                    "chain": source.chain,
+                    "bridge_address": bridge_address,
+                    "deposit": deposit,
+                    "tx_hash": store.hash_at(row),
+                    "address": table.addresses[counterparty_id],
+                    "token": table.tokens[table.token_ids[row]],
+                    "units": int(table.units[row]),
+                    "value": store.materialize(row).get("value"),
+                    "time": int(table.timestamps[row])
+                })
+    return transfers
+
+# Memory-mapped datasets opened by this process, for process-pool queries
+_process_sources: Dict[Tuple[Tuple[str, str], ...], MultiChainSource] = {}
+
+def _query_mapped_shard(
+    paths: Tuple[Tuple[str, str], ...],
+    chain: str,
+    added_labels: Dict[str, Dict[str, Any]],
+    function: Callable[..., Any],
+    args: Tuple[Any, ...],
+) -> Any:
+    source = _process_sources.get(paths)
+    if source is None:
+        source = _process_sources[paths] = MultiChainSource.from_datasets(dict(paths))
+    for address, record in added_labels.items():
+        if source.scam_addresses.added.get(address) != record:
+            source.add_label(address, record)
+    with using_data_source(source.shard(chain)):
+        return function(*args)
+
+def get_multi_chain_source() -> Optional[MultiChainSource]:
+    """
+    Get the per-chain shards of the configured datasets, opening them on first use.
+
+    Returns:
+        MultiChainSource over config.BLOCKCHAIN_CHAIN_DATASETS, or None when
+        no per-chain datasets are configured
+    """
+    global _multi_chain_source
+    if not config.BLOCKCHAIN_CHAIN_DATASETS:
+        return None
+    with _multi_chain_lock:
+        if _multi_chain_source is None:
+            _multi_chain_source = MultiChainSource.from_datasets(config.BLOCKCHAIN_CHAIN_DATASETS)
+        return _multi_chain_source
+
+_multi_chain_source: Optional[MultiChainSource] = None
+_multi_chain_lock = threading.Lock()
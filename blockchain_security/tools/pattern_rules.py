@@ -0,0 +1,392 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Declarative pattern rules evaluated in batch over transaction features.
+
+Each pattern is a conjunction of feature comparisons. Features are computed
+for a whole batch of addresses in one vectorized pass over their
+transactions, and every compiled rule is then a handful of array
+comparisons over those features, so adding a pattern adds no per-address
+loop.
+
+Rules come in two scopes: "address" rules compare per-address features,
+and "token" rules compare features of each (address, token) pair and match
+an address when any of its tokens matches.
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Any, List, Sequence, Tuple
+
+import numpy as np
+
+from . import blockchain_data
+from .transaction_table import TransactionTable
+
+_HOUR = 3600
+_DAY = 24 * _HOUR
+
+# Per-address features
+ADDRESS_FEATURES = (
+    "transaction_count",     # Transactions sent or received
+    "in_count",              # Transactions received
+    "out_count",             # Transactions sent
+    "distinct_senders",      # Distinct addresses the address received from
+    "distinct_recipients",   # Distinct addresses the address sent to
+    "mint_count",            # Mints received from the zero address plus contract creations sent
+    "bridge_out_count",      # Transfers sent to known cross-chain bridges
+    "bridge_hold_seconds",   # Shortest time between receiving funds and sending them to a bridge
+)
+
+# Per (address, token) features
+TOKEN_FEATURES = (
+    "in_amount",             # Amount of the token received
+    "minted_amount",         # Amount of the token received in mints from the zero address
+    "out_amount",            # Amount of the token sent
+    "out_ratio",             # out_amount / in_amount, 0 when nothing was received
+    "dump_seconds",          # Seconds from the first receipt to the last send, inf if not sent after receiving
+)
+
+# Patterns described in WALLET_BEHAVIORAL_PATTERNS
+BEHAVIORAL_RULES = {
+    # Tokens the address got at issuance and sold off quickly; plain
+    # pass-through wallets such as exchanges and routers receive tokens
+    # from other holders, not from mints
+    "dump_cycle": {
+        "scope": "token",
+        "all": [
+            ("minted_amount", ">", 0),
+            ("out_ratio", ">=", 0.8),
+            ("dump_seconds", "<=", 3 * _DAY),
+        ],
+    },
+    "excessive_minting": {
+        "scope": "address",
+        "all": [
+            ("mint_count", ">=", 5),
+        ],
+    },
+}
+
+# Patterns described in SUSPICIOUS_TRANSACTION_PATTERNS, besides the
+# burst-based rapid_transfers
+TRANSACTION_RULES = {
+    "token_honeypot": {
+        "scope": "address",
+        "all": [
+            ("distinct_senders", ">=", 5),
+            ("distinct_recipients", "<=", 1),
+            ("out_count", ">=", 1),
+        ],
+    },
+    "chain_hopping": {
+        "scope": "address",
+        "all": [
+            ("bridge_out_count", ">=", 1),
+            ("bridge_hold_seconds", "<=", _HOUR),
+        ],
+    },
+}
+
+_OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+class PatternFeatures:
+    """
+    Features of a batch of addresses.
+
+    Attributes:
+        group_count: Number of addresses
+        address: Feature name to array with one value per address
+        token: Feature name to array with one value per (address, token) pair
+        token_groups: Address index of each (address, token) pair
+        token_symbols: Token symbol of each (address, token) pair
+    """
+
+    def __init__(
+        self,
+        group_count: int,
+        address: Dict[str, np.ndarray],
+        token: Dict[str, np.ndarray],
+        token_groups: np.ndarray,
+        token_symbols: List[str],
+    ) -> None:
+        self.group_count = group_count
+        self.address = address
+        self.token = token
+        self.token_groups = token_groups
+        self.token_symbols = token_symbols
+
+    @classmethod
+    def extract(
+        cls, table: TransactionTable, rows: np.ndarray, groups: np.ndarray, address_ids: Sequence[int]
+    ) -> "PatternFeatures":
+        """
+        Compute the features of many addresses in one vectorized pass.
+
+        Args:
+            table: The transaction table the rows index into
+            rows: Row indices of the transactions of every address, concatenated
+            groups: For each entry of rows, the index of the address it belongs to
+            address_ids: Table address ID of each address, -1 if it has none
+
+        Returns:
+            The PatternFeatures
+        """
+        group_count = len(address_ids)
+        address_ids_array = np.asarray(address_ids, dtype=np.int64)
+        groups = np.asarray(groups, dtype=np.int64)
+        from_ids = table.from_ids[rows]
+        to_ids = table.to_ids[rows]
+        owners = address_ids_array[groups]
+
+        # One entry per side an address takes in a transaction, so a
+        # self-transfer counts as both a send and a receipt
+        is_out_row = from_ids == owners
+        is_in_row = to_ids == owners
+        side_rows = np.concatenate((rows[is_out_row], rows[is_in_row]))
+        side_groups = np.concatenate((groups[is_out_row], groups[is_in_row]))
+        side_is_out = np.concatenate((np.ones(is_out_row.sum(), dtype=bool), np.zeros(is_in_row.sum(), dtype=bool)))
+        side_counterparties = np.concatenate((to_ids[is_out_row], from_ids[is_in_row]))
+        side_timestamps = table.timestamps[side_rows]
+        side_amounts = np.nan_to_num(table.amounts[side_rows])
+
+        address_features = {
+            "transaction_count": np.bincount(groups, minlength=group_count),
+            "in_count": np.bincount(side_groups[~side_is_out], minlength=group_count),
+            "out_count": np.bincount(side_groups[side_is_out], minlength=group_count),
+            "distinct_senders": cls._distinct(side_groups[~side_is_out], side_counterparties[~side_is_out], group_count),
+            "distinct_recipients": cls._distinct(side_groups[side_is_out], side_counterparties[side_is_out], group_count),
+        }
+
+        zero_id = table.find_address_id(blockchain_data.ZERO_ADDRESS)
+        creation_id = table.find_address_id("")
+        mints = np.zeros(len(side_groups), dtype=bool)
+        if zero_id is not None:
+            mints |= ~side_is_out & (side_counterparties == zero_id)
+        if creation_id is not None:
+            mints |= side_is_out & (side_counterparties == creation_id)
+        address_features["mint_count"] = np.bincount(side_groups[mints], minlength=group_count)
+
+        address_features.update(cls._bridge_features(
+            table, side_groups, side_is_out, side_counterparties, side_timestamps, group_count
+        ))
+
+        token_features, token_groups, token_ids = cls._token_features(
+            table, side_rows, side_groups, side_is_out, side_timestamps, side_amounts, mints & ~side_is_out
+        )
+        return cls(
+            group_count,
+            address_features,
+            token_features,
+            token_groups,
+            [table.tokens[token_id] for token_id in token_ids.tolist()],
+        )
+
+    @classmethod
+    def for_row_groups(
+        cls, table: TransactionTable, row_groups: Sequence[np.ndarray], addresses: Sequence[str]
+    ) -> "PatternFeatures":
+        """
+        Compute the features of many addresses from their separate row arrays.
+
+        Args:
+            table: The transaction table the rows index into
+            row_groups: Row indices of each address's transactions
+            addresses: The addresses, in the same order
+
+        Returns:
+            The PatternFeatures
+        """
+        rows = np.concatenate(row_groups) if len(row_groups) else np.zeros(0, dtype=np.int64)
+        groups = np.repeat(np.arange(len(row_groups)), [len(group_rows) for group_rows in row_groups])
+        return cls.extract(table, rows, groups, address_ids(table, addresses))
+
+    @staticmethod
+    def _distinct(groups: np.ndarray, counterparties: np.ndarray, group_count: int) -> np.ndarray:
+        if not len(groups):
+            return np.zeros(group_count, dtype=np.int64)
+        pairs = np.unique(np.stack((groups, counterparties)), axis=1)
+        return np.bincount(pairs[0], minlength=group_count)
+
+    @staticmethod
+    def _bridge_features(
+        table: TransactionTable,
+        side_groups: np.ndarray,
+        side_is_out: np.ndarray,
+        side_counterparties: np.ndarray,
+        side_timestamps: np.ndarray,
+        group_count: int,
+    ) -> Dict[str, np.ndarray]:
+        bridge_ids = [
+            address_id for address_id in map(table.find_address_id, blockchain_data.KNOWN_BRIDGE_ADDRESSES)
+            if address_id is not None
+        ]
+        to_bridge = side_is_out & np.isin(side_counterparties, bridge_ids)
+        hold_seconds = np.full(group_count, np.inf)
+        if to_bridge.any():
+            # Latest receipt at or before each entry, found with a running
+            # maximum over entries sorted by address and time; keys are offset
+            # per address so the maximum never carries across addresses
+            order = np.lexsort((side_is_out, side_timestamps, side_groups))
+            sorted_groups = side_groups[order]
+            sorted_timestamps = side_timestamps[order]
+            stride = int(sorted_timestamps.max() - sorted_timestamps.min()) + 1
+            keys = sorted_groups * stride + (sorted_timestamps - sorted_timestamps.min())
+            last_in = np.maximum.accumulate(np.where(side_is_out[order], -1, keys))
+            received_before = last_in >= sorted_groups * stride
+            bridged = to_bridge[order] & received_before
+            np.minimum.at(hold_seconds, sorted_groups[bridged], (keys - last_in)[bridged])
+        return {
+            "bridge_out_count": np.bincount(side_groups[to_bridge], minlength=group_count),
+            "bridge_hold_seconds": hold_seconds,
+        }
+
+    @staticmethod
+    def _token_features(
+        table: TransactionTable,
+        side_rows: np.ndarray,
+        side_groups: np.ndarray,
+        side_is_out: np.ndarray,
+        side_timestamps: np.ndarray,
+        side_amounts: np.ndarray,
+        side_minted: np.ndarray,
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+        token_count = max(len(table.tokens), 1)
+        pair_keys, pairs = np.unique(side_groups * token_count + table.token_ids[side_rows], return_inverse=True)
+        pair_count = len(pair_keys)
+
+        in_amount = np.bincount(pairs, weights=np.where(side_is_out, 0.0, side_amounts), minlength=pair_count)
+        out_amount = np.bincount(pairs, weights=np.where(side_is_out, side_amounts, 0.0), minlength=pair_count)
+        minted_amount = np.bincount(pairs, weights=np.where(side_minted, side_amounts, 0.0), minlength=pair_count)
+        first_in = np.full(pair_count, np.inf)
+        np.minimum.at(first_in, pairs[~side_is_out], side_timestamps[~side_is_out])
+        last_out = np.full(pair_count, -np.inf)
+        np.maximum.at(last_out, pairs[side_is_out], side_timestamps[side_is_out])
+
+        sent_after = last_out >= first_in
+        dump_seconds = np.where(sent_after, last_out - np.where(sent_after, first_in, 0), np.inf)
+        out_ratio = np.divide(out_amount, in_amount, out=np.zeros(pair_count), where=in_amount > 0)
+        features = {
+            "in_amount": in_amount,
+            "minted_amount": minted_amount,
+            "out_amount": out_amount,
+            "out_ratio": out_ratio,
+            "dump_seconds": dump_seconds,
+        }
+        return features, pair_keys // token_count, pair_keys % token_count
+
+class PatternRule:
+    """A compiled declarative rule."""
+
+    def __init__(self, name: str, spec: Mapping[str, Any]) -> None:
+        self.name = name
+        self.scope = spec.get("scope", "address")
+        known = {"address": ADDRESS_FEATURES, "token": TOKEN_FEATURES}.get(self.scope)
+        if known is None:
+            raise ValueError(f"Rule {name} has unknown scope {self.scope!r}")
+
+        self.conditions = []
+        for feature, operator, threshold in spec["all"]:
+            if feature not in known:
+                raise ValueError(f"Rule {name} uses unknown {self.scope} feature {feature!r}")
+            if operator not in _OPERATORS:
+                raise ValueError(f"Rule {name} uses unknown operator {operator!r}")
+            self.conditions.append((feature, _OPERATORS[operator], threshold))
+        self.features = list(dict.fromkeys(feature for feature, _, _ in self.conditions))
+
+    def evaluate(self, features: PatternFeatures) -> np.ndarray:
+        """
+        Evaluate the rule for every address of a batch.
+
+        Args:
+            features: Features of the batch
+
+        Returns:
+            For token rules, a boolean array per (address, token) pair;
+            otherwise a boolean array per address
+        """
+        values = features.token if self.scope == "token" else features.address
+        size = len(features.token_groups) if self.scope == "token" else features.group_count
+        matched = np.ones(size, dtype=bool)
+        for feature, compare, threshold in self.conditions:
+            matched &= compare(values[feature], threshold)
+        return matched
+
+class RuleEngine:
+    """A set of compiled rules evaluated together over a batch of addresses."""
+
+    def __init__(self, rules: Mapping[str, Mapping[str, Any]]) -> None:
+        self.rules = [PatternRule(name, spec) for name, spec in rules.items()]
+
+    def evaluate(self, features: PatternFeatures) -> List[List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Find the rules each address of a batch matches.
+
+        Args:
+            features: Features of the batch
+
+        Returns:
+            For each address, a list of (rule name, evidence) pairs in rule
+            order; evidence holds the values of the features the rule tests,
+            per matching token for token rules
+        """
+        matches: List[List[Tuple[str, Dict[str, Any]]]] = [[] for _ in range(features.group_count)]
+        for rule in self.rules:
+            matched = rule.evaluate(features)
+            if rule.scope == "token":
+                tokens: Dict[int, List[Dict[str, Any]]] = {}
+                for pair in np.flatnonzero(matched).tolist():
+                    tokens.setdefault(int(features.token_groups[pair]), []).append({
+                        "token": features.token_symbols[pair],
+                        **{feature: _plain(features.token[feature][pair]) for feature in rule.features}
+                    })
+                for group, evidence in tokens.items():
+                    matches[group].append((rule.name, {"tokens": evidence}))
+            else:
+                for group in np.flatnonzero(matched).tolist():
+                    matches[group].append((rule.name, {
+                        feature: _plain(features.address[feature][group]) for feature in rule.features
+                    }))
+        return matches
+
+def address_ids(table: TransactionTable, addresses: Sequence[str]) -> List[int]:
+    """
+    Look up the table address IDs of a batch of addresses.
+
+    Args:
+        table: The transaction table
+        addresses: The addresses
+
+    Returns:
+        One address ID per address, -1 for addresses without transactions
+    """
+    found = [table.find_address_id(address) for address in addresses]
+    return [-1 if address_id is None else address_id for address_id in found]
+
+def _plain(value: Any) -> Any:
+    value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+# Compile the rules
+behavioral_rule_engine = RuleEngine(BEHAVIORAL_RULES)
+transaction_rule_engine = RuleEngine(TRANSACTION_RULES)
@@ -0,0 +1,310 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""SQLite-backed persistent tier of the result cache."""
+
+import atexit
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from blockchain_security import config
+
+# Most addresses bound into one SELECT
+_MAX_LOOKUP_PARAMETERS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    namespace TEXT NOT NULL,
+    address TEXT NOT NULL,
+    data_version TEXT NOT NULL,
+    scoring_version TEXT NOT NULL,
+    created REAL NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (namespace, data_version, scoring_version, address)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_created ON results (created);
+"""
+
+class PersistentResultStore:
+    """
+    Tool results persisted in an SQLite database.
+
+    Results are keyed on namespace, address, dataset version and scoring
+    version, which by default covers config.SCORING_VERSION and the
+    config.TOOL_OUTPUT_* bounds the results were trimmed to. They survive
+    restarts and are shared by every worker process using the same file.
+    The database runs in write-ahead logging mode, letting readers in any
+    process proceed while one writer commits.
+
+    Writes are buffered and committed in batches, once
+    config.PERSISTENT_CACHE_WRITE_BATCH results are waiting or by a
+    background thread every config.PERSISTENT_CACHE_FLUSH_SECONDS. The same
+    thread deletes results older than the time-to-live every
+    config.PERSISTENT_CACHE_SWEEP_SECONDS; older results are never served in
+    the meantime.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[float] = None,
+        scoring_version: Optional[str] = None,
+        write_batch: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        sweep_seconds: Optional[float] = None,
+        clock=time.time,
+    ) -> None:
+        """
+        Args:
+            path: SQLite database file, created if missing
+            ttl_seconds: Result lifetime, defaulting to config.PERSISTENT_CACHE_TTL_SECONDS
+            scoring_version: Version of the scoring logic, defaulting to
+                default_scoring_version() at the time of each read and write
+            write_batch: Buffered results that trigger a commit, defaulting to
+                config.PERSISTENT_CACHE_WRITE_BATCH
+            flush_seconds: Background commit interval, defaulting to
+                config.PERSISTENT_CACHE_FLUSH_SECONDS
+            sweep_seconds: Background expiry sweep interval, defaulting to
+                config.PERSISTENT_CACHE_SWEEP_SECONDS
+            clock: Wall-clock time function, shared across processes
+        """
+        self.path = path
+        self.ttl_seconds = config.PERSISTENT_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._scoring_version = scoring_version
+        self.write_batch = write_batch or config.PERSISTENT_CACHE_WRITE_BATCH
+        self.flush_seconds = config.PERSISTENT_CACHE_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self.sweep_seconds = config.PERSISTENT_CACHE_SWEEP_SECONDS if sweep_seconds is None else sweep_seconds
+        self._clock = clock
+        self._local = threading.local()
+        self._pending: Dict[Tuple[str, str, str], Tuple[str, str, str, str, float, bytes]] = {}
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.expired = 0
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+
+        self._closed = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="persistent-result-store", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    @property
+    def scoring_version(self) -> str:
+        """Scoring version results are currently read and written under."""
+        return default_scoring_version() if self._scoring_version is None else self._scoring_version
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared across threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get_many(self, namespace: str, data_version: str, addresses: List[str]) -> Dict[str, Any]:
+        """
+        Read the stored results of a batch of addresses.
+
+        Args:
+            namespace: Name of the cached function
+            data_version: Dataset version the results were computed from
+            addresses: The blockchain addresses
+
+        Returns:
+            Mapping of address to result for the addresses with a live result
+        """
+        connection = self._connection()
+        oldest = self._clock() - self.ttl_seconds
+        scoring_version = self.scoring_version
+        found: Dict[str, Any] = {}
+        # Results still waiting to be written are served from the queue
+        with self._pending_lock:
+            for address in addresses:
+                row = self._pending.get((namespace, address, data_version))
+                if row is not None and row[3] == scoring_version and row[4] > oldest:
+                    found[address] = pickle.loads(row[5])
+        remaining = [address for address in addresses if address not in found]
+        for start in range(0, len(remaining), _MAX_LOOKUP_PARAMETERS):
+            chunk = remaining[start:start + _MAX_LOOKUP_PARAMETERS]
+            rows = connection.execute(
+                "SELECT address, payload FROM results"
+                " WHERE namespace = ? AND data_version = ? AND scoring_version = ? AND created > ?"
+                f" AND address IN ({', '.join('?' * len(chunk))})",
+                (namespace, data_version, scoring_version, oldest, *chunk),
+            ).fetchall()
+            for address, payload in rows:
+                found[address] = pickle.loads(payload)
+        with self._pending_lock:
+            self.hits += len(found)
+            self.misses += len(addresses) - len(found)
+        return found
+
+    def put_many(self, namespace: str, data_version: str, results: Iterable[Tuple[str, Any]]) -> None:
+        """
+        Queue results to be written in the next batch.
+
+        Args:
+            namespace: Name of the cached function
+            data_version: Dataset version the results were computed from
+            results: (address, result) pairs
+        """
+        now = self._clock()
+        scoring_version = self.scoring_version
+        rows = {
+            (namespace, address, data_version): (
+                namespace, address, data_version, scoring_version, now,
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+            for address, value in results
+        }
+        with self._pending_lock:
+            self._pending.update(rows)
+            full = len(self._pending) >= self.write_batch
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit every queued result in one transaction."""
+        with self._pending_lock:
+            rows, self._pending = list(self._pending.values()), {}
+        if not rows:
+            return
+        with self._write_lock:
+            connection = self._connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO results"
+                    " (namespace, address, data_version, scoring_version, created, payload)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            self.writes += len(rows)
+
+    def sweep(self) -> int:
+        """
+        Delete results older than the time-to-live.
+
+        Returns:
+            Number of results deleted
+        """
+        with self._write_lock:
+            deleted = self._connection().execute(
+                "DELETE FROM results WHERE created <= ?", (self._clock() - self.ttl_seconds,)
+            ).rowcount
+            self.expired += deleted
+        return deleted
+
+    def _run(self) -> None:
+        next_sweep = time.monotonic()
+        while not self._closed.wait(self.flush_seconds):
+            try:
+                self.flush()
+                if time.monotonic() >= next_sweep:
+                    self.sweep()
+                    next_sweep = time.monotonic() + self.sweep_seconds
+            except sqlite3.Error:
+                pass  # Retried on the next round, e.g. when another process held the lock too long
+
+    def clear(self) -> None:
+        """Drop every stored result and reset the counters."""
+        with self._pending_lock:
+            self._pending = {}
+            self.hits = self.misses = 0
+        with self._write_lock:
+            self._connection().execute("DELETE FROM results")
+            self.writes = self.expired = 0
+
+    def close(self) -> None:
+        """Commit queued results and stop the background thread."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._worker.join()
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit, miss and write counters.
+
+        Returns:
+            Dictionary with the database path, counters and queued writes
+        """
+        with self._pending_lock:
+            pending = len(self._pending)
+            hits, misses = self.hits, self.misses
+        return {
+            "path": self.path,
+            "scoring_version": self.scoring_version,
+            "hits": hits,
+            "misses": misses,
+            "writes": self.writes,
+            "pending_writes": pending,
+            "expired": self.expired,
+        }
+
+def default_scoring_version() -> str:
+    """
+    Get the scoring version of results computed with the current settings.
+
+    Combines config.SCORING_VERSION with the config.TOOL_OUTPUT_* bounds,
+    since tool responses such as classify_risk are trimmed to them before
+    they are stored.
+
+    Returns:
+        The scoring version
+    """
+    return ":".join(str(part) for part in (
+        config.SCORING_VERSION,
+        config.TOOL_OUTPUT_TOKEN_BUDGET,
+        config.TOOL_OUTPUT_MAX_ROWS,
+        config.TOOL_OUTPUT_MAX_DETAILS,
+        config.TOOL_OUTPUT_TOP_COUNTERPARTIES,
+        config.TOOL_OUTPUT_CHARS_PER_TOKEN,
+    ))
+
+def get_persistent_store() -> Optional[PersistentResultStore]:
+    """
+    Get the persistent store at config.PERSISTENT_CACHE_PATH, opening it on first use.
+
+    Returns:
+        The PersistentResultStore, or None when no path is configured
+    """
+    global _persistent_store, _persistent_store_path
+    with _persistent_store_lock:
+        if _persistent_store_path != config.PERSISTENT_CACHE_PATH:
+            if _persistent_store is not None:
+                _persistent_store.close()
+            _persistent_store = (
+                PersistentResultStore(config.PERSISTENT_CACHE_PATH) if config.PERSISTENT_CACHE_PATH else None
+            )
+            _persistent_store_path = config.PERSISTENT_CACHE_PATH
+        return _persistent_store
+
+_persistent_store: Optional[PersistentResultStore] = None
+_persistent_store_path: Optional[str] = None
+_persistent_store_lock = threading.Lock()
@@ -0,0 +1,379 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Remote data source backed by the blockchain data REST API.
+
+The API takes batches of addresses and answers with one result per address:
+
+    POST {BLOCKCHAIN_API_BASE_URL}/transactions  {"addresses": [...]}
+        -> {"results": {address: [transaction with "hash", ...]}}
+    POST {BLOCKCHAIN_API_BASE_URL}/wallets       {"addresses": [...]}
+        -> {"results": {address: wallet record or null}}
+    POST {BLOCKCHAIN_API_BASE_URL}/labels        {"addresses": [...]}
+        -> {"results": {address: scam label record or null}}
+
+BlockchainAPIClient is the asyncio client: one pooled keep-alive HTTP
+client, a cap on concurrent requests, per-endpoint micro-batching of
+addresses and coalescing of identical in-flight lookups. RemoteDataSource
+wraps it as a DataSource, fetching what the tools need about a batch of
+addresses on first use and folding it into local stores, so the tools run
+unchanged against it. tools/api_stub.py serves the same API locally.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+from blockchain_security import config
+from .data_source import DataSource
+from .ingest import valid_record
+from .label_store import BloomFilter, LabelStore
+from .transaction_store import TransactionStore
+
+ENDPOINTS = ("transactions", "wallets", "labels")
+
+# Expected number of labels fetched, for sizing the label Bloom filter
+_LABEL_CAPACITY = 100000
+
+class BlockchainAPIClient:
+    """
+    Asyncio client for the blockchain data API.
+
+    Lookups of single addresses are queued per endpoint and sent together
+    as one request once batch_size addresses are waiting or
+    batch_window_seconds has passed. A lookup that matches one already in
+    flight awaits the same result instead of being sent again.
+
+    Attributes:
+        stats: Counts of lookups, coalesced lookups, requests sent and
+            addresses sent
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_window_seconds: Optional[float] = None,
+        timeout_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            base_url: API root, defaulting to config.BLOCKCHAIN_API_BASE_URL
+            api_key: API key, defaulting to config.BLOCKCHAIN_API_KEY
+            max_connections: Pooled keep-alive connections, defaulting to
+                config.BLOCKCHAIN_API_MAX_CONNECTIONS
+            max_concurrency: Requests in flight at once, defaulting to
+                config.BLOCKCHAIN_API_MAX_CONCURRENCY
+            batch_size: Most addresses per request, defaulting to
+                config.BLOCKCHAIN_API_BATCH_SIZE
+            batch_window_seconds: How long a lookup waits for others to
+                batch with, defaulting to config.BLOCKCHAIN_API_BATCH_WINDOW_SECONDS
+            timeout_seconds: Request timeout, defaulting to config.BLOCKCHAIN_API_TIMEOUT_SECONDS
+        """
+        self.base_url = (base_url or config.BLOCKCHAIN_API_BASE_URL).rstrip("/")
+        max_connections = max_connections or config.BLOCKCHAIN_API_MAX_CONNECTIONS
+        self.batch_size = batch_size or config.BLOCKCHAIN_API_BATCH_SIZE
+        self.batch_window_seconds = (
+            config.BLOCKCHAIN_API_BATCH_WINDOW_SECONDS if batch_window_seconds is None else batch_window_seconds
+        )
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {api_key or config.BLOCKCHAIN_API_KEY}"},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout_seconds or config.BLOCKCHAIN_API_TIMEOUT_SECONDS,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency or config.BLOCKCHAIN_API_MAX_CONCURRENCY)
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._queued: Dict[str, List[str]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._requests: Set[asyncio.Task] = set()
+        self.stats = {"lookups": 0, "coalesced": 0, "requests": 0, "addresses_sent": 0}
+
+    async def __aenter__(self) -> "BlockchainAPIClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Wait for queued lookups to finish and close the pooled connections."""
+        for endpoint in list(self._queued):
+            self._flush(endpoint)
+        if self._requests:
+            await asyncio.gather(*self._requests, return_exceptions=True)
+        await self._client.aclose()
+
+    async def fetch(self, endpoint: str, address: str) -> Any:
+        """
+        Look up one address on an endpoint.
+
+        Args:
+            endpoint: One of ENDPOINTS
+            address: The blockchain address
+
+        Returns:
+            The endpoint's result for the address
+        """
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {endpoint!r}; expected one of {', '.join(ENDPOINTS)}")
+        self.stats["lookups"] += 1
+        key = (endpoint, address)
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = self._in_flight[key] = loop.create_future()
+        queue = self._queued.setdefault(endpoint, [])
+        queue.append(address)
+        if len(queue) >= self.batch_size:
+            self._flush(endpoint)
+        elif endpoint not in self._timers:
+            self._timers[endpoint] = loop.call_later(self.batch_window_seconds, self._flush, endpoint)
+        return await asyncio.shield(future)
+
+    async def fetch_many(self, endpoint: str, addresses: Iterable[str]) -> Dict[str, Any]:
+        """
+        Look up several addresses on an endpoint.
+
+        Args:
+            endpoint: One of ENDPOINTS
+            addresses: The blockchain addresses
+
+        Returns:
+            Mapping of address to the endpoint's result
+        """
+        addresses = list(dict.fromkeys(addresses))
+        results = await asyncio.gather(*(self.fetch(endpoint, address) for address in addresses))
+        return dict(zip(addresses, results))
+
+    def _flush(self, endpoint: str) -> None:
+        timer = self._timers.pop(endpoint, None)
+        if timer is not None:
+            timer.cancel()
+        addresses = self._queued.pop(endpoint, None)
+        if not addresses:
+            return
+        task = asyncio.ensure_future(self._request(endpoint, addresses))
+        self._requests.add(task)
+        task.add_done_callback(self._requests.discard)
+
+    async def _request(self, endpoint: str, addresses: List[str]) -> None:
+        try:
+            async with self._semaphore:
+                self.stats["requests"] += 1
+                self.stats["addresses_sent"] += len(addresses)
+                response = await self._client.post(f"/{endpoint}", json={"addresses": addresses})
+                response.raise_for_status()
+                results = response.json()["results"]
+        except Exception as error:
+            for address in addresses:
+                future = self._in_flight.pop((endpoint, address))
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for address in addresses:
+            future = self._in_flight.pop((endpoint, address))
+            if not future.done():
+                future.set_result(results.get(address))
+
+class RemoteDataSource(DataSource):
+    """
+    DataSource that fetches from the blockchain data API on demand.
+
+    prepare() fetches the transactions and wallet records of addresses not
+    seen before, and the scam labels of those addresses, their
+    counterparties and their wallet-linked addresses, and adds them to
+    local stores through add_transactions, add_wallet and add_label. The
+    tools then answer from the local stores as with the static sources.
+    Fetched data, including the absence of a label or wallet, is kept for
+    the life of the source. Transactions the API returns without a hash,
+    sender, recipient or parseable timestamp are left out and counted in
+    skipped.
+
+    Labels are fetched one hop out from the prepared addresses only, so
+    scam proximity further out sees the labels and links of addresses
+    prepared earlier, but not of the rest of the remote data.
+
+    Fetching stands in for reading data the source already has, so it does
+    not change data_version: results and cursors for addresses prepared
+    earlier stay valid. Each address's fetched data is versioned by its
+    content instead, through address_version.
+
+    The asyncio client runs on a private event loop thread, so prepare()
+    can be called from synchronous tool code, including tool code running
+    inside another event loop.
+    """
+
+    def __init__(self, client_options: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Args:
+            client_options: Keyword arguments for BlockchainAPIClient
+        """
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="blockchain-api", daemon=True)
+        self._thread.start()
+        self.client = self._run(self._create_client(client_options or {}))
+        super().__init__(
+            TransactionStore(),
+            {},
+            LabelStore({}, BloomFilter.with_capacity(_LABEL_CAPACITY)),
+            version=f"remote:{self.client.base_url}",
+        )
+        self._lock = threading.Lock()
+        self._fetched: Set[str] = set()
+        self._label_checked: Set[str] = set()
+        self._fetch_revisions = 0
+        self._address_digests: Dict[str, str] = {}
+        self.skipped = 0
+
+    @staticmethod
+    async def _create_client(client_options: Dict[str, Any]) -> BlockchainAPIClient:
+        return BlockchainAPIClient(**client_options)
+
+    def _run(self, coroutine: Any) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    @property
+    def data_version(self) -> Tuple[Any, ...]:
+        """
+        Key identifying the current state of the data, for result caching.
+
+        Changed only by data added through add_transactions, add_wallet and
+        add_label outside prepare().
+        """
+        return (id(self), self.version, self.revision - self._fetch_revisions)
+
+    def address_version(self, address: str) -> str:
+        """
+        Key identifying the data about one address across processes and restarts.
+
+        Combines persistent_version with a digest of the transactions,
+        wallet record and labels fetched for the address, so it does not
+        depend on what else was fetched or in what order.
+
+        Args:
+            address: The blockchain address
+
+        Returns:
+            The version key
+        """
+        return f"{self.persistent_version}:{self._address_digests.get(address, '')}"
+
+    def prepare(self, addresses: Iterable[str]) -> None:
+        """
+        Fetch whatever the tools need about addresses not fetched before.
+
+        Fetches the addresses' transactions and wallet records, and the
+        labels of the addresses and of their counterparties and
+        wallet-linked addresses.
+
+        Args:
+            addresses: The blockchain addresses about to be analyzed
+        """
+        missing = [address for address in dict.fromkeys(addresses) if address not in self._fetched]
+        if not missing:
+            return
+        # Fetch outside the lock, so concurrent callers' identical lookups
+        # are coalesced by the client
+        transactions, wallets, labels, skipped = self._run(self._fetch(missing))
+        with self._lock:
+            # Another caller may have added some of the addresses meanwhile
+            missing = [address for address in missing if address not in self._fetched]
+            if not missing:
+                return
+            revision = self.revision
+            self.add_transactions(
+                (transaction["hash"], {field: value for field, value in transaction.items() if field != "hash"})
+                for address in missing
+                for transaction in transactions[address]
+            )
+            for address in missing:
+                if wallets[address] is not None:
+                    self.add_wallet(address, wallets[address])
+            for address, record in labels.items():
+                if record is not None and address not in self._label_checked:
+                    self.add_label(address, record)
+            self._fetched.update(missing)
+            self._label_checked.update(labels)
+            self._fetch_revisions += self.revision - revision
+            self.skipped += sum(skipped[address] for address in missing)
+            for address in missing:
+                self._address_digests[address] = self._digest(address, transactions[address], wallets[address])
+
+    def _digest(
+        self, address: str, transactions: List[Dict[str, Any]], wallet_data: Optional[Dict[str, Any]]
+    ) -> str:
+        related = {address}
+        for transaction in transactions:
+            related.update((transaction["from"], transaction["to"]))
+        related.update((wallet_data or {}).get("connected_addresses", []))
+        content = {
+            "transactions": sorted(transactions, key=lambda transaction: transaction["hash"]),
+            "wallet": wallet_data,
+            "labels": {other: self.scam_addresses.get(other) for other in sorted(related)},
+        }
+        return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+    async def _fetch(
+        self, addresses: List[str]
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Any], Dict[str, Any], Dict[str, int]]:
+        fetched, wallets = await asyncio.gather(
+            self.client.fetch_many("transactions", addresses),
+            self.client.fetch_many("wallets", addresses),
+        )
+        transactions = {}
+        skipped = {}
+        for address, address_transactions in fetched.items():
+            address_transactions = address_transactions or []
+            transactions[address] = [
+                transaction for transaction in address_transactions
+                if isinstance(transaction, dict) and valid_record((transaction.get("hash"), transaction))
+            ]
+            skipped[address] = len(address_transactions) - len(transactions[address])
+        related = set(addresses)
+        for address_transactions in transactions.values():
+            for transaction in address_transactions:
+                related.update((transaction["from"], transaction["to"]))
+        for wallet_data in wallets.values():
+            if wallet_data is not None:
+                related.update(wallet_data.get("connected_addresses", []))
+        related.discard("")
+        labels = await self.client.fetch_many("labels", sorted(related - self._label_checked))
+        return transactions, wallets, labels, skipped
+
+    def close(self) -> None:
+        """Close the client and stop its event loop thread."""
+        self._run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+def remote_source() -> RemoteDataSource:
+    """
+    Build a data source over the configured blockchain data API.
+
+    Returns:
+        RemoteDataSource reading from config.BLOCKCHAIN_API_BASE_URL
+    """
+    return RemoteDataSource()
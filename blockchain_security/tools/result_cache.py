@@ -0,0 +1,223 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Versioned LRU result cache for the blockchain security tools."""
+
+import functools
+import inspect
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, List, Optional, Tuple
+
+from blockchain_security import config
+from .data_source import DataSource, get_data_source
+from .persistent_cache import get_persistent_store
+from .single_flight import address_only_call, single_flight
+
+class ResultCache:
+    """
+    Least-recently-used cache of tool results with a time-to-live.
+
+    Entries are keyed on (namespace, address, data version), so a result
+    computed before new transactions, wallets or labels were added is never
+    served afterwards; stale entries simply age out of the LRU order. Values
+    are stored pickled, which keeps them compact and means every hit returns
+    a fresh copy that callers may modify freely.
+
+    Misses in the namespaces listed in config.PERSISTENT_CACHE_NAMESPACES
+    are next looked up in the persistent store, when one is configured, and
+    results computed for them are written back to it. Remaining misses go
+    through the single-flight group, so concurrent requests for the same
+    uncached result wait for one computation instead of repeating it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._namespace_counts: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Tuple[str, str, Hashable], now: float) -> Tuple[bool, Any]:
+        with self._lock:
+            counts = self._namespace_counts.setdefault(key[0], [0, 0])
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                counts[1] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            counts[0] += 1
+        return True, pickle.loads(entry[1])
+
+    def _store(self, key: Tuple[str, str, Hashable], value: Any, now: float) -> None:
+        if self.max_entries <= 0:
+            return
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries[key] = (now, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_many(
+        self,
+        namespace: str,
+        addresses: List[str],
+        compute_many: Callable[[List[str]], List[Any]],
+        source: Optional[DataSource] = None,
+    ) -> List[Any]:
+        """
+        Get cached results for a batch of addresses, computing the misses in one call.
+
+        Args:
+            namespace: Name of the cached function
+            addresses: The blockchain addresses to get results for
+            compute_many: Batch function returning one result per address
+            source: DataSource the results are computed from, defaulting to
+                the one get_data_source returns; results are keyed on its version
+
+        Returns:
+            One result per address, in input order
+        """
+        if source is None:
+            source = get_data_source()
+        version = source.data_version
+        now = self._clock()
+        results: Dict[str, Any] = {}
+        missing = []
+        for address in dict.fromkeys(addresses):
+            found, value = self._lookup((namespace, address, version), now)
+            if found:
+                results[address] = value
+            else:
+                missing.append(address)
+
+        persistent = get_persistent_store() if namespace in config.PERSISTENT_CACHE_NAMESPACES else None
+        if missing and persistent is not None:
+            # Remote sources version each address's data separately, from
+            # the data fetched for it
+            source.prepare(missing)
+            by_version: Dict[str, List[str]] = {}
+            for address in missing:
+                by_version.setdefault(source.address_version(address), []).append(address)
+            stored = {}
+            for persistent_version, version_addresses in by_version.items():
+                stored.update(persistent.get_many(namespace, persistent_version, version_addresses))
+            for address, value in stored.items():
+                self._store((namespace, address, version), value, now)
+                results[address] = value
+            missing = [address for address in missing if address not in stored]
+
+        if missing:
+            def compute_and_store(led_addresses: List[str]) -> List[Any]:
+                values = compute_many(led_addresses)
+                for address, value in zip(led_addresses, values):
+                    self._store((namespace, address, version), value, now)
+                if persistent is not None:
+                    by_version: Dict[str, List[Tuple[str, Any]]] = {}
+                    for address, value in zip(led_addresses, values):
+                        by_version.setdefault(source.address_version(address), []).append((address, value))
+                    for persistent_version, items in by_version.items():
+                        persistent.put_many(namespace, persistent_version, items)
+                return values
+            
+            results.update(zip(missing, single_flight.do_many(namespace, version, missing, compute_and_store)))
+        return [results[address] for address in addresses]
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+            self._namespace_counts = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit and miss counters for sizing the cache.
+
+        Returns:
+            Dictionary with entry count, limits, overall counters, hit rate
+            and per-namespace hits and misses, plus the persistent store's
+            counters when one is configured
+        """
+        persistent = get_persistent_store()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "persistent": persistent.stats() if persistent is not None else None,
+                "namespaces": {
+                    namespace: {"hits": hits, "misses": misses}
+                    for namespace, (hits, misses) in self._namespace_counts.items()
+                },
+            }
+
+def cached_tool(namespace: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Cache the results of a tool function taking an address first.
+
+    Calls with only an address go through result_cache.get_many, and so
+    through the persistent store and single-flight group as well. The
+    wrapped function keeps its name, docstring and signature, so it can be
+    registered as an agent tool as before.
+
+    Args:
+        namespace: Name the results are cached under
+
+    Returns:
+        Decorator for the tool function
+    """
+    def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            address = address_only_call(signature, args, kwargs)
+            if address is None:
+                return function(*args, **kwargs)
+            return result_cache.get_many(namespace, [address], lambda missing: [function(address)])[0]
+        return wrapper
+    return decorator
+
+# Initialize the cache
+result_cache = ResultCache(config.RESULT_CACHE_MAX_ENTRIES, config.RESULT_CACHE_TTL_SECONDS)
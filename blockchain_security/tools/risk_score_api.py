@@ -14,9 +14,15 @@
 
 """Risk score API tool for blockchain security."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
 from . import blockchain_data
 from .address_lookup import address_lookup_tool
+from .data_source import DataSource, get_data_source, prepared_source
+from .pattern_rules import PatternFeatures, behavioral_rule_engine
+from .result_cache import result_cache
 from .transaction_data import transaction_data_tool
 
 class RiskScoreAPI:
@@ -33,9 +39,63 @@ class RiskScoreAPI:
         Returns:
             Dictionary with risk score and justification
         """
-        # Check if address is a known scammer
-        scam_status = address_lookup_tool.check_scam_status(address)
+        return RiskScoreAPI.get_risk_scores([address])[0]
+    
+    @staticmethod
+    def get_risk_scores(addresses: List[str]) -> List[Dict[str, Any]]:
+        """
+        Calculate risk scores for a batch of addresses.
+        
+        Scam status is checked for the whole batch at once, and transaction
+        patterns are analyzed in one batch for the addresses that are neither
+        known nor connected scammers. Results are served from the versioned
+        result cache where possible.
         
+        Args:
+            addresses: The blockchain addresses to analyze
+            
+        Returns:
+            One get_risk_score result per address, in input order
+        """
+        prepared_source(addresses)
+        return result_cache.get_many("get_risk_score", addresses, RiskScoreAPI._get_risk_scores)
+    
+    @staticmethod
+    def _get_risk_scores(addresses: List[str]) -> List[Dict[str, Any]]:
+        source = get_data_source()
+        unique_addresses = list(dict.fromkeys(addresses))
+        scam_statuses = dict(zip(unique_addresses, address_lookup_tool.check_scam_status_many(unique_addresses)))
+        
+        # Only addresses without a scam verdict need their transactions analyzed
+        unresolved = [
+            address for address in unique_addresses
+            if RiskScoreAPI._needs_transaction_analysis(scam_statuses[address])
+        ]
+        transaction_analyses = dict(zip(unresolved, transaction_data_tool.analyze_transaction_patterns_many(unresolved)))
+        
+        results = {
+            address: RiskScoreAPI._build_risk_score(
+                address,
+                scam_statuses[address],
+                transaction_analyses.get(address),
+                source.wallets.get(address, {})
+            )
+            for address in unique_addresses
+        }
+        return [results[address] for address in addresses]
+    
+    @staticmethod
+    def _needs_transaction_analysis(scam_status: Dict[str, Any]) -> bool:
+        return not scam_status.get("is_scam", False) and not scam_status.get("is_connected_to_scam", False)
+    
+    @staticmethod
+    def _build_risk_score(
+        address: str,
+        scam_status: Dict[str, Any],
+        transaction_analysis: Optional[Dict[str, Any]],
+        wallet_data: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        # Check if address is a known scammer
         if scam_status.get("is_scam", False):
             return {
                 "address": address,
@@ -59,8 +119,6 @@ class RiskScoreAPI:
             }
         
         # Check for suspicious transaction patterns
-        transaction_analysis = transaction_data_tool.analyze_transaction_patterns(address)
-        
         risk_factors = []
         max_risk_score = 0.0
         
@@ -72,9 +130,6 @@ class RiskScoreAPI:
             })
             max_risk_score = max(max_risk_score, pattern["risk_score"])
         
-        # Check wallet behavioral patterns
-        wallet_data = address_lookup_tool.get_address_details(address).get("wallet_data", {})
-        
         # If we have the wallet in our sample data, use its risk score
         if wallet_data:
             wallet_risk_score = wallet_data.get("risk_score", 0.0)
@@ -122,33 +177,64 @@ class RiskScoreAPI:
         Returns:
             Dictionary with behavior analysis
         """
-        # Get transaction data
-        transactions = transaction_data_tool.get_transactions_by_address(address)
-        
-        # Check for patterns in our behavioral database
-        detected_patterns = []
-        
-        # Example pattern check: excessive minting
-        # In a real implementation, this would analyze actual transaction data
-        # For this simulation, we'll randomly assign some patterns based on address
-        if address.startswith("0x2222"):
-            detected_patterns.append({
-                "pattern": "dump_cycle",
-                **blockchain_data.WALLET_BEHAVIORAL_PATTERNS["dump_cycle"]
-            })
+        return RiskScoreAPI.analyze_behavioral_patterns_many([address])[0]
+    
+    @staticmethod
+    def analyze_behavioral_patterns_many(addresses: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze behavioral patterns for a batch of addresses.
         
-        if address.startswith("0x3333"):
-            detected_patterns.append({
-                "pattern": "excessive_minting",
-                **blockchain_data.WALLET_BEHAVIORAL_PATTERNS["excessive_minting"]
-            })
+        Results are served from the versioned result cache where possible.
         
-        return {
-            "address": address,
-            "transaction_count": len(transactions),
-            "detected_patterns": detected_patterns,
-            "risk_assessment": len(detected_patterns) > 0
-        }
+        Args:
+            addresses: The blockchain addresses to analyze
+            
+        Returns:
+            One analyze_behavioral_patterns result per address, in input order
+        """
+        prepared_source(addresses)
+        return result_cache.get_many(
+            "analyze_behavioral_patterns", addresses, RiskScoreAPI._analyze_behavioral_patterns_many
+        )
+    
+    @staticmethod
+    def _analyze_behavioral_patterns_many(
+        addresses: List[str],
+        row_groups: Optional[List[np.ndarray]] = None,
+        source: Optional[DataSource] = None,
+    ) -> List[Dict[str, Any]]:
+        # Callers that already hold the rows of distinct addresses can pass
+        # them as row_groups, and the DataSource they read them from as source
+        transactions = (source if source is not None else get_data_source()).transactions
+        unique_addresses = list(dict.fromkeys(addresses))
+        if row_groups is None:
+            # Get transaction rows without materializing them
+            row_groups = [transactions.rows_for_address(address) for address in unique_addresses]
+        
+        # Evaluate the declarative pattern rules over the whole batch
+        rule_matches = behavioral_rule_engine.evaluate(
+            PatternFeatures.for_row_groups(transactions.table, row_groups, unique_addresses)
+        )
+        
+        results = {}
+        for group, address in enumerate(unique_addresses):
+            detected_patterns = [
+                {
+                    "pattern": pattern,
+                    **blockchain_data.WALLET_BEHAVIORAL_PATTERNS[pattern],
+                    "details": evidence
+                }
+                for pattern, evidence in rule_matches[group]
+            ]
+            
+            results[address] = {
+                "address": address,
+                "transaction_count": len(row_groups[group]),
+                "detected_patterns": detected_patterns,
+                "risk_assessment": len(detected_patterns) > 0
+            }
+        
+        return [results[address] for address in addresses]
 
 # Initialize the tool
 risk_score_api = RiskScoreAPI()
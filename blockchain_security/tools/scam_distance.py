@@ -0,0 +1,203 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Materialized hop distance from every address to the nearest known scam address."""
+
+from collections import deque
+from collections.abc import Mapping
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from .address_graph import AddressGraph, reverse_kinds
+
+_UNREACHED = -1
+
+class ScamDistanceIndex:
+    """
+    Hop distance and nearest scam source for every address in the graph.
+
+    Built with one multi-source BFS from all labelled addresses, up to
+    max_hops. The BFS walks edges backwards, so a node's distance is the
+    length of the shortest path from it to a scam address over edge_kinds
+    edges: with EDGE_WALLET_LINK, a wallet is one hop from the scam
+    addresses in its own connected_addresses, not from scam wallets that
+    list it. Each reached node stores its distance, the labelled node it is
+    closest to and its parent on the way there, so a proximity query is an
+    array lookup plus a walk of at most max_hops parents. When several scam
+    addresses are equally close, the one that comes first in label order
+    wins.
+
+    New labels and new edges are folded in incrementally by relaxing only
+    the nodes whose distance improves; nothing is rebuilt.
+    """
+
+    def __init__(self, graph: AddressGraph, labels: Mapping, edge_kinds: int, max_hops: int) -> None:
+        self.graph = graph
+        self.labels = labels
+        self.edge_kinds = edge_kinds
+        self.max_hops = max_hops
+        self._reverse_kinds = reverse_kinds(edge_kinds)
+        self.distance = np.full(len(graph), _UNREACHED, dtype=np.int32)
+        self.nearest = np.full(len(graph), _UNREACHED, dtype=np.int64)
+        self.parent = np.full(len(graph), _UNREACHED, dtype=np.int64)
+
+    @classmethod
+    def build(cls, graph: AddressGraph, labels: Mapping, edge_kinds: int, max_hops: int) -> "ScamDistanceIndex":
+        """
+        Compute the index with a vectorized multi-source BFS.
+
+        Args:
+            graph: The address graph
+            labels: Mapping whose keys are the scam addresses
+            edge_kinds: Bit mask of EDGE_* kinds to follow
+            max_hops: Largest distance to materialize
+
+        Returns:
+            The built ScamDistanceIndex
+        """
+        index = cls(graph, labels, edge_kinds, max_hops)
+        sources = [node for node in (graph.node_id(address) for address in labels) if node is not None]
+        frontier = np.asarray(sources, dtype=np.int64)
+        index.distance[frontier] = 0
+        index.nearest[frontier] = frontier
+
+        for hops in range(1, max_hops + 1):
+            if not len(frontier):
+                break
+            owners, neighbors = graph.expand(frontier, index._reverse_kinds)
+            unvisited = index.distance[neighbors] == _UNREACHED
+            owners, neighbors = owners[unvisited], neighbors[unvisited]
+            # The first owner to reach a node becomes its parent
+            frontier, first = np.unique(neighbors, return_index=True)
+            index.distance[frontier] = hops
+            index.parent[frontier] = owners[first]
+            index.nearest[frontier] = index.nearest[owners[first]]
+        return index
+
+    def _ensure_size(self) -> None:
+        missing = len(self.graph) - len(self.distance)
+        if missing > 0:
+            self.distance = np.concatenate((self.distance, np.full(missing, _UNREACHED, dtype=np.int32)))
+            self.nearest = np.concatenate((self.nearest, np.full(missing, _UNREACHED, dtype=np.int64)))
+            self.parent = np.concatenate((self.parent, np.full(missing, _UNREACHED, dtype=np.int64)))
+
+    def _relax_from(self, seeds: List[int]) -> None:
+        queue = deque(seeds)
+        while queue:
+            node = queue.popleft()
+            hops = int(self.distance[node]) + 1
+            if hops > self.max_hops:
+                continue
+            for neighbor in self.graph.neighbors(node, self._reverse_kinds).tolist():
+                current = self.distance[neighbor]
+                if current == _UNREACHED or current > hops:
+                    self.distance[neighbor] = hops
+                    self.nearest[neighbor] = self.nearest[node]
+                    self.parent[neighbor] = node
+                    queue.append(neighbor)
+
+    def add_label(self, address: str) -> None:
+        """
+        Fold a newly labelled scam address into the index.
+
+        Args:
+            address: The newly labelled address
+        """
+        node = self.graph.add_node(address)
+        self._ensure_size()
+        if self.distance[node] == 0:
+            return
+        self.distance[node] = 0
+        self.nearest[node] = node
+        self.parent[node] = _UNREACHED
+        self._relax_from([node])
+
+    def add_edge(self, address: str, other_address: str, kind: int) -> None:
+        """
+        Fold a link that was just added to the graph into the index.
+
+        Args:
+            address: One end of the link, the wallet for a wallet link
+            other_address: The other end of the link
+            kind: EDGE_* kind of the link from address to other_address
+        """
+        self._ensure_size()
+        if not kind & self.edge_kinds:
+            return
+        seeds = []
+        for endpoint in (address, other_address):
+            node = self.graph.node_id(endpoint)
+            if node is None:
+                continue
+            if self.distance[node] == _UNREACHED and endpoint in self.labels:
+                # A labelled address that was not in the graph when it was built
+                self.distance[node] = 0
+                self.nearest[node] = node
+            if self.distance[node] != _UNREACHED:
+                seeds.append(node)
+        self._relax_from(seeds)
+
+    def lookup(self, address: str, max_hops: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the nearest scam address and the path to it.
+
+        Args:
+            address: The address to look up
+            max_hops: Optional tighter hop limit than the index's own
+
+        Returns:
+            Dictionary with the scam address, hop count, path and path edge
+            kinds, or None if no scam address is within range. Labelled
+            addresses themselves return None.
+        """
+        node = self.graph.node_id(address)
+        if node is None or node >= len(self.distance):
+            return None
+        hops = int(self.distance[node])
+        limit = self.max_hops if max_hops is None else min(max_hops, self.max_hops)
+        if hops <= 0 or hops > limit:
+            return None
+
+        return self._path(node)
+
+    def _path(self, node: int) -> Dict[str, Any]:
+        nodes = [node]
+        while self.parent[nodes[-1]] != _UNREACHED:
+            nodes.append(int(self.parent[nodes[-1]]))
+        return self.graph.describe_path(nodes)
+
+    def lookup_many(self, addresses: List[str], max_hops: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Look up several addresses with one vectorized distance gather.
+
+        Args:
+            addresses: The addresses to look up
+            max_hops: Optional tighter hop limit than the index's own
+
+        Returns:
+            One lookup() result per address, in input order
+        """
+        nodes = np.asarray([
+            node if node is not None and node < len(self.distance) else _UNREACHED
+            for node in (self.graph.node_id(address) for address in addresses)
+        ], dtype=np.int64)
+        limit = self.max_hops if max_hops is None else min(max_hops, self.max_hops)
+        distances = np.where(nodes >= 0, self.distance[np.maximum(nodes, 0)], _UNREACHED)
+        hits = (distances > 0) & (distances <= limit)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(addresses)
+        for position in np.flatnonzero(hits).tolist():
+            results[position] = self._path(int(nodes[position]))
+        return results
@@ -0,0 +1,209 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Bulk screening of address lists through the deterministic tool layer.
+
+Reads addresses one per line and runs check_scam_status, get_risk_score and
+analyze_behavioral_patterns on each, without going through the agents.
+Addresses are split into chunks that a process pool screens with the batch
+tool methods, and each chunk's results are written as JSON lines, in input
+order, as soon as it is done. Only a few chunks are in flight at a time, so
+memory stays flat however long the address list is.
+
+Usage:
+    python -m blockchain_security.tools.screening ADDRESSES [--output FILE]
+        [--dataset PATH] [--workers N] [--chunk-size N]
+
+Blank lines and lines starting with "#" in ADDRESSES are skipped.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Any, Deque, Iterable, Iterator, List, Optional, TextIO
+
+from .address_lookup import address_lookup_tool
+from .data_source import mapped_source, set_data_source
+from .risk_score_api import risk_score_api
+
+DEFAULT_CHUNK_SIZE = 500
+
+def screen_addresses(addresses: List[str]) -> List[Dict[str, Any]]:
+    """
+    Screen a batch of addresses with the batch tool methods.
+
+    Args:
+        addresses: The blockchain addresses to screen
+
+    Returns:
+        One result per address, in input order, with its scam status, risk
+        score and behavioural patterns
+    """
+    scam_statuses = address_lookup_tool.check_scam_status_many(addresses)
+    risk_scores = risk_score_api.get_risk_scores(addresses)
+    behavioral_patterns = risk_score_api.analyze_behavioral_patterns_many(addresses)
+    return [
+        {
+            "address": address,
+            "scam_status": scam_status,
+            "risk_score": risk_score,
+            "behavioral_patterns": patterns
+        }
+        for address, scam_status, risk_score, patterns in zip(
+            addresses, scam_statuses, risk_scores, behavioral_patterns
+        )
+    ]
+
+def read_addresses(path: str) -> Iterator[str]:
+    """
+    Read addresses from a file, one per line.
+
+    Args:
+        path: Path of the address file, or "-" for standard input
+
+    Returns:
+        Iterator of addresses, skipping blank and comment lines
+    """
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in handle:
+            address = line.strip()
+            if address and not address.startswith("#"):
+                yield address
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+def _chunks(addresses: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    iterator = iter(addresses)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _init_worker(dataset_path: Optional[str]) -> None:
+    # Open the dataset once per worker process
+    if dataset_path:
+        set_data_source(mapped_source(dataset_path))
+
+def screen(
+    addresses: Iterable[str],
+    output: TextIO,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dataset_path: Optional[str] = None,
+    progress: Optional[TextIO] = None,
+) -> Dict[str, Any]:
+    """
+    Screen addresses on a process pool and write the results as JSON lines.
+
+    Args:
+        addresses: The addresses to screen
+        output: Text stream the JSON lines are written to
+        workers: Worker processes, defaulting to the CPU count; 0 screens in
+            this process
+        chunk_size: Addresses per chunk handed to a worker
+        dataset_path: Dataset each worker opens, defaulting to the configured data source
+        progress: Optional stream for progress lines
+
+    Returns:
+        Dictionary with the number of addresses screened, the number at high
+        risk, elapsed seconds and addresses per second
+    """
+    started = time.perf_counter()
+    screened = 0
+    high_risk = 0
+
+    def write(results: List[Dict[str, Any]]) -> None:
+        nonlocal screened, high_risk
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+            high_risk += result["risk_score"]["risk_level"] == "High"
+        output.flush()
+        screened += len(results)
+        if progress is not None:
+            elapsed = time.perf_counter() - started
+            print(f"  {screened} addresses screened ({screened / elapsed if elapsed else 0.0:.0f}/s)",
+                  file=progress, flush=True)
+
+    chunks = _chunks(addresses, chunk_size)
+    if workers == 0:
+        _init_worker(dataset_path)
+        for chunk in chunks:
+            write(screen_addresses(chunk))
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(dataset_path,)) as executor:
+            # Keep a bounded window of chunks in flight and write them in order
+            pending: Deque[Future] = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(screen_addresses, chunk))
+                if len(pending) >= 2 * workers:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+
+    elapsed = time.perf_counter() - started
+    return {
+        "addresses": screened,
+        "high_risk": high_risk,
+        "seconds": elapsed,
+        "addresses_per_second": screened / elapsed if elapsed else 0.0
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for bulk address screening.
+
+    Args:
+        argv: Command-line arguments, defaulting to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Screen a list of addresses and write the results as JSON lines")
+    parser.add_argument("addresses", help="File with one address per line, or - for standard input")
+    parser.add_argument("--output", default="-", help="JSONL file to write, or - for standard output")
+    parser.add_argument("--dataset", help="Dataset file to screen against instead of the configured data source")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count; 0 runs in-process)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Addresses per work chunk")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        stats = screen(
+            read_addresses(args.addresses),
+            output,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            dataset_path=args.dataset,
+            progress=sys.stderr,
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"Screened {stats['addresses']} addresses in {stats['seconds']:.2f}s "
+          f"({stats['addresses_per_second']:.0f}/s); {stats['high_risk']} at high risk", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
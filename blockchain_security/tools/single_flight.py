@@ -0,0 +1,232 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Single-flight deduplication of concurrent tool computations."""
+
+import functools
+import inspect
+import pickle
+import threading
+from typing import Dict, Any, Callable, Hashable, List, Optional, Tuple
+
+from .data_source import get_data_source
+
+class _Flight:
+    """One in-progress computation that other callers can wait on."""
+
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+    def result(self) -> Any:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        # Waiters get their own copy, as result cache hits do
+        return pickle.loads(pickle.dumps(self.value, protocol=pickle.HIGHEST_PROTOCOL))
+
+class SingleFlight:
+    """
+    Share one in-progress computation between concurrent callers.
+
+    Computations are keyed on (namespace, address, data version). While one
+    caller, the leader, is computing a key, every other caller asking for
+    the same key waits for the leader and receives a copy of its result, or
+    its exception, instead of computing it again. Once the leader finishes
+    the key is released, so later calls go to the result cache or compute
+    afresh.
+
+    Only callers on different threads can overlap. ADK calls synchronous
+    FunctionTools directly on the event loop thread, so tool calls from
+    concurrent agent sessions run one after another and are never
+    de-duplicated here. What this de-duplicates is the full_security_check
+    fan-out, which runs its tools through asyncio.to_thread, and callers
+    that use the tools from several threads of their own.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.leaders = 0
+        self.deduplicated = 0
+        self._namespace_counts: Dict[str, List[int]] = {}
+
+    def do_many(
+        self,
+        namespace: str,
+        version: Hashable,
+        addresses: List[str],
+        compute_many: Callable[[List[str]], List[Any]],
+    ) -> List[Any]:
+        """
+        Compute results for a batch of addresses, joining computations already in flight.
+
+        Addresses nobody else is computing are computed together in one
+        compute_many call; the rest are waited on.
+
+        Args:
+            namespace: Name of the computed function
+            version: Data version the results are computed from
+            addresses: The blockchain addresses to compute results for
+            compute_many: Batch function returning one result per address
+
+        Returns:
+            One result per address, in input order
+        """
+        unique_addresses = list(dict.fromkeys(addresses))
+        led: List[Tuple[str, _Flight]] = []
+        joined: List[Tuple[str, _Flight]] = []
+        with self._lock:
+            counts = self._namespace_counts.setdefault(namespace, [0, 0])
+            for address in unique_addresses:
+                key = (namespace, address, version)
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = _Flight()
+                    led.append((address, flight))
+                    self.leaders += 1
+                    counts[0] += 1
+                else:
+                    flight.waiters += 1
+                    joined.append((address, flight))
+                    self.deduplicated += 1
+                    counts[1] += 1
+
+        results: Dict[str, Any] = {}
+        if led:
+            led_addresses = [address for address, _ in led]
+            try:
+                values = compute_many(led_addresses)
+            except BaseException as error:
+                self._land(namespace, version, led, error=error)
+                raise
+            results.update(zip(led_addresses, values))
+            self._land(namespace, version, led, values=values)
+
+        for address, flight in joined:
+            results[address] = flight.result()
+        return [results[address] for address in addresses]
+
+    def _land(
+        self,
+        namespace: str,
+        version: Hashable,
+        led: List[Tuple[str, _Flight]],
+        values: List[Any] = (),
+        error: BaseException = None,
+    ) -> None:
+        with self._lock:
+            for index, (address, flight) in enumerate(led):
+                del self._flights[(namespace, address, version)]
+                if error is not None:
+                    flight.error = error
+                else:
+                    flight.value = values[index]
+                flight.done.set()
+
+    def do(self, namespace: str, address: str, compute: Callable[[], Any]) -> Any:
+        """
+        Compute one address's result, joining a computation already in flight.
+
+        Args:
+            namespace: Name of the computed function
+            address: The blockchain address
+            compute: Function computing the result
+
+        Returns:
+            The result
+        """
+        version = get_data_source().data_version
+        return self.do_many(namespace, version, [address], lambda missing: [compute()])[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get counters of computed and deduplicated calls.
+
+        Returns:
+            Dictionary with calls in flight, calls computed, calls that
+            waited on another call instead, the deduplicated share and the
+            same counters per namespace
+        """
+        with self._lock:
+            calls = self.leaders + self.deduplicated
+            return {
+                "in_flight": len(self._flights),
+                "computed": self.leaders,
+                "deduplicated": self.deduplicated,
+                "deduplication_rate": self.deduplicated / calls if calls else 0.0,
+                "namespaces": {
+                    namespace: {"computed": computed, "deduplicated": deduplicated}
+                    for namespace, (computed, deduplicated) in self._namespace_counts.items()
+                },
+            }
+
+def address_only_call(
+    signature: inspect.Signature, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> Optional[str]:
+    """
+    Get the address of a tool call that passes nothing else.
+
+    Agent frameworks call tools with keyword arguments, and may pass
+    optional arguments at their default values.
+
+    Args:
+        signature: Signature of the tool function, whose first parameter is the address
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+
+    Returns:
+        The address, or None if any other argument differs from its default
+    """
+    bound = signature.bind(*args, **kwargs)
+    address_parameter = next(iter(signature.parameters))
+    for name, value in bound.arguments.items():
+        if name != address_parameter and value != signature.parameters[name].default:
+            return None
+    return bound.arguments[address_parameter]
+
+def single_flight_tool(namespace: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Deduplicate concurrent calls of a tool function taking an address first.
+
+    Only calls passing nothing but the address, and made from different
+    threads, are deduplicated; see SingleFlight.
+
+    The wrapped function keeps its name, docstring and signature, so it can
+    be registered as an agent tool as before.
+
+    Args:
+        namespace: Name the calls are counted under
+
+    Returns:
+        Decorator for the tool function
+    """
+    def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            address = address_only_call(signature, args, kwargs)
+            if address is None:
+                return function(*args, **kwargs)
+            return single_flight.do(namespace, address, lambda: function(address))
+        return wrapper
+    return decorator
+
+# Initialize the single-flight group
+single_flight = SingleFlight()
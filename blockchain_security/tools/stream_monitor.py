@@ -0,0 +1,430 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Real-time transaction stream monitor for blockchain security.
+
+Consumes a live stream of transactions, keeps a small amount of state per
+address and raises an alert as soon as an address's risk score reaches
+config.RISK_SCORE_THRESHOLD_HIGH. Each event is handled in constant time:
+burst windows are sliding deques, scam labels are checked through the
+Bloom-fronted label store and scam connections come from the incrementally
+maintained scam-distance index, so history is never rescanned. State is
+kept for recently active addresses only, so memory stays bounded.
+
+The stream is newline-delimited JSON, one transaction object (as in the
+JSONL ingest format) or one eth_getBlockByNumber block per line, read from
+a file being appended to or from a TCP socket.
+
+Usage:
+    python -m blockchain_security.tools.stream_monitor (--tail FILE [--follow] | --socket HOST:PORT)
+        [--ingest]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Any, AsyncIterator, Deque, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from blockchain_security import config
+from . import blockchain_data
+from .address_graph import EDGE_TRANSACTION, EDGE_WALLET_LINK
+from .address_lookup import address_lookup_tool
+from .data_source import DataSource, get_data_source, using_data_source
+from .ingest import Record, transactions_from_block, valid_record
+from .risk_score_api import RiskScoreAPI
+from .transaction_data import SCAM_INTERACTION_PATTERN
+from .transaction_table import parse_timestamp, parse_value
+
+class BurstWindow:
+    """
+    Sliding window of one address's recent transactions.
+
+    Values are summed per token, or in the common denomination under the
+    empty token key when the caller prices them, so that amounts of
+    different tokens are never added up.
+    """
+
+    __slots__ = ("window_seconds", "min_count", "min_value", "events", "values", "counts")
+
+    def __init__(self, window: Mapping[str, Any]) -> None:
+        self.window_seconds = int(window["window_seconds"])
+        self.min_count = window.get("min_count")
+        self.min_value = window.get("min_value")
+        self.events: Deque[Tuple[int, str, float]] = deque()
+        self.values: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, timestamp: int, token: str, amount: float) -> bool:
+        """
+        Add a transaction and drop the ones that slid out of the window.
+
+        Args:
+            timestamp: Epoch seconds of the transaction
+            token: Token the amount is in, or "" for a common-denomination value
+            amount: Transaction amount or value
+
+        Returns:
+            True if the window now meets one of its thresholds
+        """
+        events = self.events
+        values = self.values
+        counts = self.counts
+        while events and timestamp - events[0][0] >= self.window_seconds:
+            _, old_token, old_amount = events.popleft()
+            counts[old_token] -= 1
+            if counts[old_token]:
+                values[old_token] -= old_amount
+            else:
+                del counts[old_token], values[old_token]
+        events.append((timestamp, token, amount))
+        values[token] = values.get(token, 0.0) + amount
+        counts[token] = counts.get(token, 0) + 1
+        return (
+            (self.min_count is not None and len(events) >= self.min_count)
+            or (self.min_value is not None and values[token] >= self.min_value)
+        )
+
+class AddressState:
+    """
+    Running state of one address seen on the stream.
+
+    Holds only what the stream itself reveals: burst windows and the
+    patterns they and interactions with scam addresses raised. Labels,
+    wallet records and scam connections are read from the DataSource
+    whenever the address is scored, so data arriving later is reflected.
+    """
+
+    __slots__ = ("windows", "transaction_count", "patterns", "alerted_score", "last_seen")
+
+    def __init__(self, windows: Sequence[Mapping[str, Any]]) -> None:
+        self.windows = [BurstWindow(window) for window in windows]
+        self.transaction_count = 0
+        self.patterns: Dict[str, Dict[str, Any]] = {}
+        self.alerted_score = 0.0
+        self.last_seen = 0
+
+class StreamMonitor:
+    """
+    Incremental per-address risk scoring over a transaction stream.
+
+    Every event touching an address rescores it the way get_risk_score
+    does, from its scam label, its connection to known scam addresses, its
+    wallet's historical risk score and the patterns seen on the stream so
+    far: a burst of transfers and interaction with a known scam address.
+    Connections are looked up in the scam-distance index, which folds in
+    new labels, wallet links and, with ingest, streamed transactions as they
+    arrive. An alert is emitted when the address is first rated High or its
+    score reaches the threshold, and again only if the score rises further.
+
+    State is kept for the most recently active addresses only: addresses
+    idle for idle_seconds of stream time, or beyond the max_addresses most
+    recently seen, are forgotten.
+    """
+
+    def __init__(
+        self,
+        source: Optional[DataSource] = None,
+        windows: Optional[Sequence[Mapping[str, Any]]] = None,
+        threshold: Optional[float] = None,
+        ingest: bool = False,
+        max_hops: int = 1,
+        include_transactions: bool = False,
+        max_addresses: Optional[int] = None,
+        idle_seconds: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            source: DataSource holding labels and wallets, defaulting to the active one
+            windows: Burst windows, defaulting to config.RAPID_TRANSFER_WINDOWS
+            threshold: Alert threshold, defaulting to config.RISK_SCORE_THRESHOLD_HIGH
+            ingest: Also add every streamed transaction to the DataSource
+            max_hops: How many links away a known scammer may be
+            include_transactions: Also follow transaction edges, not just
+                wallet connected_addresses links
+            max_addresses: Most addresses to keep state for, defaulting to
+                config.STREAM_MONITOR_MAX_ADDRESSES
+            idle_seconds: Stream time after which an address's state is
+                dropped, defaulting to config.STREAM_MONITOR_IDLE_SECONDS
+        """
+        self.source = source if source is not None else get_data_source()
+        self.windows = list(config.RAPID_TRANSFER_WINDOWS if windows is None else windows)
+        self.threshold = config.RISK_SCORE_THRESHOLD_HIGH if threshold is None else threshold
+        self.ingest = ingest
+        self.max_hops = max_hops
+        self.include_transactions = include_transactions
+        self.max_addresses = config.STREAM_MONITOR_MAX_ADDRESSES if max_addresses is None else max_addresses
+        self.idle_seconds = config.STREAM_MONITOR_IDLE_SECONDS if idle_seconds is None else idle_seconds
+        self.states: "OrderedDict[str, AddressState]" = OrderedDict()
+        self.events = 0
+        self.alerts = 0
+        self.evicted = 0
+        self._latest = 0
+        # Build the scam-distance index now rather than on the first event
+        edge_kinds = EDGE_WALLET_LINK | (EDGE_TRANSACTION if include_transactions else 0)
+        self.source.scam_distance(edge_kinds)
+
+    def _state(self, address: str, timestamp: int) -> AddressState:
+        state = self.states.get(address)
+        if state is None:
+            state = self.states[address] = AddressState(self.windows)
+        else:
+            self.states.move_to_end(address)
+        state.last_seen = max(state.last_seen, timestamp)
+        return state
+
+    def _evict(self) -> None:
+        # States are in order of last activity, so the stale ones are at the front
+        states = self.states
+        while states:
+            address, state = next(iter(states.items()))
+            if len(states) <= self.max_addresses and self._latest - state.last_seen < self.idle_seconds:
+                break
+            del states[address]
+            self.evicted += 1
+
+    def _score(self, address: str, state: AddressState) -> Dict[str, Any]:
+        with using_data_source(self.source):
+            scam_status = address_lookup_tool.check_scam_status(address, self.max_hops, self.include_transactions)
+        transaction_analysis = None
+        if RiskScoreAPI._needs_transaction_analysis(scam_status):
+            transaction_analysis = {"detected_patterns": list(state.patterns.values())}
+        return RiskScoreAPI._build_risk_score(
+            address, scam_status, transaction_analysis, self.source.wallets.get(address, {})
+        )
+
+    def _update(
+        self,
+        address: str,
+        counterparty: str,
+        tx_hash: str,
+        timestamp_text: str,
+        timestamp: int,
+        token: str,
+        amount: float,
+    ) -> Optional[Dict[str, Any]]:
+        state = self._state(address, timestamp)
+        state.transaction_count += 1
+
+        for window in state.windows:
+            if window.add(timestamp, token, amount) and "rapid_transfers" not in state.patterns:
+                state.patterns["rapid_transfers"] = {
+                    "pattern": "rapid_transfers",
+                    **blockchain_data.SUSPICIOUS_TRANSACTION_PATTERNS["rapid_transfers"],
+                    "details": {
+                        "window_seconds": window.window_seconds,
+                        "count": len(window.events),
+                        "values": dict(window.values)
+                    }
+                }
+
+        scam_details = self.source.scam_addresses.get(counterparty)
+        if scam_details is not None and "scam_interaction" not in state.patterns:
+            state.patterns["scam_interaction"] = {
+                "pattern": "scam_interaction",
+                **SCAM_INTERACTION_PATTERN,
+                "details": {
+                    "scam_address": counterparty,
+                    "scam_type": scam_details["scam_type"],
+                    "tx_hash": tx_hash
+                }
+            }
+
+        risk = self._score(address, state)
+        risk_score = risk["risk_score"]
+        if risk_score <= state.alerted_score or (risk_score < self.threshold and risk["risk_level"] != "High"):
+            return None
+        state.alerted_score = risk_score
+        self.alerts += 1
+        return {
+            **risk,
+            "tx_hash": tx_hash,
+            "timestamp": timestamp_text,
+            "transaction_count": state.transaction_count
+        }
+
+    def process(self, tx_hash: str, tx_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Fold one transaction into the sender's and recipient's state.
+
+        Args:
+            tx_hash: The transaction hash
+            tx_data: Transaction fields, including "from", "to", "value" and "timestamp"
+
+        Returns:
+            Alerts raised by this transaction, possibly empty
+        """
+        self.events += 1
+        if self.ingest:
+            self.source.add_transactions([(tx_hash, tx_data)])
+
+        amount, token = parse_value(tx_data.get("value", ""))
+        amount = float(amount) if amount is not None and amount.is_finite() else 0.0
+        table = self.source.transactions.table
+        if table.priced:
+            price = (table.prices if table.prices is not None else config.TOKEN_PRICES).get(token)
+            amount, token = (amount * price if price is not None else 0.0), ""
+        timestamp = parse_timestamp(tx_data["timestamp"])
+        self._latest = max(self._latest, timestamp)
+        sender, recipient = tx_data["from"], tx_data["to"]
+
+        parties = [(sender, recipient)]
+        if recipient != sender:
+            parties.append((recipient, sender))
+
+        alerts = []
+        for address, counterparty in parties:
+            if not address:
+                continue  # Contract creation
+            alert = self._update(address, counterparty, tx_hash, tx_data["timestamp"], timestamp, token, amount)
+            if alert is not None:
+                alerts.append(alert)
+        self._evict()
+        return alerts
+
+    async def monitor(self, stream: AsyncIterator[Record]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a transaction stream and yield alerts as they are raised.
+
+        Args:
+            stream: Async iterator of (tx_hash, tx_data) pairs
+
+        Returns:
+            Async iterator of alert dictionaries
+        """
+        async for tx_hash, tx_data in stream:
+            for alert in self.process(tx_hash, tx_data):
+                yield alert
+
+def parse_stream_line(line: str) -> Iterator[Record]:
+    """
+    Parse one line of the stream into transactions.
+
+    Transactions of a block that cannot be converted are dropped.
+
+    Args:
+        line: A JSON transaction object, block object or JSON-RPC block response
+
+    Returns:
+        Iterator of (tx_hash, tx_data) pairs
+    """
+    if not line.strip():
+        return
+    record = json.loads(line)
+    record = record.get("result", record)
+    if not record:
+        return
+    if "transactions" in record:
+        yield from filter(valid_record, transactions_from_block(record))
+    else:
+        yield record.pop("hash"), record
+
+async def tail_file(path: str, follow: bool = True, poll_interval: float = 0.25) -> AsyncIterator[Record]:
+    """
+    Stream transactions from a file, waiting for new lines as it grows.
+
+    Args:
+        path: Path of the newline-delimited JSON file
+        follow: Keep waiting for new lines at the end of the file
+        poll_interval: Seconds to sleep between checks for new data
+
+    Returns:
+        Async iterator of (tx_hash, tx_data) pairs
+    """
+    with open(path, encoding="utf-8") as handle:
+        pending = ""
+        while True:
+            line = handle.readline()
+            if not line:
+                if not follow:
+                    break
+                await asyncio.sleep(poll_interval)
+                continue
+            pending += line
+            if not pending.endswith("\n"):
+                continue  # Partially written line
+            for record in parse_stream_line(pending):
+                yield record
+            pending = ""
+        for record in parse_stream_line(pending):
+            yield record
+
+async def read_socket(host: str, port: int) -> AsyncIterator[Record]:
+    """
+    Stream transactions from a TCP socket until the peer closes it.
+
+    Args:
+        host: Host to connect to
+        port: Port to connect to
+
+    Returns:
+        Async iterator of (tx_hash, tx_data) pairs
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            for record in parse_stream_line(line.decode("utf-8")):
+                yield record
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+async def _run(monitor: StreamMonitor, stream: AsyncIterator[Record]) -> None:
+    started = time.perf_counter()
+    async for alert in monitor.monitor(stream):
+        print(json.dumps(alert), flush=True)
+    elapsed = time.perf_counter() - started
+    print(f"Processed {monitor.events} transactions in {elapsed:.2f}s "
+          f"({monitor.events / elapsed if elapsed else 0.0:.0f} tx/s); {monitor.alerts} alerts; "
+          f"tracking {len(monitor.states)} addresses, {monitor.evicted} dropped as idle",
+          file=sys.stderr)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for the stream monitor.
+
+    Args:
+        argv: Command-line arguments, defaulting to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Monitor a transaction stream and print high-risk alerts as JSON lines")
+    stream_group = parser.add_mutually_exclusive_group(required=True)
+    stream_group.add_argument("--tail", metavar="FILE", help="Newline-delimited JSON file to read")
+    stream_group.add_argument("--socket", metavar="HOST:PORT", help="TCP socket sending newline-delimited JSON")
+    parser.add_argument("--follow", action="store_true", help="Keep waiting for lines appended to --tail FILE")
+    parser.add_argument("--ingest", action="store_true", help="Add streamed transactions to the data source")
+    args = parser.parse_args(argv)
+
+    if args.tail:
+        stream = tail_file(args.tail, follow=args.follow)
+    else:
+        host, _, port = args.socket.rpartition(":")
+        stream = read_socket(host or "localhost", int(port))
+
+    try:
+        asyncio.run(_run(StreamMonitor(ingest=args.ingest), stream))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
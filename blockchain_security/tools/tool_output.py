@@ -0,0 +1,286 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Token-bounded, paginated tool responses for the LLM agents."""
+
+import json
+import math
+import zlib
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from blockchain_security import config
+from .data_source import DataSource
+
+def estimate_tokens(value: Any) -> int:
+    """
+    Estimate how many prompt tokens a tool response takes.
+
+    Args:
+        value: JSON-serializable tool response
+
+    Returns:
+        Estimated token count, at config.TOOL_OUTPUT_CHARS_PER_TOKEN
+        characters of compact JSON per token
+    """
+    text = json.dumps(value, separators=(",", ":"), default=str)
+    return math.ceil(len(text) / config.TOOL_OUTPUT_CHARS_PER_TOKEN)
+
+def summarize_transactions(source: DataSource, address: str, rows: np.ndarray) -> Dict[str, Any]:
+    """
+    Aggregate an address's transactions into a fixed-size summary.
+
+    Args:
+        source: The DataSource the rows belong to
+        address: The blockchain address
+        rows: Table rows of the address's transactions
+
+    Returns:
+        Dictionary with the number of transactions sent and received, the
+        first and last timestamps, per-token totals sent and received, the
+        number of distinct counterparties and the most frequent ones
+    """
+    store = source.transactions
+    table = store.table
+    if not len(rows):
+        return {"transaction_count": 0}
+
+    address_id = table.find_address_id(address)
+    from_ids = table.from_ids[rows]
+    to_ids = table.to_ids[rows]
+    sent = from_ids == address_id
+    received = to_ids == address_id
+    timestamps = table.timestamps[rows]
+    token_ids = table.token_ids[rows]
+    amounts = table.amounts[rows]
+
+    token_totals: Dict[str, Dict[str, float]] = {}
+    for token_id in np.unique(token_ids).tolist():
+        token_rows = token_ids == token_id
+        token_totals[table.tokens[token_id]] = {
+            "sent": round(float(amounts[token_rows & sent].sum()), 4),
+            "received": round(float(amounts[token_rows & received].sum()), 4),
+        }
+
+    counterparties = np.where(sent, to_ids, from_ids)
+    counterparty_ids, counts = np.unique(counterparties, return_counts=True)
+    top = np.argsort(-counts, kind="stable")[:config.TOOL_OUTPUT_TOP_COUNTERPARTIES]
+    scam_addresses = source.scam_addresses
+    top_counterparties = []
+    for index in top.tolist():
+        counterparty = table.addresses[int(counterparty_ids[index])]
+        entry = {"address": counterparty, "transactions": int(counts[index])}
+        if counterparty in scam_addresses:
+            entry["scam_type"] = scam_addresses[counterparty]["scam_type"]
+        top_counterparties.append(entry)
+
+    return {
+        "transaction_count": len(rows),
+        "sent": int(sent.sum()),
+        "received": int(received.sum()),
+        "first_seen": store.materialize(int(rows[np.argmin(timestamps)]))["timestamp"],
+        "last_seen": store.materialize(int(rows[np.argmax(timestamps)]))["timestamp"],
+        "token_totals": token_totals,
+        "counterparty_count": len(counterparty_ids),
+        "top_counterparties": top_counterparties,
+    }
+
+def evidence_order(source: DataSource, address: str, rows: np.ndarray) -> np.ndarray:
+    """
+    Order an address's transactions by how much they say about its risk.
+
+    Transactions with a known scam address come first, then the rest; each
+    group runs from the most recent transaction to the oldest.
+
+    Args:
+        source: The DataSource the rows belong to
+        address: The blockchain address
+        rows: Table rows of the address's transactions
+
+    Returns:
+        The rows in evidence order
+    """
+    table = source.transactions.table
+    scam_addresses = source.scam_addresses
+    address_id = table.find_address_id(address)
+    counterparties = np.where(table.from_ids[rows] == address_id, table.to_ids[rows], table.from_ids[rows])
+    unique_ids, inverse = np.unique(counterparties, return_inverse=True)
+    is_scam = np.array([table.addresses[int(other)] in scam_addresses for other in unique_ids.tolist()], dtype=bool)
+    # lexsort sorts by the last key first
+    return rows[np.lexsort((-table.timestamps[rows], ~is_scam[inverse]))]
+
+def _cursor_check(source: DataSource, address: str) -> str:
+    return f"{zlib.crc32(f'{source.address_version(address)}|{address}'.encode()):08x}"
+
+def encode_cursor(source: DataSource, address: str, offset: int) -> str:
+    """
+    Build the cursor of the page starting at an offset.
+
+    Args:
+        source: The DataSource being paged through
+        address: The blockchain address being paged through
+        offset: Index of the page's first row in evidence order
+
+    Returns:
+        Opaque cursor string, valid for this address while the data is unchanged
+    """
+    return f"{offset}.{_cursor_check(source, address)}"
+
+def decode_cursor(source: DataSource, address: str, cursor: str) -> Optional[int]:
+    """
+    Read the offset of a cursor from encode_cursor.
+
+    Args:
+        source: The DataSource being paged through
+        address: The blockchain address being paged through
+        cursor: The cursor
+
+    Returns:
+        The offset, or None if the cursor is malformed, belongs to another
+        address or the data has changed since it was issued
+    """
+    offset, _, check = cursor.partition(".")
+    if not offset.isdigit() or check != _cursor_check(source, address):
+        return None
+    return int(offset)
+
+def transaction_page(
+    source: DataSource,
+    address: str,
+    rows: np.ndarray,
+    response: Dict[str, Any],
+    list_key: str,
+    cursor: Optional[str] = None,
+    token_budget: Optional[int] = None,
+    max_rows: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Fill a tool response with one page of an address's transactions.
+
+    Transactions are added in evidence order, starting at the cursor, until
+    max_rows are in or the next one would take the response over the token
+    budget; at least one is always added. The rest of the response counts
+    against the budget too.
+
+    Args:
+        source: The DataSource the rows belong to
+        address: The blockchain address
+        rows: Table rows of the address's transactions
+        response: The tool response without the transactions; updated in place
+        list_key: Key the page of transactions goes under
+        cursor: Cursor from a previous page's next_cursor, or None for the first page
+        token_budget: Most estimated tokens in the response, defaulting to
+            config.TOOL_OUTPUT_TOKEN_BUDGET
+        max_rows: Most transactions per page, defaulting to config.TOOL_OUTPUT_MAX_ROWS
+
+    Returns:
+        The response, with the page under list_key and next_cursor set to
+        the cursor of the next page or None on the last one, or an error
+        response if the cursor is invalid
+    """
+    token_budget = token_budget or config.TOOL_OUTPUT_TOKEN_BUDGET
+    max_rows = max_rows or config.TOOL_OUTPUT_MAX_ROWS
+    offset = 0
+    if cursor:
+        offset = decode_cursor(source, address, cursor)
+        if offset is None:
+            return {
+                "address": address,
+                "error": "Invalid or expired cursor; call again without a cursor to start over"
+            }
+
+    ordered = evidence_order(source, address, rows)
+    store = source.transactions
+    page: List[Dict[str, Any]] = []
+    response[list_key] = page
+    # Reserve room for the largest cursor and page counts
+    response["next_cursor"] = encode_cursor(source, address, len(ordered))
+    response["page"] = {"offset": len(ordered), "returned": max_rows, "total": len(ordered)}
+    used = estimate_tokens(response)
+    response["next_cursor"] = None
+    end = offset
+    while end < len(ordered) and len(page) < max_rows:
+        transaction = store.materialize(int(ordered[end]))
+        # Each further row also costs a separating comma
+        cost = estimate_tokens(transaction) + 1
+        if page and used + cost > token_budget:
+            break
+        page.append(transaction)
+        used += cost
+        end += 1
+
+    if end < len(ordered):
+        response["next_cursor"] = encode_cursor(source, address, end)
+    response["page"] = {"offset": offset, "returned": len(page), "total": len(ordered)}
+    return response
+
+def _bounded_list(items: List[Any], max_items: int, token_budget: int) -> List[Any]:
+    kept: List[Any] = []
+    used = 0
+    for item in items[:max_items]:
+        cost = estimate_tokens(item) + 1
+        if kept and used + cost > token_budget:
+            break
+        kept.append(item)
+        used += cost
+    return kept
+
+def _bounded_details(details: Any, max_items: int, token_budget: int) -> Tuple[Any, Optional[int]]:
+    if isinstance(details, list):
+        kept = _bounded_list(details, max_items, token_budget)
+        return kept, len(details) if len(kept) < len(details) else None
+    if isinstance(details, dict):
+        bounded = dict(details)
+        total = None
+        for key, value in details.items():
+            if isinstance(value, list):
+                bounded[key] = _bounded_list(value, max_items, token_budget)
+                if len(bounded[key]) < len(value):
+                    total = max(total or 0, len(value))
+        return bounded, total
+    return details, None
+
+def bound_patterns(
+    analysis: Dict[str, Any], max_items: Optional[int] = None, token_budget: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Cap the evidence listed under each detected pattern.
+
+    Every pattern gets an equal share of the token budget for its details,
+    and keeps at least one item of evidence however large.
+
+    Args:
+        analysis: An analyze_transaction_patterns or
+            analyze_behavioral_patterns result
+        max_items: Most evidence items kept per pattern, defaulting to
+            config.TOOL_OUTPUT_MAX_DETAILS
+        token_budget: Estimated tokens for the evidence of all patterns,
+            defaulting to half of config.TOOL_OUTPUT_TOKEN_BUDGET
+
+    Returns:
+        Copy of the analysis whose patterns keep what evidence fits, with
+        details_total giving the full count where some was left out
+    """
+    max_items = max_items or config.TOOL_OUTPUT_MAX_DETAILS
+    token_budget = token_budget or config.TOOL_OUTPUT_TOKEN_BUDGET // 2
+    detected = analysis.get("detected_patterns", [])
+    share = token_budget // max(1, len(detected))
+    patterns = []
+    for pattern in detected:
+        details, total = _bounded_details(pattern.get("details"), max_items, share)
+        if total is not None:
+            pattern = {**pattern, "details": details, "details_total": total}
+        patterns.append(pattern)
+    return {**analysis, "detected_patterns": patterns}
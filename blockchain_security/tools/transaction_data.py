@@ -15,8 +15,20 @@
 """Transaction data tool for blockchain security."""
 
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+
+import numpy as np
+
 from . import blockchain_data
+from .burst_detector import rapid_transfer_detector
+from .data_source import DataSource, get_data_source, prepared_source
+from .pattern_rules import PatternFeatures, address_ids, transaction_rule_engine
+from .result_cache import result_cache
+
+# Pattern reported for transactions with known scam addresses
+SCAM_INTERACTION_PATTERN = {
+    "description": "Interaction with known scam addresses",
+    "risk_score": 0.80
+}
 
 class TransactionData:
     """Tool for analyzing blockchain transaction data."""
@@ -32,11 +44,9 @@ class TransactionData:
         Returns:
             Dictionary with transaction details
         """
-        if tx_hash in blockchain_data.SAMPLE_TRANSACTIONS:
-            return {
-                "hash": tx_hash,
-                **blockchain_data.SAMPLE_TRANSACTIONS[tx_hash]
-            }
+        transaction = get_data_source().transactions.get_transaction(tx_hash)
+        if transaction is not None:
+            return transaction
         
         return {
             "error": "Transaction not found",
@@ -54,15 +64,7 @@ class TransactionData:
         Returns:
             List of transaction details
         """
-        transactions = []
-        for tx_hash, tx_data in blockchain_data.SAMPLE_TRANSACTIONS.items():
-            if tx_data["from"] == address or tx_data["to"] == address:
-                transactions.append({
-                    "hash": tx_hash,
-                    **tx_data
-                })
-        
-        return transactions
+        return prepared_source([address]).transactions.get_transactions_by_address(address)
     
     @staticmethod
     def analyze_transaction_patterns(address: str) -> Dict[str, Any]:
@@ -75,63 +77,144 @@ class TransactionData:
         Returns:
             Dictionary with pattern analysis
         """
-        transactions = TransactionData.get_transactions_by_address(address)
+        return TransactionData.analyze_transaction_patterns_many([address])[0]
+    
+    @staticmethod
+    def analyze_transaction_patterns_many(addresses: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze transaction patterns for a batch of addresses.
+        
+        Results are served from the versioned result cache where possible.
+        
+        Args:
+            addresses: The blockchain addresses to analyze
+            
+        Returns:
+            One analyze_transaction_patterns result per address, in input order
+        """
+        prepared_source(addresses)
+        return result_cache.get_many(
+            "analyze_transaction_patterns", addresses, TransactionData._analyze_transaction_patterns_many
+        )
+    
+    @staticmethod
+    def _analyze_transaction_patterns_many(
+        addresses: List[str],
+        row_groups: Optional[List[np.ndarray]] = None,
+        source: Optional[DataSource] = None,
+    ) -> List[Dict[str, Any]]:
+        # The burst check and pattern rules run as vectorized passes over the
+        # rows of every address, and each distinct counterparty across the
+        # whole batch is checked against the scam labels once. Callers that
+        # already hold the rows of distinct addresses can pass them as
+        # row_groups, and the DataSource they read them from as source.
+        if source is None:
+            source = get_data_source()
+        store = source.transactions
+        table = store.table
+        unique_addresses = list(dict.fromkeys(addresses))
         
-        # Check for rapid transfers
-        tx_timestamps = [datetime.fromisoformat(tx["timestamp"].replace("Z", "+00:00")) 
-                         for tx in transactions]
-        tx_timestamps.sort()
+        if row_groups is None:
+            row_groups = [store.rows_for_address(address) for address in unique_addresses]
+        lengths = [len(rows) for rows in row_groups]
+        all_rows = np.concatenate(row_groups) if row_groups else np.zeros(0, dtype=np.int64)
+        groups = np.repeat(np.arange(len(unique_addresses)), lengths)
         
-        rapid_transfers = False
-        for i in range(1, len(tx_timestamps)):
-            time_diff = (tx_timestamps[i] - tx_timestamps[i-1]).total_seconds()
-            if time_diff < 60:  # Less than a minute between transactions
-                rapid_transfers = True
-                break
+        # Check for bursts of transfers on the pre-parsed timestamp column
+        bursts = rapid_transfer_detector().detect_grouped(table, all_rows, groups, len(unique_addresses))
         
-        # Check if address interacts with known scam addresses
-        interacts_with_scammers = False
-        scam_interactions = []
+        # Evaluate the declarative pattern rules over the whole batch
+        rule_matches = transaction_rule_engine.evaluate(
+            PatternFeatures.extract(table, all_rows, groups, address_ids(table, unique_addresses))
+        )
         
-        for tx in transactions:
-            if tx["from"] in blockchain_data.KNOWN_SCAM_ADDRESSES:
-                interacts_with_scammers = True
-                scam_interactions.append({
-                    "tx_hash": tx.get("hash", ""),
-                    "scam_address": tx["from"],
-                    "scam_type": blockchain_data.KNOWN_SCAM_ADDRESSES[tx["from"]]["scam_type"]
+        # Check for interactions with known scam addresses, looking up each
+        # distinct counterparty once by its interned address ID
+        all_from_ids = table.from_ids[all_rows]
+        all_to_ids = table.to_ids[all_rows]
+        scam_labels = {}
+        for address_id in np.unique(np.concatenate((all_from_ids, all_to_ids))).tolist():
+            label = source.scam_addresses.get(table.addresses[address_id])
+            if label is not None:
+                scam_labels[address_id] = label
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        offset = 0
+        for group, address in enumerate(unique_addresses):
+            rows = all_rows[offset:offset + lengths[group]]
+            from_ids = all_from_ids[offset:offset + lengths[group]]
+            to_ids = all_to_ids[offset:offset + lengths[group]]
+            offset += lengths[group]
+            
+            scam_interactions = []
+            if scam_labels:
+                for row, from_id, to_id in zip(rows.tolist(), from_ids.tolist(), to_ids.tolist()):
+                    for address_id in (from_id, to_id):
+                        if address_id in scam_labels:
+                            scam_interactions.append({
+                                "tx_hash": store.hash_at(row),
+                                "scam_address": table.addresses[address_id],
+                                "scam_type": scam_labels[address_id]["scam_type"]
+                            })
+            
+            # Determine overall risk pattern
+            detected_patterns = []
+            if bursts[group]:
+                detected_patterns.append({
+                    "pattern": "rapid_transfers",
+                    **blockchain_data.SUSPICIOUS_TRANSACTION_PATTERNS["rapid_transfers"],
+                    "details": bursts[group]
                 })
             
-            if tx["to"] in blockchain_data.KNOWN_SCAM_ADDRESSES:
-                interacts_with_scammers = True
-                scam_interactions.append({
-                    "tx_hash": tx.get("hash", ""),
-                    "scam_address": tx["to"],
-                    "scam_type": blockchain_data.KNOWN_SCAM_ADDRESSES[tx["to"]]["scam_type"]
+            if scam_interactions:
+                detected_patterns.append({
+                    "pattern": "scam_interaction",
+                    **SCAM_INTERACTION_PATTERN,
+                    "details": scam_interactions
                 })
+            
+            # Search for circular flows through the address, within the
+            # configured length, window and time budget
+            flow_graph = source.flow_graph_for(address)
+            if flow_graph.component_size(address) > 1:
+                cycles = flow_graph.find_cycles(address)
+                if cycles["cycles"]:
+                    detected_patterns.append({
+                        "pattern": "wash_trading",
+                        **blockchain_data.WALLET_BEHAVIORAL_PATTERNS["wash_trading"],
+                        "details": cycles
+                    })
+            
+            for pattern, evidence in rule_matches[group]:
+                detected_patterns.append({
+                    "pattern": pattern,
+                    **blockchain_data.SUSPICIOUS_TRANSACTION_PATTERNS[pattern],
+                    "details": evidence
+                })
+            
+            results[address] = {
+                "address": address,
+                "transaction_count": len(rows),
+                "detected_patterns": detected_patterns,
+                "risk_assessment": len(detected_patterns) > 0
+            }
         
-        # Determine overall risk pattern
-        detected_patterns = []
-        if rapid_transfers:
-            detected_patterns.append({
-                "pattern": "rapid_transfers",
-                **blockchain_data.SUSPICIOUS_TRANSACTION_PATTERNS["rapid_transfers"]
-            })
-        
-        if interacts_with_scammers:
-            detected_patterns.append({
-                "pattern": "scam_interaction",
-                "description": "Interaction with known scam addresses",
-                "risk_score": 0.80,
-                "details": scam_interactions
-            })
-        
-        return {
-            "address": address,
-            "transaction_count": len(transactions),
-            "detected_patterns": detected_patterns,
-            "risk_assessment": len(detected_patterns) > 0
-        }
+        return [results[address] for address in addresses]
+
+def is_transaction_hash(value: str) -> bool:
+    """
+    Tell a transaction hash from an address.
+
+    Simplified check for the demo: hashes are "0x" and at least 64 hex
+    characters, addresses are shorter.
+
+    Args:
+        value: A blockchain address or transaction hash
+
+    Returns:
+        True if the value looks like a transaction hash
+    """
+    return value.startswith("0x") and len(value) >= 64
 
 # Initialize the tool
 transaction_data_tool = TransactionData()
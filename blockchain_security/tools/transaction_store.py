@@ -0,0 +1,316 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Address-indexed transaction store for blockchain security."""
+
+from array import array
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from . import blockchain_data
+from .transaction_table import TransactionTable, format_timestamp, parse_timestamp
+
+# Fields held in TransactionTable columns rather than per-row extras
+_CORE_FIELDS = ("from", "to", "value", "timestamp")
+
+class TransactionRecord:
+    """
+    Lightweight view of one transaction row.
+
+    Records read straight from the store's columns and interned address
+    table; a dict is only built when to_dict() is called at the tool
+    boundary.
+    """
+
+    __slots__ = ("_store", "row")
+
+    def __init__(self, store: Any, row: int) -> None:
+        self._store = store
+        self.row = row
+
+    @property
+    def hash(self) -> str:
+        return self._store.hash_at(self.row)
+
+    @property
+    def from_address(self) -> str:
+        table = self._store.table
+        return table.addresses[table.from_ids[self.row]]
+
+    @property
+    def to_address(self) -> str:
+        table = self._store.table
+        return table.addresses[table.to_ids[self.row]]
+
+    @property
+    def timestamp(self) -> int:
+        return int(self._store.table.timestamps[self.row])
+
+    @property
+    def amount(self) -> float:
+        return float(self._store.table.amounts[self.row])
+
+    @property
+    def token(self) -> str:
+        table = self._store.table
+        return table.tokens[table.token_ids[self.row]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Materialize the transaction in the tools' dict shape.
+
+        Returns:
+            Dictionary with transaction details including the hash
+        """
+        return self._store.materialize(self.row)
+
+class TransactionStore:
+    """
+    In-memory transaction store with from/to inverted indexes.
+
+    Transactions are kept in insertion order and every address maps to the
+    positions of the transactions it sent and received, so an address lookup
+    costs time proportional to that address's own activity rather than the
+    size of the whole store.
+
+    Records are stored compactly: sender, recipient, timestamp, amount and
+    token live in the columnar TransactionTable as integers and floats, with
+    one row per store position; posting lists are int64 arrays keyed by
+    address ID; value strings and the remaining fields are interned so that
+    repeated values share one object. Dicts are only materialized at the
+    tool boundary.
+
+    Appends are single-writer. A new row is counted in len() only after
+    its hash and fields are stored, and is findable by hash or address only
+    after that, so readers in other threads never see a partial row.
+    """
+
+    def __init__(self) -> None:
+        self.table = TransactionTable()
+        self._hashes: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._values: List[Optional[str]] = []
+        self._extras: List[Tuple[Tuple[str, Any], ...]] = []
+        self._timestamp_text: Dict[int, str] = {}
+        self._interned: Dict[Any, Any] = {}
+        self._outgoing: List[array] = []
+        self._incoming: List[array] = []
+
+    @classmethod
+    def from_transactions(cls, transactions: Dict[str, Dict[str, Any]]) -> "TransactionStore":
+        """
+        Build a store from a mapping of transaction hash to transaction data.
+
+        Args:
+            transactions: Mapping shaped like blockchain_data.SAMPLE_TRANSACTIONS
+
+        Returns:
+            A populated TransactionStore
+        """
+        store = cls()
+        store.add_transactions(transactions.items())
+        return store
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __contains__(self, tx_hash: object) -> bool:
+        return tx_hash in self._rows
+
+    def _intern(self, value: Any) -> Any:
+        try:
+            return self._interned.setdefault(value, value)
+        except TypeError:
+            return value
+
+    def _postings(self, index: List[array], address_id: int) -> array:
+        while len(index) <= address_id:
+            index.append(array("q"))
+        return index[address_id]
+
+    def add_transaction(self, tx_hash: str, tx_data: Dict[str, Any]) -> None:
+        """
+        Add a transaction and index it under its sender and recipient.
+
+        Transactions are immutable once added, so re-adding a known hash is a no-op.
+
+        Args:
+            tx_hash: The transaction hash
+            tx_data: Transaction fields, including "from" and "to"
+        """
+        if tx_hash in self._rows:
+            return
+
+        row = self.table.write(tx_data)
+        self._hashes.append(tx_hash)
+        self._values.append(self._intern(tx_data.get("value")))
+        self._extras.append(self._intern(tuple(
+            (field, value) for field, value in tx_data.items() if field not in _CORE_FIELDS
+        )))
+        timestamp = tx_data["timestamp"]
+        if format_timestamp(parse_timestamp(timestamp)) != timestamp:
+            # Only keep the original text when it does not round-trip
+            self._timestamp_text[row] = timestamp
+
+        # Publish the row only once everything materialize() reads is stored
+        self.table.publish()
+        self._rows[tx_hash] = row
+        self._postings(self._outgoing, int(self.table.from_ids[row])).append(row)
+        self._postings(self._incoming, int(self.table.to_ids[row])).append(row)
+
+    def add_transactions(self, transactions: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Add several transactions in order.
+
+        Args:
+            transactions: Iterable of (tx_hash, tx_data) pairs
+
+        Returns:
+            Number of transactions added; known hashes are not counted
+        """
+        count = len(self)
+        for tx_hash, tx_data in transactions:
+            self.add_transaction(tx_hash, tx_data)
+        return len(self) - count
+
+    def hash_at(self, row: int) -> str:
+        """
+        Get the hash of the transaction at a row.
+
+        Args:
+            row: Store position of the transaction
+
+        Returns:
+            The transaction hash
+        """
+        return self._hashes[row]
+
+    def materialize(self, row: int) -> Dict[str, Any]:
+        """
+        Build the dict form of the transaction at a row.
+
+        Args:
+            row: Store position of the transaction
+
+        Returns:
+            Dictionary with transaction details including the hash
+        """
+        table = self.table
+        tx_data: Dict[str, Any] = {
+            "hash": self._hashes[row],
+            "from": table.addresses[table.from_ids[row]],
+            "to": table.addresses[table.to_ids[row]],
+        }
+        if self._values[row] is not None:
+            tx_data["value"] = self._values[row]
+        tx_data["timestamp"] = self._timestamp_text.get(row) or format_timestamp(int(table.timestamps[row]))
+        tx_data.update(self._extras[row])
+        return tx_data
+
+    def get_transaction(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get transaction data by hash.
+
+        Args:
+            tx_hash: The transaction hash to look up
+
+        Returns:
+            Dictionary with transaction details including the hash, or None
+        """
+        row = self._rows.get(tx_hash)
+        if row is None:
+            return None
+        return self.materialize(row)
+
+    def rows_for_address(self, address: str, direction: str = "both") -> np.ndarray:
+        """
+        Get table rows of the transactions sent or received by an address.
+
+        Args:
+            address: The blockchain address to look up
+            direction: "out" for sent, "in" for received or "both"
+
+        Returns:
+            Ascending int64 array of rows, each transaction listed once
+        """
+        address_id = self.table.find_address_id(address)
+        if address_id is None:
+            return np.zeros(0, dtype=np.int64)
+
+        # Copy rather than view the posting arrays, which must stay resizable
+        outgoing = np.array(
+            self._outgoing[address_id] if direction != "in" and address_id < len(self._outgoing) else (),
+            dtype=np.int64
+        )
+        incoming = np.array(
+            self._incoming[address_id] if direction != "out" and address_id < len(self._incoming) else (),
+            dtype=np.int64
+        )
+        if not len(incoming):
+            return outgoing
+        if not len(outgoing):
+            return incoming
+        # Self-transfers appear in both indexes
+        return np.union1d(outgoing, incoming)
+
+    def positions_for_address(self, address: str) -> List[int]:
+        """
+        Get store positions of the transactions sent or received by an address.
+
+        Args:
+            address: The blockchain address to look up
+
+        Returns:
+            Ascending list of positions, each transaction listed once
+        """
+        return self.rows_for_address(address).tolist()
+
+    def records_for_address(self, address: str) -> List[TransactionRecord]:
+        """
+        Get lightweight records of the transactions sent or received by an address.
+
+        Args:
+            address: The blockchain address to look up
+
+        Returns:
+            List of TransactionRecord views in insertion order
+        """
+        return [TransactionRecord(self, row) for row in self.positions_for_address(address)]
+
+    def get_transactions_by_address(self, address: str) -> List[Dict[str, Any]]:
+        """
+        Get transactions sent or received by an address.
+
+        Args:
+            address: The blockchain address to find transactions for
+
+        Returns:
+            List of transaction details in insertion order
+        """
+        return [self.materialize(row) for row in self.positions_for_address(address)]
+
+    def iter_transactions(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over all transactions in insertion order.
+
+        Returns:
+            Iterator of (tx_hash, tx_data) pairs
+        """
+        for row in range(len(self.table)):
+            tx_data = self.materialize(row)
+            yield tx_data.pop("hash"), tx_data
+
+# Initialize the store from the simulated blockchain data
+transaction_store = TransactionStore.from_transactions(blockchain_data.SAMPLE_TRANSACTIONS)
@@ -0,0 +1,287 @@
+# Copyright 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Columnar transaction table for vectorized blockchain analysis."""
+
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from blockchain_security import config
+
+_INITIAL_CAPACITY = 1024
+
+# Amounts are stored as integer counts of 10**-UNIT_DECIMALS of a token
+UNIT_DECIMALS = 6
+UNITS_PER_TOKEN = 10 ** UNIT_DECIMALS
+# Units value of amounts that could not be parsed or do not fit in int64
+MISSING_UNITS = int(np.iinfo(np.int64).min)
+
+def parse_timestamp(timestamp: str) -> int:
+    """
+    Parse an ISO 8601 timestamp into epoch seconds.
+
+    Args:
+        timestamp: Timestamp string such as "2025-05-10T14:32:15Z"
+
+    Returns:
+        Seconds since the Unix epoch
+    """
+    return int(datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp())
+
+def format_timestamp(epoch_seconds: int) -> str:
+    """
+    Format epoch seconds as an ISO 8601 UTC timestamp.
+
+    Args:
+        epoch_seconds: Seconds since the Unix epoch
+
+    Returns:
+        Timestamp string such as "2025-05-10T14:32:15Z"
+    """
+    return datetime.fromtimestamp(epoch_seconds, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def parse_value(value: str) -> Tuple[Optional[Decimal], str]:
+    """
+    Split a free-text value such as "5.2 ETH" into an amount and token symbol.
+
+    Args:
+        value: The transaction value string
+
+    Returns:
+        Tuple of (amount, token symbol); the amount is None if it cannot be parsed
+    """
+    parts = str(value).split()
+    if not parts:
+        return None, ""
+
+    symbol = parts[1].upper() if len(parts) > 1 else ""
+    try:
+        return Decimal(parts[0]), symbol
+    except InvalidOperation:
+        return None, symbol
+
+def to_units(amount: Optional[Decimal]) -> int:
+    """
+    Convert a token amount into integer units.
+
+    Args:
+        amount: Amount in whole tokens, or None
+
+    Returns:
+        The amount in units of 10**-UNIT_DECIMALS tokens, rounded half to
+        even, or MISSING_UNITS if the amount is None or out of range
+    """
+    if amount is None or not amount.is_finite():
+        return MISSING_UNITS
+    units = int((amount * UNITS_PER_TOKEN).to_integral_value(ROUND_HALF_EVEN))
+    if not MISSING_UNITS < units <= np.iinfo(np.int64).max:
+        return MISSING_UNITS
+    return units
+
+class TransactionTable:
+    """
+    Column-oriented view of transactions backed by NumPy arrays.
+
+    Timestamps are stored as int64 epoch seconds, amounts both as integer
+    units (see to_units) and as floats, token symbols and addresses as small
+    integer IDs. Rows are appended in the same order as the owning
+    TransactionStore, so a store position is also a table row.
+
+    Amounts in different tokens can be compared through a price table that
+    maps token symbols to a common denomination: the prices stored with a
+    dataset, otherwise config.TOKEN_PRICES. Tokens without a price get NaN
+    values. The burst detector sums values this way.
+    """
+
+    def __init__(self) -> None:
+        self._size = 0
+        self._timestamps = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)
+        self._amounts = np.zeros(_INITIAL_CAPACITY, dtype=np.float64)
+        self._units = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)
+        self._token_ids = np.zeros(_INITIAL_CAPACITY, dtype=np.int32)
+        self._from_ids = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)
+        self._to_ids = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)
+
+        self.tokens: List[str] = []
+        self._token_lookup: Dict[str, int] = {}
+        self.addresses: List[str] = []
+        self._address_lookup: Dict[str, int] = {}
+        self.prices: Optional[Mapping[str, float]] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[:self._size]
+
+    @property
+    def amounts(self) -> np.ndarray:
+        return self._amounts[:self._size]
+
+    @property
+    def units(self) -> np.ndarray:
+        return self._units[:self._size]
+
+    @property
+    def token_ids(self) -> np.ndarray:
+        return self._token_ids[:self._size]
+
+    @property
+    def from_ids(self) -> np.ndarray:
+        return self._from_ids[:self._size]
+
+    @property
+    def to_ids(self) -> np.ndarray:
+        return self._to_ids[:self._size]
+
+    def address_id(self, address: str) -> int:
+        """
+        Get the integer ID of an address, assigning one if it is new.
+
+        Args:
+            address: The blockchain address
+
+        Returns:
+            The address ID
+        """
+        address_id = self._address_lookup.get(address)
+        if address_id is None:
+            address_id = len(self.addresses)
+            self._address_lookup[address] = address_id
+            self.addresses.append(address)
+        return address_id
+
+    def find_address_id(self, address: str) -> Optional[int]:
+        """
+        Get the integer ID of an address without assigning one.
+
+        Args:
+            address: The blockchain address
+
+        Returns:
+            The address ID, or None if the address has no transactions
+        """
+        return self._address_lookup.get(address)
+
+    def token_id(self, symbol: str) -> int:
+        """
+        Get the integer ID of a token symbol, assigning one if it is new.
+
+        Args:
+            symbol: Token symbol such as "ETH"
+
+        Returns:
+            The token ID
+        """
+        token_id = self._token_lookup.get(symbol)
+        if token_id is None:
+            token_id = len(self.tokens)
+            self._token_lookup[symbol] = token_id
+            self.tokens.append(symbol)
+        return token_id
+
+    def append(self, tx_data: Dict[str, Any]) -> int:
+        """
+        Parse a transaction once and append it as a new row.
+
+        Args:
+            tx_data: Transaction fields, including "from", "to", "value" and "timestamp"
+
+        Returns:
+            The row index of the appended transaction
+        """
+        row = self.write(tx_data)
+        self.publish()
+        return row
+
+    def write(self, tx_data: Dict[str, Any]) -> int:
+        """
+        Parse a transaction into the next row without making it visible.
+
+        The row is left out of len() and the column views until publish()
+        is called, so a store can finish its own per-row data first.
+
+        Args:
+            tx_data: Transaction fields, including "from", "to", "value" and "timestamp"
+
+        Returns:
+            The row index the transaction was written to
+        """
+        if self._size == len(self._timestamps):
+            self._grow()
+
+        amount, symbol = parse_value(tx_data.get("value", ""))
+        row = self._size
+        self._timestamps[row] = parse_timestamp(tx_data["timestamp"])
+        self._amounts[row] = float(amount) if amount is not None else np.nan
+        self._units[row] = to_units(amount)
+        self._token_ids[row] = self.token_id(symbol)
+        self._from_ids[row] = self.address_id(tx_data["from"])
+        self._to_ids[row] = self.address_id(tx_data["to"])
+        return row
+
+    def publish(self) -> None:
+        """Make the row last written with write() visible."""
+        self._size += 1
+
+    def clear_rows(self) -> None:
+        """Drop all rows while keeping the address and token dictionaries."""
+        self._size = 0
+
+    def _grow(self) -> None:
+        capacity = len(self._timestamps) * 2
+        for name in ("_timestamps", "_amounts", "_units", "_token_ids", "_from_ids", "_to_ids"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+
+    @property
+    def priced(self) -> bool:
+        """Whether a price table is available for common-denomination values."""
+        return self.prices is not None or config.TOKEN_PRICES is not None
+
+    def price_array(self, prices: Optional[Mapping[str, float]] = None) -> np.ndarray:
+        """
+        Get token prices indexed by token ID.
+
+        Args:
+            prices: Optional price table overriding the table's own
+
+        Returns:
+            Float array with one price per token ID, NaN where unpriced
+        """
+        if prices is None:
+            prices = self.prices if self.prices is not None else config.TOKEN_PRICES or {}
+        return np.array([prices.get(symbol, np.nan) for symbol in self.tokens], dtype=np.float64)
+
+    def common_values(self, rows: np.ndarray, prices: Optional[Mapping[str, float]] = None) -> np.ndarray:
+        """
+        Get transaction amounts converted to the common denomination.
+
+        Args:
+            rows: Row indices of the transactions
+            prices: Optional price table overriding the table's own
+
+        Returns:
+            Float array of values, NaN for unpriced tokens and unparsed amounts
+        """
+        units = self.units[rows]
+        values = units / UNITS_PER_TOKEN * self.price_array(prices)[self.token_ids[rows]]
+        values[units == MISSING_UNITS] = np.nan
+        return values